@@ -0,0 +1,254 @@
+"""
+Benchmark suite for all solvers.
+Runs every solver and method over a range of problem sizes and records wall
+time, function evaluations and peak traced memory. Results are appended to
+a JSON history file and compared against a stored baseline.
+
+Usage:
+    python -m benchmarks.suite                      # Full run, print table
+    python -m benchmarks.suite --quick              # Small sizes only
+    python -m benchmarks.suite --save-baseline      # Record current results as baseline
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from expressions.compiler import compile_expression
+from solvers.differential import DifferentialEquationSolver
+from solvers.extremum import ExtremumFinder
+from solvers.integral import Integrator
+from solvers.interpolation import Interpolator
+from solvers.linear_system import LinearSystemSolver
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(BENCHMARK_DIR, 'history.json')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+REGRESSION_THRESHOLD = 1.25  # Allowed ratio to the baseline before flagging
+TIME_FLOOR = 1e-3  # Wall times below this many seconds are too noisy to compare
+
+
+class CountingFunction:
+    """Wraps a function and counts evaluated points (array arguments count per element)"""
+
+    def __init__(self, func: Callable):
+        self.func = func
+        self.vectorized = getattr(func, 'vectorized', False)
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += int(np.size(args[0])) if args else 1
+        return self.func(*args)
+
+
+class Benchmark:
+    """One solver configuration at one problem size"""
+
+    def __init__(self, name: str, setup: Callable):
+        """
+        Args:
+            name: Unique name, e.g. 'linear_system/n=100'
+            setup: Returns (run, counter), where run() performs the measured
+                work and counter is a CountingFunction or None
+        """
+        self.name = name
+        self.setup = setup
+
+    def measure(self, repeat: int = 3) -> Dict:
+        """Best wall time over repeat runs, evaluations and peak traced memory"""
+        times = []
+        evaluations = None
+        for _ in range(repeat):
+            run, counter = self.setup()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+            if counter is not None:
+                evaluations = counter.count
+
+        # Memory is traced in a separate run, since tracing slows execution
+        run, _ = self.setup()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {'time': min(times), 'evaluations': evaluations, 'peak_memory': peak}
+
+
+def _linear_system(n: int) -> Benchmark:
+    def setup():
+        rng = np.random.default_rng(n)
+        matrix = rng.random((n, n)) + n * np.eye(n)  # Diagonally dominant
+        solver = LinearSystemSolver(matrix.tolist(), rng.random(n).tolist())
+        return solver.solve, None
+    return Benchmark(f'linear_system/n={n}', setup)
+
+
+def _interpolation(method: str, n: int, evaluations: int = 200) -> Benchmark:
+    def setup():
+        xs = np.linspace(0, 10, n)
+        solver = Interpolator(list(zip(xs.tolist(), np.sin(xs).tolist())), method)
+
+        def run():
+            function = solver.solve()['function']
+            for x in np.linspace(0, 10, evaluations).tolist():
+                function(x)
+        return run, None
+    return Benchmark(f'interpolation/{method}/points={n}', setup)
+
+
+def _extremum(method: str, dimension: int) -> Benchmark:
+    variables = [f'x{i}' for i in range(dimension)]
+    source = ' + '.join(f'{i + 1} * (x{i} - 1)**2' for i in range(dimension))
+    func = compile_expression(source, variables)
+
+    def setup():
+        counter = CountingFunction(func)
+        solver = ExtremumFinder(counter, variables, method)
+        return (lambda: solver.solve([0.0] * dimension)), counter
+    return Benchmark(f'extremum/{method}/dimension={dimension}', setup)
+
+
+def _integral(method: str, precision: float) -> Benchmark:
+    func = compile_expression('sin(x) * exp(-x / 3)', ['x'], backend='numpy')
+
+    def setup():
+        np.random.seed(0)
+        counter = CountingFunction(func)
+        solver = Integrator(counter, method)
+        solver.precision = precision
+        solver.max_iterations = 20
+        return (lambda: solver.solve(0.0, 10.0)), counter
+    return Benchmark(f'integral/{method}/precision={precision:g}', setup)
+
+
+def _differential(method: str, step_size: float) -> Benchmark:
+    func = compile_expression('x * y - y**2 / 10', ['x', 'y'])
+
+    def setup():
+        counter = CountingFunction(func)
+        solver = DifferentialEquationSolver(counter, method)
+        solver.step_size = step_size
+        return (lambda: solver.solve(0.0, 1.0, 2.0)), counter
+    return Benchmark(f'differential/{method}/step={step_size:g}', setup)
+
+
+def build_suite(quick: bool = False) -> List[Benchmark]:
+    """All benchmarks; quick mode keeps only the smallest sizes"""
+    sizes = {
+        'linear': [10, 50] if quick else [10, 50, 100, 200],
+        'points': [10, 50] if quick else [10, 50, 200],
+        'spline_points': [10, 50] if quick else [10, 50, 200, 1000],
+        'dimensions': [2, 4] if quick else [2, 8, 32],
+        'precisions': [1e-4] if quick else [1e-4, 1e-6, 1e-8],
+        'steps': [0.1, 0.01] if quick else [0.1, 0.01, 0.001],
+    }
+    suite = [_linear_system(n) for n in sizes['linear']]
+    # Polynomial interpolation is quadratic per evaluation and useless at high degree
+    suite += [_interpolation(method, n) for method in ('lagrange', 'newton') for n in sizes['points']]
+    suite += [_interpolation('spline', n) for n in sizes['spline_points']]
+    suite += [_extremum(method, d) for method in ('gradient', 'newton', 'bfgs', 'lbfgs', 'nelder_mead')
+              for d in sizes['dimensions']]
+    suite += [_integral(method, p) for method in ('trapezoid', 'simpson', 'monte_carlo')
+              for p in sizes['precisions']]
+    suite += [_differential(method, h) for method in ('euler', 'rk4') for h in sizes['steps']]
+    return suite
+
+
+def run_suite(suite: List[Benchmark], repeat: int = 3, pattern: Optional[str] = None) -> Dict[str, Dict]:
+    """Measure every benchmark whose name contains pattern"""
+    return {benchmark.name: benchmark.measure(repeat)
+            for benchmark in suite if pattern is None or pattern in benchmark.name}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """
+    Find measurements that grew beyond threshold times their baseline.
+
+    Returns:
+        Human-readable description of every regression
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ('time', 'evaluations', 'peak_memory'):
+            new, old = current.get(metric), reference.get(metric)
+            if new is None or not old:
+                continue
+            if metric == 'time' and new < TIME_FLOOR:
+                continue
+            if new > old * threshold:
+                regressions.append(f"{name}: {metric} {old:.4g} -> {new:.4g} ({new / old:.2f}x)")
+    return regressions
+
+
+def _environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': commit,
+            'python': platform.python_version(), 'machine': platform.machine()}
+
+
+def _load(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save(path: str, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; exit status is 1 if a regression was found"""
+    parser = argparse.ArgumentParser(description="Benchmark all solvers")
+    parser.add_argument('--quick', action='store_true', help="Small problem sizes only")
+    parser.add_argument('--filter', default=None, help="Run benchmarks whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument('--history', default=HISTORY_FILE, help="JSON history to append to")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Allowed ratio to the baseline")
+    parser.add_argument('--save-baseline', action='store_true', help="Store results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(build_suite(args.quick), args.repeat, args.filter)
+    for name, result in results.items():
+        evaluations = '-' if result['evaluations'] is None else result['evaluations']
+        print(f"{name:45s} {result['time'] * 1e3:10.3f} ms {evaluations:>10} evals "
+              f"{result['peak_memory'] / 1024:10.1f} KiB")
+
+    history = _load(args.history, [])
+    history.append(dict(_environment(), results=results))
+    _save(args.history, history)
+
+    if args.save_baseline:
+        baseline = _load(args.baseline, {})
+        baseline.update(results)
+        _save(args.baseline, baseline)
+        return 0
+
+    regressions = compare(results, _load(args.baseline, {}), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Cache of compiled expressions.
+Keeps recently compiled functions keyed by normalized source text, variable
+order and backend, so repeated solves of the same formula skip compilation.
+"""
+import ast
+import threading
+from collections import OrderedDict
+from typing import List, Callable, Dict
+from .compiler import compile_expression
+from .symbolic import compile_with_derivatives
+
+
+def normalize_source(source: str) -> str:
+    """
+    Canonical spelling of an expression, independent of whitespace and
+    redundant parentheses. Sources that do not parse are returned stripped,
+    so the compiler can report the error.
+    """
+    try:
+        return ast.unparse(ast.parse(source.strip(), mode='eval'))
+    except (SyntaxError, ValueError):
+        return source.strip()
+
+
+class ExpressionCache:
+    """Bounded, thread-safe LRU cache of compiled expression functions"""
+
+    def __init__(self, maxsize: int = 256):
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source: str, variables: List[str], backend: str = 'math',
+            derivatives: bool = False) -> Callable:
+        """
+        Return the compiled function for an expression, compiling it on a miss.
+
+        Args:
+            source: Expression in Python syntax
+            variables: Names of the expression variables, in argument order
+            backend: 'math' or 'numpy'
+            derivatives: Attach exact gradient and Hessian (scalar backend)
+
+        Raises:
+            ExpressionError if the expression is invalid; errors are not cached
+        """
+        key = (normalize_source(source), tuple(variables), backend, derivatives)
+        with self._lock:
+            func = self._entries.get(key)
+            if func is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return func
+            self.misses += 1
+
+        # Compile outside the lock so other threads are not blocked meanwhile
+        if derivatives:
+            func = compile_with_derivatives(key[0], list(variables), backend)
+        else:
+            func = compile_expression(key[0], list(variables), backend)
+
+        with self._lock:
+            func = self._entries.setdefault(key, func)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return func
+
+    def stats(self) -> Dict:
+        """Hit and miss counts, current size and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Remove all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+default_cache = ExpressionCache()
+
+
+def cached_expression(source: str, variables: List[str], backend: str = 'math',
+                      derivatives: bool = False) -> Callable:
+    """Compile an expression through the shared default cache"""
+    return default_cache.get(source, variables, backend, derivatives)
@@ -0,0 +1,234 @@
+"""
+Compiler for user-entered mathematical expressions.
+Validates the expression syntax tree against a whitelist and compiles it once
+into a Python function with positional parameters, so evaluating it costs a
+plain function call instead of an `eval` per call.
+
+Two backends are available: 'math' binds names to the scalar `math` module,
+'numpy' binds them to NumPy ufuncs so the function evaluates whole arrays.
+"""
+import ast
+import keyword
+import math
+from typing import List, Callable, Dict
+from .optimizer import optimize, eliminate_common_subexpressions
+
+# Names available to expressions: the public functions and constants of `math`
+FUNCTIONS: Dict[str, Callable] = {
+    name: getattr(math, name) for name in dir(math)
+    if not name.startswith('_') and callable(getattr(math, name))
+}
+CONSTANTS: Dict[str, float] = {
+    name: getattr(math, name) for name in dir(math)
+    if not name.startswith('_') and not callable(getattr(math, name))
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub, ast.Not, ast.And, ast.Or,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+
+
+# NumPy equivalents of the math functions; the rest are vectorized in _numpy_namespace
+_NUMPY_NAMES = {
+    'acos': 'arccos', 'acosh': 'arccosh', 'asin': 'arcsin', 'asinh': 'arcsinh',
+    'atan': 'arctan', 'atan2': 'arctan2', 'atanh': 'arctanh', 'ceil': 'ceil',
+    'copysign': 'copysign', 'cos': 'cos', 'cosh': 'cosh', 'degrees': 'degrees',
+    'exp': 'exp', 'exp2': 'exp2', 'expm1': 'expm1', 'fabs': 'fabs', 'floor': 'floor',
+    'fmod': 'fmod', 'gcd': 'gcd', 'hypot': 'hypot', 'isclose': 'isclose',
+    'isfinite': 'isfinite', 'isinf': 'isinf', 'isnan': 'isnan', 'lcm': 'lcm',
+    'ldexp': 'ldexp', 'log10': 'log10', 'log1p': 'log1p', 'log2': 'log2',
+    'nextafter': 'nextafter', 'pow': 'power', 'radians': 'radians', 'sin': 'sin',
+    'sinh': 'sinh', 'sqrt': 'sqrt', 'tan': 'tan', 'tanh': 'tanh', 'trunc': 'trunc',
+    'cbrt': 'cbrt',
+}
+
+BACKENDS = ('math', 'numpy')
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression is malformed or uses disallowed constructs"""
+
+
+def parse_expression(source: str, variables: List[str]) -> ast.Expression:
+    """
+    Parse an expression and validate it against the whitelist.
+
+    Args:
+        source: Expression in Python syntax, e.g. "sin(x) * y**2"
+        variables: Names of the expression variables, in argument order
+
+    Returns:
+        Validated expression syntax tree
+
+    Raises:
+        ExpressionError if the expression is invalid or not allowed
+    """
+    _validate_variables(variables)
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid syntax: {e.msg}")
+
+    names = set(variables)
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(f"Disallowed construct: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool) or not isinstance(node.value, (int, float))):
+            raise ExpressionError(f"Disallowed constant: {node.value!r}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                raise ExpressionError("Only math functions can be called")
+            if node.keywords:
+                raise ExpressionError("Keyword arguments are not allowed")
+        if isinstance(node, ast.Name) and node.id not in names \
+                and node.id not in FUNCTIONS and node.id not in CONSTANTS:
+            raise ExpressionError(f"Unknown name: {node.id}")
+    return tree
+
+
+def compile_expression(source: str, variables: List[str], backend: str = 'math') -> Callable:
+    """
+    Compile an expression into a function of the given variables.
+
+    Constant subexpressions are folded and repeated subexpressions are
+    computed once. The returned function takes the variables as positional
+    arguments and carries the `source`, `variables` and `backend` it was
+    built from as attributes. Its `vectorized` attribute tells solvers
+    whether it accepts NumPy arrays.
+
+    Args:
+        source: Expression in Python syntax
+        variables: Names of the expression variables, in argument order
+        backend: 'math' for scalar evaluation or 'numpy' for array evaluation
+
+    Raises:
+        ExpressionError if the expression is invalid or not allowed
+    """
+    if backend not in BACKENDS:
+        raise ExpressionError(f"Unknown backend: {backend}")
+    body = optimize(parse_expression(source, variables).body, variables)
+    if backend == 'numpy':
+        body = _NumpyTransformer().visit(body)
+    statements, body = eliminate_common_subexpressions(body)
+    if backend == 'numpy':
+        body = f"_broadcast({ast.unparse(body)}, {', '.join(variables)})"
+        func = _build_function(body, variables, _numpy_namespace(), source, statements)
+    else:
+        func = _build_function(ast.unparse(body), variables, {**FUNCTIONS, **CONSTANTS},
+                               source, statements)
+    func.backend = backend
+    func.vectorized = backend == 'numpy'
+    return func
+
+
+def _build_function(body: str, variables: List[str], namespace: Dict, source: str,
+                    statements: List[str] = ()) -> Callable:
+    """
+    Compile `return body` into a function with math names pre-bound as globals.
+
+    Optional statements (e.g. temporaries) are placed before the return.
+    """
+    lines = [f"def expression({', '.join(variables)}):"]
+    lines += [f"    {statement}" for statement in statements]
+    lines.append(f"    return {body}")
+    code = '\n'.join(lines) + '\n'
+    namespace = dict(namespace, __builtins__={})
+    exec(compile(code, '<expression>', 'exec'), namespace)
+    func = namespace['expression']
+    func.source = source
+    func.variables = tuple(variables)
+    return func
+
+
+class _NumpyTransformer(ast.NodeTransformer):
+    """Rewrite control flow and logic that NumPy arrays do not support"""
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return _call('_where', node.test, node.body, node.orelse)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        helper = '_and' if isinstance(node.op, ast.And) else '_or'
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = _call(helper, result, value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return _call('_not', node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b < c becomes (a < b) & (b < c)
+        left = node.left
+        result = None
+        for op, right in zip(node.ops, node.comparators):
+            comparison = ast.Compare(left=left, ops=[op], comparators=[right])
+            result = comparison if result is None else _call('_and', result, comparison)
+            left = right
+        return result
+
+
+def _call(name: str, *args) -> ast.Call:
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+def _numpy_log(x, base=None):
+    """math.log with an optional base, for arrays"""
+    import numpy as np
+    if base is None:
+        return np.log(x)
+    return np.log(x) / np.log(base)
+
+
+def _broadcast(value, *args):
+    """Give the result the common shape of the array arguments"""
+    import numpy as np
+    shape = np.broadcast_shapes(*(np.shape(arg) for arg in args)) if args else ()
+    if shape == ():
+        # Scalar inputs give a scalar result
+        return value[()] if isinstance(value, np.ndarray) else value
+    if np.shape(value) == shape:
+        return value
+    return np.array(np.broadcast_to(value, shape))
+
+
+def _numpy_namespace() -> Dict:
+    """
+    Names available to expressions compiled for the NumPy backend. NumPy is
+    imported here, so programs that only use the math backend start without it.
+    """
+    import numpy as np
+    namespace = {}
+    for name, func in FUNCTIONS.items():
+        if name in _NUMPY_NAMES and hasattr(np, _NUMPY_NAMES[name]):
+            namespace[name] = getattr(np, _NUMPY_NAMES[name])
+        else:
+            namespace[name] = np.vectorize(func, otypes=[float])
+    namespace['log'] = _numpy_log
+    namespace.update(CONSTANTS)
+    namespace.update(_where=np.where, _and=np.logical_and, _or=np.logical_or,
+                     _not=np.logical_not, _broadcast=_broadcast)
+    return namespace
+
+
+def _validate_variables(variables: List[str]):
+    """Check that variable names are usable as function parameters"""
+    if len(set(variables)) != len(variables):
+        raise ExpressionError("Variable names must be unique")
+    for name in variables:
+        if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_'):
+            raise ExpressionError(f"Invalid variable name: {name!r}")
+        if name in FUNCTIONS:
+            raise ExpressionError(f"Variable name conflicts with function: {name}")
@@ -0,0 +1,254 @@
+"""
+Optimization passes over expression syntax trees.
+Folds constant subtrees, rewrites small integer powers as multiplications and
+eliminates common subexpressions into temporaries before compilation.
+"""
+import ast
+import copy
+import math
+from collections import Counter
+from typing import List, Callable, Optional, Tuple
+
+_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Pow: lambda a, b: a ** b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+}
+
+_COMPARISONS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+}
+
+# Constants that can be written as finite literals
+_FOLDABLE_CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': math.tau}
+
+MAX_EXPANDED_POWER = 4  # Largest integer exponent rewritten as multiplication
+MAX_FOLDED_INT_BITS = 4096  # Larger integer results are computed in floating point
+
+
+def literal(value) -> ast.expr:
+    """Numeric literal node (negative values as unary minus, so precedence is kept)"""
+    if value < 0:
+        return ast.UnaryOp(op=ast.USub(), operand=ast.Constant(value=-value))
+    return ast.Constant(value=value)
+
+
+def literal_value(node: ast.expr) -> Optional[float]:
+    """Value of a numeric literal node, or None"""
+    if isinstance(node, ast.Constant) and not isinstance(node.value, bool) \
+            and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = literal_value(node.operand)
+        return -value if value is not None else None
+    return None
+
+
+def fold_binary(op: ast.operator, a: float, b: float) -> Optional[ast.expr]:
+    """Evaluate a binary operation on two literals, if it is safe to do so"""
+    try:
+        if _integer_too_large(op, a, b):
+            a, b = float(a), float(b)
+        value = _OPERATORS[type(op)](a, b)
+    except (ArithmeticError, ValueError):
+        return None
+    return _finite_literal(value)
+
+
+def _integer_too_large(op: ast.operator, a: float, b: float) -> bool:
+    """
+    Whether an integer product or power would exceed MAX_FOLDED_INT_BITS.
+    Checked before computing it: 9**9**9 would take minutes to evaluate.
+    """
+    if not isinstance(a, int) or not isinstance(b, int):
+        return False
+    if isinstance(op, ast.Pow):
+        return b > 0 and abs(a) > 1 and a.bit_length() * b > MAX_FOLDED_INT_BITS
+    if isinstance(op, ast.Mult):
+        return a.bit_length() + b.bit_length() > MAX_FOLDED_INT_BITS
+    return False
+
+
+def _call_too_large(name: str, args: List[float]) -> bool:
+    """
+    Whether a math call could build an integer beyond MAX_FOLDED_INT_BITS.
+    factorial, comb and perm grow with the argument values (factorial(3000000)
+    takes seconds), lcm with the argument sizes.
+    """
+    integers = [arg for arg in args if isinstance(arg, int)]
+    if name in ('factorial', 'comb', 'perm'):
+        return any(arg > MAX_FOLDED_INT_BITS for arg in integers)
+    if name == 'lcm':
+        return sum(arg.bit_length() for arg in integers) > MAX_FOLDED_INT_BITS
+    return False
+
+
+def _finite_literal(value) -> Optional[ast.expr]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None  # e.g. complex results of negative bases
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, int) and value.bit_length() > MAX_FOLDED_INT_BITS:
+        return None
+    return literal(value)
+
+
+def map_children(node: ast.expr, fn: Callable) -> ast.expr:
+    """Copy of node with fn applied to every child expression"""
+    new = copy.copy(node)
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, ast.expr):
+            setattr(new, field, fn(value))
+        elif isinstance(value, list):
+            setattr(new, field, [fn(v) if isinstance(v, ast.expr) else v for v in value])
+    return new
+
+
+def fold_constants(node: ast.expr, variables: List[str] = ()) -> ast.expr:
+    """
+    Replace subtrees that do not depend on the variables by their value.
+
+    Folds arithmetic on literals, named constants such as pi, math function
+    calls with literal arguments and conditionals with a literal test.
+    Operations that would raise or produce non-finite values are kept.
+    """
+    node = map_children(node, lambda child: fold_constants(child, variables))
+
+    if isinstance(node, ast.Name) and node.id in _FOLDABLE_CONSTANTS and node.id not in variables:
+        return literal(_FOLDABLE_CONSTANTS[node.id])
+    if isinstance(node, ast.UnaryOp) and literal_value(node.operand) is not None:
+        value = literal_value(node.operand)
+        if isinstance(node.op, ast.USub):
+            return literal(-value)
+        if isinstance(node.op, ast.UAdd):
+            return literal(value)
+    if isinstance(node, ast.BinOp):
+        left, right = literal_value(node.left), literal_value(node.right)
+        if left is not None and right is not None:
+            folded = fold_binary(node.op, left, right)
+            if folded is None and _integer_too_large(node.op, left, right):
+                # Keep the operation, but in floating point so that evaluating
+                # it overflows at once instead of building a huge integer
+                try:
+                    return ast.BinOp(left=literal(float(left)), op=node.op,
+                                     right=literal(float(right)))
+                except OverflowError:
+                    return node
+            return folded or node
+    if isinstance(node, ast.Call):
+        args = [literal_value(arg) for arg in node.args]
+        if all(arg is not None for arg in args) and not _call_too_large(node.func.id, args):
+            try:
+                return _finite_literal(getattr(math, node.func.id)(*args)) or node
+            except (ArithmeticError, ValueError, TypeError):
+                return node
+    if isinstance(node, ast.IfExp):
+        test = _literal_test(node.test)
+        if test is not None:
+            return node.body if test else node.orelse
+    return node
+
+
+def _literal_test(node: ast.expr) -> Optional[bool]:
+    """Truth value of a comparison between literals, or None"""
+    if not isinstance(node, ast.Compare):
+        return None
+    values = [literal_value(node.left)] + [literal_value(c) for c in node.comparators]
+    if any(value is None for value in values):
+        return None
+    return all(_COMPARISONS[type(op)](a, b) for op, a, b in zip(node.ops, values, values[1:]))
+
+
+def expand_powers(node: ast.expr) -> ast.expr:
+    """Rewrite x**n for small positive integers n as repeated multiplication"""
+    node = map_children(node, expand_powers)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        exponent = literal_value(node.right)
+        if exponent is not None and float(exponent).is_integer() \
+                and 2 <= exponent <= MAX_EXPANDED_POWER:
+            result = node.left
+            for _ in range(int(exponent) - 1):
+                result = ast.BinOp(result, ast.Mult(), node.left)
+            return result
+    return node
+
+
+def optimize(node: ast.expr, variables: List[str] = ()) -> ast.expr:
+    """Apply constant folding and power expansion to an expression tree"""
+    return expand_powers(fold_constants(node, variables))
+
+
+class _SharedEmitter:
+    """
+    Turns one or more output trees into a function body in which every
+    subexpression occurring more than once is assigned to a temporary.
+
+    Subexpressions inside conditional branches are not hoisted, so they are
+    still only evaluated when their branch is taken.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.temporaries = {}
+        self.statements = []
+        self._conditional = 0
+
+    def count(self, node: ast.expr):
+        key = ast.dump(node)
+        self.counts[key] += 1
+        if self.counts[key] == 1:
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, ast.expr):
+                    self.count(child)
+
+    def emit(self, node: ast.expr) -> ast.expr:
+        if isinstance(node, (ast.Name, ast.Constant)) or literal_value(node) is not None:
+            return node
+        key = ast.dump(node)
+        if key in self.temporaries:
+            return ast.Name(id=self.temporaries[key], ctx=ast.Load())
+
+        if isinstance(node, ast.IfExp):
+            new = ast.IfExp(test=self.emit(node.test), body=self._emit_conditional(node.body),
+                            orelse=self._emit_conditional(node.orelse))
+        elif isinstance(node, ast.BoolOp):
+            new = ast.BoolOp(op=node.op, values=[self.emit(node.values[0])] +
+                             [self._emit_conditional(v) for v in node.values[1:]])
+        else:
+            new = map_children(node, self.emit)
+
+        if self.counts[key] > 1 and not self._conditional and not isinstance(node, (ast.List, ast.Tuple)):
+            name = f"_t{len(self.temporaries)}"
+            self.statements.append(f"{name} = {ast.unparse(new)}")
+            self.temporaries[key] = name
+            return ast.Name(id=name, ctx=ast.Load())
+        return new
+
+    def _emit_conditional(self, node: ast.expr) -> ast.expr:
+        self._conditional += 1
+        try:
+            return self.emit(node)
+        finally:
+            self._conditional -= 1
+
+
+def eliminate_common_subexpressions(node: ast.expr) -> Tuple[List[str], ast.expr]:
+    """
+    Assign repeated subexpressions to temporaries.
+
+    Returns:
+        Tuple of (assignment statements in evaluation order, rewritten tree)
+    """
+    emitter = _SharedEmitter()
+    emitter.count(node)
+    body = emitter.emit(node)
+    return emitter.statements, body
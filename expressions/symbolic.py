@@ -0,0 +1,303 @@
+"""
+Symbolic differentiation of parsed expressions.
+Differentiates the validated expression tree, simplifies the result and
+compiles exact gradient, Hessian and Jacobian functions. Subexpressions that
+repeat across the function and its derivatives are computed once.
+"""
+import ast
+import math
+from typing import List, Callable
+from .compiler import (parse_expression, compile_expression, _build_function,
+                       ExpressionError, FUNCTIONS, CONSTANTS)
+from .optimizer import (literal as _const, literal_value as _number, fold_binary as _fold,
+                        map_children as _map_children, optimize,
+                        eliminate_common_subexpressions)
+
+
+def _same(a: ast.expr, b: ast.expr) -> bool:
+    return ast.dump(a) == ast.dump(b)
+
+
+def _add(a, b):
+    na, nb = _number(a), _number(b)
+    if na is not None and nb is not None:
+        return _fold(ast.Add(), na, nb) or ast.BinOp(a, ast.Add(), b)
+    if na == 0:
+        return b
+    if nb == 0:
+        return a
+    if isinstance(b, ast.UnaryOp) and isinstance(b.op, ast.USub):
+        return _sub(a, b.operand)
+    return ast.BinOp(a, ast.Add(), b)
+
+
+def _sub(a, b):
+    na, nb = _number(a), _number(b)
+    if na is not None and nb is not None:
+        return _fold(ast.Sub(), na, nb) or ast.BinOp(a, ast.Sub(), b)
+    if nb == 0:
+        return a
+    if na == 0:
+        return _neg(b)
+    if _same(a, b):
+        return ast.Constant(value=0)
+    return ast.BinOp(a, ast.Sub(), b)
+
+
+def _mul(a, b):
+    na, nb = _number(a), _number(b)
+    if na is not None and nb is not None:
+        return _fold(ast.Mult(), na, nb) or ast.BinOp(a, ast.Mult(), b)
+    if na == 0 or nb == 0:
+        return ast.Constant(value=0)
+    if na == 1:
+        return b
+    if nb == 1:
+        return a
+    if na == -1:
+        return _neg(b)
+    if nb == -1:
+        return _neg(a)
+    return ast.BinOp(a, ast.Mult(), b)
+
+
+def _div(a, b):
+    na, nb = _number(a), _number(b)
+    if na is not None and nb is not None:
+        return _fold(ast.Div(), na, nb) or ast.BinOp(a, ast.Div(), b)
+    if na == 0:
+        return ast.Constant(value=0)
+    if nb == 1:
+        return a
+    if _same(a, b):
+        return ast.Constant(value=1)
+    return ast.BinOp(a, ast.Div(), b)
+
+
+def _pow(a, b):
+    na, nb = _number(a), _number(b)
+    if na is not None and nb is not None:
+        return _fold(ast.Pow(), na, nb) or ast.BinOp(a, ast.Pow(), b)
+    if nb == 0 or na == 1:
+        return ast.Constant(value=1)
+    if nb == 1:
+        return a
+    return ast.BinOp(a, ast.Pow(), b)
+
+
+def _neg(a):
+    na = _number(a)
+    if na is not None:
+        return _const(-na)
+    if isinstance(a, ast.UnaryOp) and isinstance(a.op, ast.USub):
+        return a.operand
+    return ast.UnaryOp(op=ast.USub(), operand=a)
+
+
+def _call(name: str, *args) -> ast.Call:
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+_BUILDERS = {ast.Add: _add, ast.Sub: _sub, ast.Mult: _mul, ast.Div: _div, ast.Pow: _pow}
+
+
+def simplify(node: ast.expr) -> ast.expr:
+    """Fold literal arithmetic and remove neutral elements (x*1, x+0, x**1, ...)"""
+    node = _map_children(node, simplify)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BUILDERS:
+        return _BUILDERS[type(node.op)](node.left, node.right)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return _neg(node.operand)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+        return node.operand
+    return node
+
+
+def _depends(node: ast.expr, var: str) -> bool:
+    return any(isinstance(n, ast.Name) and n.id == var for n in ast.walk(node))
+
+
+# Derivative of f(u) with respect to u, for single-argument functions
+_FUNCTION_DERIVATIVES = {
+    'sin': lambda u: _call('cos', u),
+    'cos': lambda u: _neg(_call('sin', u)),
+    'tan': lambda u: _add(ast.Constant(value=1), _pow(_call('tan', u), ast.Constant(value=2))),
+    'asin': lambda u: _div(ast.Constant(value=1), _call('sqrt', _sub(ast.Constant(value=1), _pow(u, ast.Constant(value=2))))),
+    'acos': lambda u: _neg(_div(ast.Constant(value=1), _call('sqrt', _sub(ast.Constant(value=1), _pow(u, ast.Constant(value=2)))))),
+    'atan': lambda u: _div(ast.Constant(value=1), _add(ast.Constant(value=1), _pow(u, ast.Constant(value=2)))),
+    'sinh': lambda u: _call('cosh', u),
+    'cosh': lambda u: _call('sinh', u),
+    'tanh': lambda u: _sub(ast.Constant(value=1), _pow(_call('tanh', u), ast.Constant(value=2))),
+    'asinh': lambda u: _div(ast.Constant(value=1), _call('sqrt', _add(_pow(u, ast.Constant(value=2)), ast.Constant(value=1)))),
+    'acosh': lambda u: _div(ast.Constant(value=1), _call('sqrt', _sub(_pow(u, ast.Constant(value=2)), ast.Constant(value=1)))),
+    'atanh': lambda u: _div(ast.Constant(value=1), _sub(ast.Constant(value=1), _pow(u, ast.Constant(value=2)))),
+    'exp': lambda u: _call('exp', u),
+    'expm1': lambda u: _call('exp', u),
+    'exp2': lambda u: _mul(_call('exp2', u), _call('log', ast.Constant(value=2))),
+    'log1p': lambda u: _div(ast.Constant(value=1), _add(ast.Constant(value=1), u)),
+    'log10': lambda u: _div(ast.Constant(value=1), _mul(u, _call('log', ast.Constant(value=10)))),
+    'log2': lambda u: _div(ast.Constant(value=1), _mul(u, _call('log', ast.Constant(value=2)))),
+    'sqrt': lambda u: _div(ast.Constant(value=1), _mul(ast.Constant(value=2), _call('sqrt', u))),
+    'cbrt': lambda u: _div(ast.Constant(value=1), _mul(ast.Constant(value=3), _pow(_call('cbrt', u), ast.Constant(value=2)))),
+    'fabs': lambda u: _call('copysign', ast.Constant(value=1.0), u),
+    # pi is emitted as a number: a variable named pi would shadow the constant
+    'erf': lambda u: _mul(_const(2 / math.sqrt(math.pi)), _call('exp', _neg(_pow(u, ast.Constant(value=2))))),
+    'erfc': lambda u: _mul(_const(-2 / math.sqrt(math.pi)), _call('exp', _neg(_pow(u, ast.Constant(value=2))))),
+    'degrees': lambda u: _const(180 / math.pi),
+    'radians': lambda u: _const(math.pi / 180),
+    'floor': lambda u: ast.Constant(value=0),
+    'ceil': lambda u: ast.Constant(value=0),
+    'trunc': lambda u: ast.Constant(value=0),
+}
+
+
+def derivative(node: ast.expr, var: str) -> ast.expr:
+    """
+    Differentiate an expression tree with respect to a variable.
+
+    Raises:
+        ExpressionError for functions without a known derivative
+    """
+    if not _depends(node, var):
+        return ast.Constant(value=0)
+    if isinstance(node, ast.Name):
+        return ast.Constant(value=1)
+    if isinstance(node, ast.UnaryOp):
+        if isinstance(node.op, ast.USub):
+            return _neg(derivative(node.operand, var))
+        if isinstance(node.op, ast.UAdd):
+            return derivative(node.operand, var)
+        return ast.Constant(value=0)  # Logical not is piecewise constant
+    if isinstance(node, ast.BinOp):
+        return _binop_derivative(node.left, node.op, node.right, var)
+    if isinstance(node, ast.Call):
+        return _call_derivative(node, var)
+    if isinstance(node, ast.IfExp):
+        return ast.IfExp(test=node.test, body=derivative(node.body, var),
+                         orelse=derivative(node.orelse, var))
+    if isinstance(node, (ast.Compare, ast.BoolOp)):
+        return ast.Constant(value=0)
+    raise ExpressionError(f"Cannot differentiate {type(node).__name__}")
+
+
+def _binop_derivative(a: ast.expr, op: ast.operator, b: ast.expr, var: str) -> ast.expr:
+    da, db = derivative(a, var), derivative(b, var)
+    if isinstance(op, ast.Add):
+        return _add(da, db)
+    if isinstance(op, ast.Sub):
+        return _sub(da, db)
+    if isinstance(op, ast.Mult):
+        return _add(_mul(da, b), _mul(a, db))
+    if isinstance(op, ast.Div):
+        return _div(_sub(_mul(da, b), _mul(a, db)), _pow(b, ast.Constant(value=2)))
+    if isinstance(op, ast.Pow):
+        return _power_derivative(a, b, da, db, var)
+    if isinstance(op, ast.FloorDiv):
+        return ast.Constant(value=0)
+    if isinstance(op, ast.Mod):
+        # a % b = a - floor(a / b) * b
+        return _sub(da, _mul(ast.BinOp(a, ast.FloorDiv(), b), db))
+    raise ExpressionError(f"Cannot differentiate {type(op).__name__}")
+
+
+def _power_derivative(a, b, da, db, var):
+    if not _depends(b, var):
+        # d(a**c) = c * a**(c-1) * da
+        return _mul(_mul(b, _pow(a, _sub(b, ast.Constant(value=1)))), da)
+    if not _depends(a, var):
+        # d(c**b) = c**b * log(c) * db
+        return _mul(_mul(_pow(a, b), _call('log', a)), db)
+    # d(a**b) = a**b * (db * log(a) + b * da / a)
+    return _mul(_pow(a, b), _add(_mul(db, _call('log', a)), _div(_mul(b, da), a)))
+
+
+def _call_derivative(node: ast.Call, var: str) -> ast.expr:
+    name = node.func.id
+    args = node.args
+    if name == 'log' and len(args) == 2:
+        return derivative(_div(_call('log', args[0]), _call('log', args[1])), var)
+    if name == 'pow' and len(args) == 2:
+        return derivative(ast.BinOp(args[0], ast.Pow(), args[1]), var)
+    if name == 'atan2' and len(args) == 2:
+        y, x = args
+        numerator = _sub(_mul(x, derivative(y, var)), _mul(y, derivative(x, var)))
+        return _div(numerator, _add(_pow(x, ast.Constant(value=2)), _pow(y, ast.Constant(value=2))))
+    if name == 'hypot' and len(args) == 2:
+        a, b = args
+        numerator = _add(_mul(a, derivative(a, var)), _mul(b, derivative(b, var)))
+        return _div(numerator, node)
+    if name == 'log' and len(args) == 1:
+        return _div(derivative(args[0], var), args[0])
+    if name in _FUNCTION_DERIVATIVES and len(args) == 1:
+        return _mul(_FUNCTION_DERIVATIVES[name](args[0]), derivative(args[0], var))
+    raise ExpressionError(f"Cannot differentiate function: {name}")
+
+
+def gradient_trees(body: ast.expr, variables: List[str]) -> List[ast.expr]:
+    """Simplified partial derivatives with respect to every variable"""
+    return [derivative(body, var) for var in variables]
+
+
+def hessian_trees(gradient: List[ast.expr], variables: List[str]) -> List[List[ast.expr]]:
+    """Second derivatives; the lower triangle reuses the trees of the upper triangle"""
+    n = len(variables)
+    rows = [[None] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i, n):
+            rows[i][j] = rows[j][i] = derivative(gradient[i], variables[j])
+    return rows
+
+
+def _to_node(structure) -> ast.expr:
+    """Build a list/tuple display node from nested lists and tuples of trees"""
+    if isinstance(structure, tuple):
+        return ast.Tuple(elts=[_to_node(item) for item in structure], ctx=ast.Load())
+    if isinstance(structure, list):
+        return ast.List(elts=[_to_node(item) for item in structure], ctx=ast.Load())
+    return structure
+
+
+def compile_outputs(structure, variables: List[str], source: str) -> Callable:
+    """
+    Compile nested lists/tuples of expression trees into one function that
+    returns the same structure, sharing repeated subexpressions.
+    """
+    output = optimize(_to_node(structure), variables)
+    statements, body = eliminate_common_subexpressions(output)
+    return _build_function(ast.unparse(body), variables, {**FUNCTIONS, **CONSTANTS},
+                           source, statements)
+
+
+def compile_with_derivatives(source: str, variables: List[str], backend: str = 'math') -> Callable:
+    """
+    Compile an expression together with its exact derivatives.
+
+    The returned function is the one from `compile_expression` with extra
+    scalar (math backend) attributes:
+        gradient(*args) -> list of partial derivatives
+        value_and_gradient(*args) -> (value, gradient)
+        hessian(*args) -> list of rows of second derivatives
+
+    Raises:
+        ExpressionError if the expression is invalid or not differentiable
+    """
+    tree = parse_expression(source, variables)
+    body = simplify(tree.body)
+    gradient = gradient_trees(body, variables)
+    hessian = hessian_trees(gradient, variables)
+
+    func = compile_expression(source, variables, backend)
+    func.gradient = compile_outputs(gradient, variables, source)
+    func.value_and_gradient = compile_outputs((body, gradient), variables, source)
+    func.hessian = compile_outputs(hessian, variables, source)
+    return func
+
+
+def compile_jacobian(sources: List[str], variables: List[str]) -> Callable:
+    """
+    Compile the Jacobian of a vector of expressions, e.g. an ODE system's
+    right-hand side. The function returns one row per expression.
+    """
+    rows = [gradient_trees(simplify(parse_expression(source, variables).body), variables)
+            for source in sources]
+    return compile_outputs(rows, variables, '; '.join(sources))
@@ -0,0 +1,343 @@
+"""
+Headless batch runner.
+Reads problem specifications as JSON lines, solves them on a process pool
+through MathSolverFactory and streams results as JSON lines in completion
+order.
+
+Problem specification fields by type:
+    extremum:       expression, variables, start, method
+    integral:       expression, bounds, variable ('x'), method
+    differential:   expression (in x and y), x0, y0, x_end, method
+    linear_system:  matrix, vector
+    interpolation:  points, method, evaluate (x values to evaluate at)
+
+Every specification may carry an 'id' (defaults to its line number) and an
+'options' mapping of solver attributes to set, e.g. {"precision": 1e-8}.
+Attributes that the specification fields control (method, matrix, ...)
+cannot be set as options.
+
+Usage:
+    python -m interfaces.batch problems.jsonl -o results.jsonl --workers 8
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Iterable, Iterator, Optional, Tuple, TextIO
+from expressions.cache import cached_expression
+from expressions.compiler import ExpressionError, parse_expression
+from interfaces.factory import MathSolverFactory
+from interfaces.result_cache import ResultCache
+
+_result_caches: Dict[str, ResultCache] = {}  # Open result caches of this process
+
+# Fields every specification of a problem type must have
+_REQUIRED_FIELDS = {
+    'extremum': ('expression', 'variables', 'start'),
+    'integral': ('expression', 'bounds'),
+    'differential': ('expression', 'x0', 'y0', 'x_end'),
+    'linear_system': ('matrix', 'vector'),
+    'interpolation': ('points',),
+}
+
+# Solver attributes set from the specification fields or by the runner
+_RESERVED_OPTIONS = frozenset({
+    'func', 'equation', 'variables', 'method', 'differentiation', 'vectorized',
+    'matrix', 'vector', 'points', 'instrumentation',
+})
+
+
+def _require(spec: Dict, *fields: str):
+    missing = [field for field in fields if field not in spec]
+    if missing:
+        raise ValueError(f"Missing field(s): {', '.join(missing)}")
+
+
+def _require_fields(spec: Dict) -> str:
+    """Check the problem type and its required fields, returning the type"""
+    _require(spec, 'type')
+    problem_type = spec['type']
+    if problem_type not in _REQUIRED_FIELDS:
+        raise ValueError("Unknown problem type")
+    _require(spec, *_REQUIRED_FIELDS[problem_type])
+    return problem_type
+
+
+def _expression_variables(spec: Dict) -> List[str]:
+    if spec['type'] == 'extremum':
+        return list(spec['variables'])
+    if spec['type'] == 'integral':
+        return [spec.get('variable', 'x')]
+    return ['x', 'y']
+
+
+def check_spec(spec: Dict):
+    """
+    Check a problem specification without building its solver.
+
+    Validates the problem type, the required fields and the expression
+    against the whitelist, but does not compile or differentiate it, so the
+    check is cheap for any input. Errors that need the solver (options,
+    singular data) are reported when the problem is solved.
+
+    Raises:
+        ValueError for incomplete or invalid specifications
+    """
+    problem_type = _require_fields(spec)
+    if 'expression' not in _REQUIRED_FIELDS[problem_type]:
+        return
+    variables = _expression_variables(spec)
+    if not isinstance(spec['expression'], str) or not all(isinstance(v, str) for v in variables):
+        raise ValueError("Expression and variable names must be strings")
+    parse_expression(spec['expression'], variables)
+
+
+def build_solver(spec: Dict) -> Tuple[object, tuple]:
+    """
+    Create the solver described by a problem specification.
+
+    Returns:
+        Tuple of (solver, positional arguments for its solve method)
+
+    Raises:
+        ValueError for incomplete or invalid specifications
+    """
+    problem_type = _require_fields(spec)
+    method = spec.get('method')
+    kwargs = {'method': method} if method is not None else {}
+
+    if problem_type == 'extremum':
+        variables = _expression_variables(spec)
+        try:
+            func = cached_expression(spec['expression'], variables, derivatives=True)
+            kwargs['differentiation'] = 'symbolic'
+        except ExpressionError:
+            func = cached_expression(spec['expression'], variables)
+        solver = MathSolverFactory.create_solver('extremum', func, variables, **kwargs)
+        args = (list(spec['start']),)
+    elif problem_type == 'integral':
+        func = cached_expression(spec['expression'], _expression_variables(spec), backend='numpy')
+        solver = MathSolverFactory.create_solver('integral', func, **kwargs)
+        args = tuple(spec['bounds'])
+    elif problem_type == 'differential':
+        func = cached_expression(spec['expression'], _expression_variables(spec))
+        solver = MathSolverFactory.create_solver('differential', func, **kwargs)
+        args = (spec['x0'], spec['y0'], spec['x_end'])
+    elif problem_type == 'linear_system':
+        solver = MathSolverFactory.create_solver('linear_system', spec['matrix'], spec['vector'])
+        args = ()
+    else:
+        points = [tuple(point) for point in spec['points']]
+        solver = MathSolverFactory.create_solver('interpolation', points, **kwargs)
+        args = ()
+
+    for name, value in spec.get('options', {}).items():
+        if name.startswith('_') or not hasattr(solver, name):
+            raise ValueError(f"Unknown option: {name}")
+        if name in _RESERVED_OPTIONS:
+            raise ValueError(f"Option {name} is set by the problem specification")
+        setattr(solver, name, value)
+    return solver, args
+
+
+def to_jsonable(value):
+    """
+    Convert a solver result to JSON-compatible values, dropping callables.
+    NaN and infinite floats become None, as JSON has no literal for them.
+    """
+    if isinstance(value, Mapping):
+        return {str(k): to_jsonable(v) for k, v in value.items() if not callable(v)}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    if hasattr(value, 'tolist'):
+        return to_jsonable(value.tolist())  # NumPy arrays and scalars, sparse matrices
+    return str(value)
+
+
+def _result_cache(path: str) -> ResultCache:
+    if path not in _result_caches:
+        _result_caches[path] = ResultCache(path)
+    return _result_caches[path]
+
+
+def run_problem(spec: Dict, cache_path: Optional[str] = None) -> Dict:
+    """
+    Solve one problem specification.
+
+    Never raises: failures are reported in the 'error' field.
+
+    Args:
+        spec: Problem specification
+        cache_path: Result cache database to reuse earlier identical solves
+
+    Returns:
+        Dictionary with the problem 'id', 'status' ('ok' or 'error'), the
+        'result' or 'error' message and the 'elapsed' wall time in seconds
+    """
+    start = time.perf_counter()
+    record = {'id': spec.get('id') if isinstance(spec, dict) else None}
+    try:
+        if not isinstance(spec, dict):
+            raise ValueError("Problem specification must be a JSON object")
+        if 'invalid_json' in spec:
+            raise ValueError(f"Invalid JSON: {spec['invalid_json']}")
+        solver, args = build_solver(spec)
+        if cache_path is not None:
+            result = _result_cache(cache_path).solve(solver, *args)
+        else:
+            result = solver.solve(*args)
+        if spec.get('type') == 'interpolation' and 'evaluate' in spec:
+            result['values'] = [result['function'](x) for x in spec['evaluate']]
+        record['status'] = 'ok'
+        record['result'] = to_jsonable(result)
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['elapsed'] = time.perf_counter() - start
+    return record
+
+
+def _run_chunk(specs: List[Dict], cache_path: Optional[str] = None) -> List[Dict]:
+    return [run_problem(spec, cache_path) for spec in specs]
+
+
+def _failed_chunk(specs: List[Dict], error: Exception) -> List[Dict]:
+    """Error records for problems whose worker process died"""
+    return [{'id': spec.get('id') if isinstance(spec, dict) else None, 'status': 'error',
+             'error': f"{type(error).__name__}: {error}", 'elapsed': 0.0}
+            for spec in specs]
+
+
+def _completed(pending: Dict[Future, List[Dict]]) -> Iterator[Dict]:
+    """Wait for at least one chunk and yield its records"""
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        chunk = pending.pop(future)
+        try:
+            records = future.result()
+        except BrokenProcessPool as e:
+            # A worker was killed (e.g. out of memory); the batch goes on
+            records = _failed_chunk(chunk, e)
+        yield from records
+
+
+def _chunks(specs: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for spec in specs:
+        chunk.append(spec)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(specs: Iterable[Dict], workers: Optional[int] = None,
+              chunksize: int = 1, max_pending: Optional[int] = None,
+              cache_path: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Solve problem specifications concurrently, yielding results as they complete.
+
+    Specifications are consumed lazily, so arbitrarily long inputs run in
+    bounded memory.
+
+    Args:
+        specs: Problem specifications
+        workers: Number of worker processes (1 runs in this process,
+            None uses one process per CPU)
+        chunksize: Number of problems sent to a worker at once
+        max_pending: Maximum number of chunks in flight (default 4 per worker)
+        cache_path: Result cache database shared by all workers
+
+    If a worker process dies, the problems in flight on the pool get error
+    records and the remaining problems run on a new pool.
+    """
+    if chunksize < 1:
+        raise ValueError("Chunk size must be positive")
+    if workers == 1:
+        for spec in specs:
+            yield run_problem(spec, cache_path)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * workers
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Dict[Future, List[Dict]] = {}
+    try:
+        for chunk in _chunks(specs, chunksize):
+            if len(pending) >= max_pending:
+                yield from _completed(pending)
+            try:
+                future = executor.submit(_run_chunk, chunk, cache_path)
+            except BrokenProcessPool:
+                # Chunks of the broken pool fail on their own; start a new pool
+                executor.shutdown(cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                future = executor.submit(_run_chunk, chunk, cache_path)
+            pending[future] = chunk
+        while pending:
+            yield from _completed(pending)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def read_specs(stream: TextIO) -> Iterator[Dict]:
+    """
+    Parse JSON lines, skipping blank lines.
+
+    Lines that are not valid JSON are passed on as error markers, so they
+    are reported in the output instead of stopping the batch.
+    """
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            spec = json.loads(line)
+        except json.JSONDecodeError as e:
+            spec = {'id': number, 'invalid_json': str(e)}
+        if isinstance(spec, dict):
+            spec.setdefault('id', number)
+        yield spec
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; exit status is 1 if any problem failed"""
+    parser = argparse.ArgumentParser(description="Solve problems from a JSON lines file")
+    parser.add_argument('input', nargs='?', default='-', help="Problem file ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="Result file ('-' for stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('-c', '--chunksize', type=int, default=1,
+                        help="Problems sent to a worker at once")
+    parser.add_argument('--cache', default=None,
+                        help="Result cache database reused across runs")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    failures = 0
+    try:
+        for record in run_batch(read_specs(source), args.workers, args.chunksize,
+                                cache_path=args.cache):
+            failures += record['status'] != 'ok'
+            target.write(json.dumps(record, allow_nan=False) + '\n')
+            target.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return min(failures, 1)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
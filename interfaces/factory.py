@@ -1,13 +1,58 @@
-# In interfaces/factory.py
-from solvers.extremum import ExtremumFinder
-from solvers.linear_system import LinearSystemSolver
-from solvers.differential import DifferentialEquationSolver
-from solvers.integral import Integrator
-from solvers.interpolation import Interpolator
+import importlib
+from typing import Dict, List, Union
+
 
 class MathSolverFactory:
-    @staticmethod
-    def create_solver(problem_type: str, *args, **kwargs):
+    # Solver for each problem type: a class, or 'module:ClassName' to import
+    # on first use so that only the modules of solvers in use are loaded
+    _registry: Dict[str, Union[str, type]] = {
+        'extremum': 'solvers.extremum:ExtremumFinder',
+        'linear_system': 'solvers.linear_system:LinearSystemSolver',
+        'differential': 'solvers.differential:DifferentialEquationSolver',
+        'integral': 'solvers.integral:Integrator',
+        'interpolation': 'solvers.interpolation:Interpolator'
+    }
+
+    @classmethod
+    def register(cls, problem_type: str, solver: Union[str, type]):
+        """
+        Register a solver for a problem type, replacing any previous one.
+
+        Args:
+            problem_type: Name of the problem type
+            solver: Solver class, or 'module:ClassName' to import lazily
+
+        Raises:
+            ValueError for malformed import paths
+        """
+        if isinstance(solver, str) and solver.count(':') != 1:
+            raise ValueError("Solver path must have the form 'module:ClassName'")
+        cls._registry[problem_type] = solver
+
+    @classmethod
+    def problem_types(cls) -> List[str]:
+        """Registered problem types"""
+        return list(cls._registry)
+
+    @classmethod
+    def solver_class(cls, problem_type: str) -> type:
+        """
+        Solver class of a problem type, importing its module if needed.
+
+        Raises:
+            ValueError for unknown problem types
+        """
+        solver = cls._registry.get(problem_type)
+        if solver is None:
+            raise ValueError("Unknown problem type")
+        if isinstance(solver, str):
+            module, _, name = solver.partition(':')
+            solver = getattr(importlib.import_module(module), name)
+            cls._registry[problem_type] = solver
+        return solver
+
+    @classmethod
+    def create_solver(cls, problem_type: str, *args, **kwargs):
         """
         Create appropriate solver instance based on problem type.
 
@@ -22,15 +67,6 @@ class MathSolverFactory:
         Raises:
             ValueError for unknown problem types
         """
-        solvers = {
-            'extremum': ExtremumFinder,
-            'linear_system': LinearSystemSolver,
-            'differential': DifferentialEquationSolver,
-            'integral': Integrator,
-            'interpolation': Interpolator
-        }
-
-        if problem_type not in solvers:
-            raise ValueError("Unknown problem type")
-
-        return solvers[problem_type](*args, **kwargs)
\ No newline at end of file
+        solver = cls.solver_class(problem_type)(*args, **kwargs)
+        solver.instrumentation.solver_created(solver, problem_type)
+        return solver
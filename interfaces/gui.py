@@ -2,15 +2,19 @@
 Graphical user interface for PyCalculus.
 Provides interactive access to all mathematical solvers through a Tkinter GUI.
 """
+import functools
 import tkinter as tk
 from tkinter import ttk, messagebox
-import math
-from typing import List, Callable
-from solvers import extremum
-from solvers import linear_system
-from solvers import differential
-from solvers import integral
-from solvers import interpolation
+from typing import List, Callable, Dict, Tuple
+from expressions.compiler import ExpressionError
+from expressions.cache import cached_expression
+from interfaces.factory import MathSolverFactory
+from interfaces.result_view import ResultView, ResultTable
+from interfaces.plot import PlotPanel
+from interfaces.worker import BackgroundSolve, SolveCancelled
+
+POLL_INTERVAL = 100  # Milliseconds between progress checks of a running solve
+SHORT_RESULT_ROWS = 100  # Longer tables are shown as a summary with pages
 
 
 class MathAppGUI:
@@ -18,7 +22,8 @@ class MathAppGUI:
         """Initialize the GUI application"""
         self.root = root
         self.root.title("PyCalculus")
-        self.root.geometry("800x600")
+        self.root.geometry("1250x650")
+        self._job = None  # Running BackgroundSolve, if any
         self._create_widgets()
         self._layout_widgets()
 
@@ -47,9 +52,11 @@ class MathAppGUI:
 
         # Solution display
         self.solution_label = ttk.Label(self.main_frame, text="Решение:")
-        self.solution_text = tk.Text(
-            self.main_frame, height=10, width=60, state=tk.DISABLED
-        )
+        self.result_view = ResultView(self.main_frame, height=10, width=60)
+        self.solution_text = self.result_view.text
+
+        # Plot of trajectories, interpolants and integrands
+        self.plot_panel = PlotPanel(self.main_frame, width=450, height=400)
 
         # Action buttons
         self.solve_button = ttk.Button(
@@ -58,6 +65,16 @@ class MathAppGUI:
         self.clear_button = ttk.Button(
             self.main_frame, text="Очистить", command=self._clear_fields
         )
+        self.cancel_button = ttk.Button(
+            self.main_frame, text="Отмена", command=self._cancel_solve, state=tk.DISABLED
+        )
+
+        # Time limit for a solve in seconds (empty for no limit)
+        self.time_limit_label = ttk.Label(self.main_frame, text="Лимит времени, с:")
+        self.time_limit_var = tk.StringVar(value="60")
+        self.time_limit_entry = ttk.Entry(
+            self.main_frame, textvariable=self.time_limit_var, width=10
+        )
 
         # Status bar
         self.status_var = tk.StringVar(value="Готов")
@@ -80,11 +97,17 @@ class MathAppGUI:
 
         # Solution display
         self.solution_label.grid(row=3, column=0, sticky=tk.W, pady=5)
-        self.solution_text.grid(row=4, column=0, columnspan=2, pady=5)
+        self.result_view.grid(row=4, column=0, columnspan=3, pady=5)
+        self.plot_panel.grid(row=0, column=3, rowspan=7, padx=10, sticky=tk.NSEW)
+        self.main_frame.columnconfigure(3, weight=1)
+        self.main_frame.rowconfigure(4, weight=1)
 
         # Buttons
         self.solve_button.grid(row=5, column=0, pady=10)
         self.clear_button.grid(row=5, column=1, pady=10)
+        self.cancel_button.grid(row=5, column=2, pady=10)
+        self.time_limit_label.grid(row=6, column=0, sticky=tk.W)
+        self.time_limit_entry.grid(row=6, column=1, sticky=tk.W)
 
         # Status bar
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
@@ -105,7 +128,7 @@ class MathAppGUI:
         menu.delete(0, "end")
 
         if problem_type == "extremum":
-            methods = ["gradient", "newton"]
+            methods = ["gradient", "newton", "bfgs", "lbfgs", "nelder_mead"]
         elif problem_type == "linear_system":
             methods = ["gaussian"]
         elif problem_type == "differential":
@@ -211,56 +234,126 @@ class MathAppGUI:
         self.points_text.insert(tk.END, "0 0\n1 1\n2 4")
 
     def _solve_problem(self):
-        """Solve the current problem based on inputs"""
+        """Start solving the current problem in the background"""
+        if self._job is not None:
+            return
         problem_type = self.problem_var.get()
-        method = self.method_var.get()
         try:
+            # Inputs are read here; expressions are compiled by the background job
             if problem_type == "extremum":
-                self._solve_extremum()
+                setup, show = self._prepare_extremum()
             elif problem_type == "linear_system":
-                self._solve_linear_system()
+                setup, show = self._prepare_linear_system()
             elif problem_type == "differential":
-                self._solve_differential()
+                setup, show = self._prepare_differential()
             elif problem_type == "integral":
-                self._solve_integral()
+                setup, show = self._prepare_integral()
             elif problem_type == "interpolation":
-                self._solve_interpolation()
-
-            self.status_var.set("Решение вычислено успешно")
+                setup, show = self._prepare_interpolation()
+            self._job = BackgroundSolve(setup=setup, time_limit=self._time_limit()).start()
         except Exception as e:
             messagebox.showerror("Ошибка", str(e))
             self.status_var.set("Ошибка: " + str(e))
+            return
+
+        self.solve_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_var.set("Вычисление...")
+        self.root.after(POLL_INTERVAL, self._poll_solve, show)
+
+    def _time_limit(self):
+        """Time limit in seconds from its entry, or None for no limit"""
+        text = self.time_limit_var.get().strip()
+        if not text:
+            return None
+        try:
+            limit = float(text)
+        except ValueError:
+            raise ValueError("Лимит времени должен быть числом")
+        if limit <= 0:
+            raise ValueError("Лимит времени должен быть положительным")
+        return limit
+
+    def _poll_solve(self, show: Callable[[object, Dict], None]):
+        """Report progress of the running solve and show its result when done"""
+        job = self._job
+        if not job.done and job.preparing and (job.cancelled or job.timed_out):
+            # Compilation cannot be interrupted: leave it to finish unseen
+            self._job = None
+            self.solve_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_var.set("Вычисление отменено" if job.cancelled else "Превышен лимит времени")
+            return
+        if not job.done:
+            if job.cancelled:
+                self.root.after(POLL_INTERVAL, self._poll_solve, show)
+                return
+            progress = job.progress
+            status = f"Вычисление... {job.elapsed:.1f} с"
+            if progress is not None:
+                iteration, error = progress
+                status += f", итерация {iteration}"
+                if error is not None:
+                    status += f", погрешность {error:.3g}"
+            self.status_var.set(status)
+            self.root.after(POLL_INTERVAL, self._poll_solve, show)
+            return
+
+        self._job = None
+        self.solve_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.plot_panel.clear()
+        try:
+            show(job.solver, job.result())
+            self.status_var.set(f"Решение вычислено успешно за {job.elapsed:.2f} с")
+        except SolveCancelled:
+            self.status_var.set("Вычисление отменено" if job.cancelled else "Превышен лимит времени")
+        except Exception as e:
+            messagebox.showerror("Ошибка", str(e))
+            self.status_var.set("Ошибка: " + str(e))
+
+    def _cancel_solve(self):
+        """Stop the running solve at its next iteration"""
+        if self._job is not None:
+            self._job.cancel()
+            self.status_var.set("Отмена...")
 
-    def _solve_extremum(self):
-        """Solve extremum finding problem"""
+    def _prepare_extremum(self) -> Tuple[Callable, Callable]:
+        """Read the extremum problem; the setup compiles it and creates the solver"""
         func_str = self.function_entry.get()
         variables_str = self.variables_entry.get()
         initial_guess_str = self.initial_guess_entry.get()
+        method = self.method_var.get()
 
         variables = [v.strip() for v in variables_str.split(",")]
-        func = self._create_function_from_string(func_str, variables)
         initial_guess = [float(x.strip()) for x in initial_guess_str.split(",")]
 
-        solver = extremum.ExtremumFinder(func, variables, self.method_var.get())
-        result = solver.solve(initial_guess)
-
-        self.solution_text.config(state=tk.NORMAL)
-        self.solution_text.delete(1.0, tk.END)
-
+        def setup():
+            try:
+                func = cached_expression(func_str, variables, derivatives=True)
+                differentiation = 'symbolic'
+            except ExpressionError:
+                # Functions without known derivatives fall back to finite differences
+                func = self._create_function_from_string(func_str, variables)
+                differentiation = 'numeric'
+            solver = MathSolverFactory.create_solver('extremum', func, variables, method,
+                                                     differentiation=differentiation)
+            return solver, (initial_guess,)
+
+        return setup, self._show_extremum
+
+    def _show_extremum(self, solver, result: Dict):
         if result['converged']:
-            self.solution_text.insert(tk.END, f"Решение найдено в точке:\n")
-            for var, val in zip(variables, result['point']):
-                self.solution_text.insert(tk.END, f"{var} = {val:.6f}\n")
-            self.solution_text.insert(tk.END, f"\nЗначение функции: {result['value']:.6f}\n")
-            self.solution_text.insert(tk.END, f"Итераций: {result['iterations']}\n")
+            lines = ["Решение найдено в точке:\n"]
+            lines += [f"{var} = {val:.6f}\n" for var, val in zip(solver.variables, result['point'])]
+            lines.append(f"\nЗначение функции: {result['value']:.6f}\n")
+            lines.append(f"Итераций: {result['iterations']}\n")
         else:
-            self.solution_text.insert(tk.END, "Решение не сошлось\n")
-            self.solution_text.insert(tk.END, f"Последняя точка: {result['point']}\n")
+            lines = ["Решение не сошлось\n", f"Последняя точка: {result['point']}\n"]
+        self.result_view.show_text(lines)
 
-        self.solution_text.config(state=tk.DISABLED)
-
-    def _solve_linear_system(self):
-        """Solve linear system problem"""
+    def _prepare_linear_system(self) -> Tuple[Callable, Callable]:
+        """Read the linear system; the setup creates the solver"""
         matrix_lines = self.matrix_text.get("1.0", tk.END).strip().split("\n")
         matrix = []
         for line in matrix_lines:
@@ -270,94 +363,111 @@ class MathAppGUI:
         vector_lines = self.vector_text.get("1.0", tk.END).strip().split("\n")
         vector = [float(x) for x in vector_lines]
 
-        solver = linear_system.LinearSystemSolver(matrix, vector)
-        result = solver.solve()
-
-        self.solution_text.config(state=tk.NORMAL)
-        self.solution_text.delete(1.0, tk.END)
+        setup = lambda: (MathSolverFactory.create_solver('linear_system', matrix, vector), ())
+        return setup, self._show_linear_system
 
+    def _show_linear_system(self, solver, result: Dict):
         if result['is_singular']:
-            self.solution_text.insert(tk.END, "Матрица вырождена или почти вырождена\n")
+            self.result_view.show_text(["Матрица вырождена или почти вырождена\n"])
+            return
+        solution = result['solution']
+        if len(solution) <= SHORT_RESULT_ROWS:
+            self.result_view.show_text(
+                ["Решение:\n"] + [f"x{i} = {val:.6f}\n" for i, val in enumerate(solution)])
         else:
-            self.solution_text.insert(tk.END, "Решение:\n")
-            for i, val in enumerate(result['solution']):
-                self.solution_text.insert(tk.END, f"x{i} = {val:.6f}\n")
+            table = ResultTable(['i', 'x'], list(enumerate(solution)))
+            self.result_view.show_table(["Решение:\n"], table)
 
-        self.solution_text.config(state=tk.DISABLED)
-
-    def _solve_differential(self):
-        """Solve differential equation problem"""
+    def _prepare_differential(self) -> Tuple[Callable, Callable]:
+        """Read the differential equation; the setup compiles it and creates the solver"""
         equation_str = self.equation_entry.get()
         x0 = float(self.x0_entry.get())
         y0 = float(self.y0_entry.get())
         x_end = float(self.x_end_entry.get())
+        method = self.method_var.get()
+
+        def setup():
+            func = self._create_function_from_string(equation_str, ['x', 'y'])
+            return MathSolverFactory.create_solver('differential', func, method), (x0, y0, x_end)
 
-        func = self._create_function_from_string(equation_str, ['x', 'y'])
-        solver = differential.DifferentialEquationSolver(func, self.method_var.get())
-        result = solver.solve(x0, y0, x_end)
-
-        self.solution_text.config(state=tk.NORMAL)
-        self.solution_text.delete(1.0, tk.END)
-        self.solution_text.insert(tk.END, f"Точки решения (x, y):\n")
-        for x, y in result['points']:
-            self.solution_text.insert(tk.END, f"{x:.4f}, {y:.6f}\n")
-        self.solution_text.insert(tk.END, f"\nМетод: {result['method']}\n")
-        self.solution_text.insert(tk.END, f"Шаг: {result['step_size']}\n")
-        self.solution_text.config(state=tk.DISABLED)
-
-    def _solve_integral(self):
-        """Solve integration problem"""
+        return setup, self._show_differential
+
+    def _show_differential(self, solver, result: Dict):
+        lines = [f"Метод: {result['method']}\n", f"Шаг: {result['step_size']}\n"]
+        points = result['points']
+        table = ResultTable(['x', 'y'], points)
+        if len(points) <= SHORT_RESULT_ROWS:
+            lines = ["Точки решения (x, y):\n"] + [f"{x:.4f}, {y:.6f}\n" for x, y in points] \
+                + ["\n"] + lines
+            self.result_view.show_text(lines)
+        else:
+            self.result_view.show_table(lines, table)
+        self.plot_panel.plot_data(table.data[:, 0], table.data[:, 1])
+
+    def _prepare_integral(self) -> Tuple[Callable, Callable]:
+        """Read the integral; the setup compiles the integrand and creates the solver"""
         func_str = self.integral_func_entry.get()
         a = float(self.lower_bound_entry.get())
         b = float(self.upper_bound_entry.get())
+        method = self.method_var.get()
 
-        func = self._create_function_from_string(func_str, ['x'])
-        solver = integral.Integrator(func, self.method_var.get())
-        result = solver.solve(a, b)
+        def setup():
+            # Integration methods evaluate many nodes at once, so compile for arrays
+            func = self._create_function_from_string(func_str, ['x'], backend='numpy')
+            return MathSolverFactory.create_solver('integral', func, method), (a, b)
 
-        self.solution_text.config(state=tk.NORMAL)
-        self.solution_text.delete(1.0, tk.END)
-        self.solution_text.insert(tk.END, f"Значение интеграла: {result['value']:.6f}\n")
+        return setup, functools.partial(self._show_integral, a, b)
+
+    def _show_integral(self, a: float, b: float, solver, result: Dict):
+        lines = [f"Значение интеграла: {result['value']:.6f}\n"]
         if 'segments' in result:
-            self.solution_text.insert(tk.END, f"Сегментов: {result['segments']}\n")
+            lines.append(f"Сегментов: {result['segments']}\n")
         if 'iterations' in result:
-            self.solution_text.insert(tk.END, f"Итераций: {result['iterations']}\n")
-        self.solution_text.insert(tk.END, f"Метод: {result['method']}\n")
-        self.solution_text.config(state=tk.DISABLED)
+            lines.append(f"Итераций: {result['iterations']}\n")
+        lines.append(f"Метод: {result['method']}\n")
+        self.result_view.show_text(lines)
+        self.plot_panel.plot_function(solver.func, min(a, b), max(a, b))
 
-    def _solve_interpolation(self):
-        """Solve interpolation problem"""
+    def _prepare_interpolation(self) -> Tuple[Callable, Callable]:
+        """Read the interpolation nodes; the setup creates the solver"""
         points_lines = self.points_text.get("1.0", tk.END).strip().split("\n")
         points = []
         for line in points_lines:
             x, y = map(float, line.split())
             points.append((x, y))
 
-        solver = interpolation.Interpolator(points, self.method_var.get())
-        result = solver.solve()
+        method = self.method_var.get()
+        setup = lambda: (MathSolverFactory.create_solver('interpolation', points, method), ())
+        return setup, functools.partial(self._show_interpolation, points)
 
-        self.solution_text.config(state=tk.NORMAL)
-        self.solution_text.delete(1.0, tk.END)
-        self.solution_text.insert(tk.END, f"Интерполяционная функция создана\n")
-        self.solution_text.insert(tk.END, f"Метод: {result['method']}\n")
+    def _show_interpolation(self, points: List[Tuple[float, float]], solver, result: Dict):
+        lines = ["Интерполяционная функция создана\n", f"Метод: {result['method']}\n"]
         if 'degree' in result:
-            self.solution_text.insert(tk.END, f"Степень: {result['degree']}\n")
+            lines.append(f"Степень: {result['degree']}\n")
         if 'segments' in result:
-            self.solution_text.insert(tk.END, f"Сегментов: {result['segments']}\n")
+            lines.append(f"Сегментов: {result['segments']}\n")
 
         # Show example evaluation
         example_x = sum(p[0] for p in points) / len(points)
         example_y = result['function'](example_x)
-        self.solution_text.insert(tk.END, f"\nПример вычисления при x={example_x:.2f}: {example_y:.6f}\n")
-        self.solution_text.config(state=tk.DISABLED)
+        lines.append(f"\nПример вычисления при x={example_x:.2f}: {example_y:.6f}\n")
+        self.result_view.show_text(lines)
+
+        # Interpolant over the nodes with a margin on both sides
+        x_min, x_max = min(p[0] for p in points), max(p[0] for p in points)
+        margin = (x_max - x_min) * 0.1
+        self.plot_panel.plot_function(result['function'], x_min - margin, x_max + margin)
+        self.plot_panel.plot_points([p[0] for p in points], [p[1] for p in points])
 
-    def _create_function_from_string(self, func_str: str, variables: List[str]) -> Callable:
+    def _create_function_from_string(self, func_str: str, variables: List[str],
+                                     backend: str = 'math') -> Callable:
         """
         Safely create a function from string input.
 
         Args:
             func_str: Function expression as string
             variables: List of variable names in the function
+            backend: 'math' for scalar evaluation or 'numpy' for array evaluation
 
         Returns:
             Callable function
@@ -366,34 +476,12 @@ class MathAppGUI:
             ValueError if function creation fails
         """
         try:
-            # Create safe environment for eval
-            math_dict = {name: getattr(math, name) for name in dir(math) if not name.startswith('_')}
-            math_dict.update({'__builtins__': None})
-
-            # Add variables to environment
-            for var in variables:
-                math_dict[var] = None
-
-            # Compile and check for disallowed names
-            code = compile(func_str, '<string>', 'eval')
-            for name in code.co_names:
-                if name not in math_dict:
-                    raise ValueError(f"Недопустимое имя в функции: {name}")
-
-            # Create function with variables bound to arguments
-            def func(*args):
-                local_dict = math_dict.copy()
-                for var, arg in zip(variables, args):
-                    local_dict[var] = arg
-                return eval(code, {'__builtins__': None}, local_dict)
-
-            return func
+            return cached_expression(func_str, variables, backend)
         except Exception as e:
             raise ValueError(f"Ошибка создания функции: {str(e)}")
 
     def _clear_fields(self):
         """Clear solution text and reset status"""
-        self.solution_text.config(state=tk.NORMAL)
-        self.solution_text.delete(1.0, tk.END)
-        self.solution_text.config(state=tk.DISABLED)
+        self.result_view.clear()
+        self.plot_panel.clear()
         self.status_var.set("Готов")
@@ -0,0 +1,259 @@
+"""
+Aggregate solver metrics.
+Collects latency, iteration and evaluation-count histograms per solver and
+method, solver creation counts from MathSolverFactory and cache hit rates.
+Exports them as OpenMetrics text and individual solves as Chrome
+`trace_event` JSON, which trace viewers such as Perfetto or about:tracing
+can display.
+
+Usage:
+    registry = MetricsRegistry()
+    registry.install()               # All solvers report to the registry
+    ...
+    registry.write_openmetrics('solvers.prom')
+    registry.write_chrome_trace('solves.json')
+"""
+import bisect
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+from expressions.cache import default_cache
+from interfaces.factory import MathSolverFactory
+from solvers.base import MathSolver, Instrumentation, NULL_INSTRUMENTATION, SolveRecord
+
+# Bucket bounds are floats, so their le labels are canonical numbers ("1.0", not "1")
+LATENCY_BUCKETS = (1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+COUNT_BUCKETS = (1.0, 10.0, 100.0, 1000.0, 10000.0, 100000.0, 1000000.0)
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the OpenMetrics sense"""
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound label, cumulative count) pairs including +Inf"""
+        total, buckets = 0, []
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            buckets.append(('+Inf' if bound == math.inf else _number(bound), total))
+        return buckets
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class MetricsRegistry(Instrumentation):
+    """
+    Thread-safe registry of solver metrics.
+
+    As an Instrumentation it receives solve events directly; measurements of
+    solves that ran elsewhere (e.g. in worker processes) can be added with
+    observe_solve.
+    """
+    enabled = True
+
+    def __init__(self, max_trace_events: int = 100000, trace_iterations: bool = False):
+        """
+        Args:
+            max_trace_events: Number of most recent trace events kept
+            trace_iterations: Also record every iteration as a trace event
+        """
+        self.trace_iterations = trace_iterations
+        self._lock = threading.Lock()
+        self._created: Dict[Tuple, int] = {}
+        self._solves: Dict[Tuple, int] = {}
+        self._latency: Dict[Tuple, Histogram] = {}
+        self._iterations: Dict[Tuple, Histogram] = {}
+        self._evaluations: Dict[Tuple, Histogram] = {}
+        self._caches = {'expressions': default_cache}
+        self._events = deque(maxlen=max_trace_events)
+        self._pid = os.getpid()
+
+    def install(self):
+        """Make this registry the instrumentation of all solvers"""
+        MathSolver.instrumentation = self
+
+    def uninstall(self):
+        """Restore the disabled default instrumentation"""
+        if MathSolver.instrumentation is self:
+            MathSolver.instrumentation = NULL_INSTRUMENTATION
+
+    def register_cache(self, name: str, cache):
+        """Report the hit rate of a cache whose stats() has 'hits' and 'misses'"""
+        with self._lock:
+            self._caches[name] = cache
+
+    # Instrumentation events
+
+    def solver_created(self, solver, problem_type):
+        with self._lock:
+            self._created[(problem_type,)] = self._created.get((problem_type,), 0) + 1
+
+    def iteration(self, solver, record, iteration, point, error):
+        if self.trace_iterations:
+            args = {'iteration': iteration}
+            if error is not None:
+                args['error'] = float(error)
+            with self._lock:
+                self._events.append({'name': 'iteration', 'cat': 'iteration', 'ph': 'i', 's': 't',
+                                     'ts': time.perf_counter() * 1e6, 'pid': self._pid,
+                                     'tid': threading.get_ident(), 'args': args})
+
+    def solve_finished(self, solver, record: SolveRecord, result):
+        self.observe_solve(record.solver, record.method, record.elapsed,
+                           iterations=record.iterations, evaluations=record.evaluations,
+                           status='error' if record.error else 'ok')
+        self._trace_record(record)
+
+    # Measurements
+
+    def observe_solve(self, solver: str, method: Optional[str], seconds: float,
+                      iterations: Optional[int] = None, evaluations: Optional[int] = None,
+                      status: str = 'ok'):
+        """Add one completed solve to the aggregate metrics"""
+        key = (solver, method or '')
+        with self._lock:
+            self._solves[key + (status,)] = self._solves.get(key + (status,), 0) + 1
+            self._histogram(self._latency, key, LATENCY_BUCKETS).observe(seconds)
+            if iterations is not None:
+                self._histogram(self._iterations, key, COUNT_BUCKETS).observe(iterations)
+            if evaluations is not None:
+                self._histogram(self._evaluations, key, COUNT_BUCKETS).observe(evaluations)
+
+    def observe_record(self, spec: Dict, record: Dict):
+        """Add a result record of the batch runner or solve service"""
+        try:
+            solver_class = MathSolverFactory.solver_class(spec.get('type'))
+        except ValueError:
+            solver_class = None
+        method = spec.get('method')
+        if method is None and solver_class is not None:
+            # Label with the default method, as solves in this process are
+            parameter = inspect.signature(solver_class).parameters.get('method')
+            method = parameter.default if parameter is not None else None
+        result = record.get('result')
+        evaluations = result.get('evaluations') if isinstance(result, dict) else None
+        self.observe_solve(solver_class.__name__ if solver_class else str(spec.get('type')),
+                           method, record['elapsed'], evaluations=evaluations, status=record['status'])
+
+    @staticmethod
+    def _histogram(histograms: Dict, key: Tuple, bounds) -> Histogram:
+        if key not in histograms:
+            histograms[key] = Histogram(bounds)
+        return histograms[key]
+
+    def _trace_record(self, record: SolveRecord):
+        tid = threading.get_ident()
+        name = f"{record.solver}.{record.method}" if record.method else record.solver
+        events = [{'name': name, 'cat': 'solve', 'ph': 'X', 'ts': record.started * 1e6,
+                   'dur': record.elapsed * 1e6, 'pid': self._pid, 'tid': tid,
+                   'args': {'iterations': record.iterations, 'evaluations': record.evaluations,
+                            'evaluation_seconds': record.evaluation_time,
+                            'error': record.error}}]
+        if record.first_iteration is not None:
+            events.append({'name': 'setup', 'cat': 'phase', 'ph': 'X', 'ts': record.started * 1e6,
+                           'dur': (record.first_iteration - record.started) * 1e6,
+                           'pid': self._pid, 'tid': tid})
+            events.append({'name': 'iterations', 'cat': 'phase', 'ph': 'X',
+                           'ts': record.first_iteration * 1e6,
+                           'dur': (record.finished - record.first_iteration) * 1e6,
+                           'pid': self._pid, 'tid': tid})
+        with self._lock:
+            self._events.extend(events)
+
+    # Export
+
+    def openmetrics(self) -> str:
+        """Metrics in the OpenMetrics text exposition format"""
+        with self._lock:
+            created = dict(self._created)
+            solves = dict(self._solves)
+            histograms = [
+                ('solver_latency_seconds', 'Wall time of solves.', dict(self._latency)),
+                ('solver_iterations', 'Iterations per solve.', dict(self._iterations)),
+                ('solver_evaluations', 'Function evaluations per solve.', dict(self._evaluations)),
+            ]
+            histograms = [(name, text, {k: (h.cumulative(), h.sum, h.count) for k, h in data.items()})
+                          for name, text, data in histograms]
+            caches = dict(self._caches)
+
+        lines = ['# TYPE solvers_created counter',
+                 '# HELP solvers_created Solvers created by MathSolverFactory.']
+        for (problem_type,), count in sorted(created.items()):
+            lines.append(f"solvers_created_total{_labels({'problem_type': problem_type})} {count}")
+
+        lines += ['# TYPE solver_solves counter', '# HELP solver_solves Completed solves.']
+        for (solver, method, status), count in sorted(solves.items()):
+            labels = _labels({'solver': solver, 'method': method, 'status': status})
+            lines.append(f"solver_solves_total{labels} {count}")
+
+        for name, text, data in histograms:
+            lines += [f'# TYPE {name} histogram', f'# HELP {name} {text}']
+            for (solver, method), (buckets, total, count) in sorted(data.items()):
+                labels = {'solver': solver, 'method': method}
+                for bound, cumulative in buckets:
+                    lines.append(f"{name}_bucket{_labels(dict(labels, le=bound))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(float(total))}")
+                lines.append(f"{name}_count{_labels(labels)} {count}")
+
+        stats = {name: cache.stats() for name, cache in sorted(caches.items())}
+        for metric, key in (('cache_hits', 'hits'), ('cache_misses', 'misses')):
+            lines += [f'# TYPE {metric} counter', f'# HELP {metric} Cache {key}.']
+            for name, values in stats.items():
+                lines.append(f"{metric}_total{_labels({'cache': name})} {values[key]}")
+        lines += ['# TYPE cache_hit_ratio gauge', '# HELP cache_hit_ratio Fraction of lookups that hit.']
+        for name, values in stats.items():
+            lookups = values['hits'] + values['misses']
+            ratio = values['hits'] / lookups if lookups else 0.0
+            lines.append(f"cache_hit_ratio{_labels({'cache': name})} {_number(ratio)}")
+
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def chrome_trace(self) -> Dict:
+        """Recorded solves as a Chrome trace_event document"""
+        with self._lock:
+            events = list(self._events)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_openmetrics(self, path: str):
+        """Write OpenMetrics text atomically, e.g. for a textfile collector"""
+        _write_atomic(path, self.openmetrics())
+
+    def write_chrome_trace(self, path: str):
+        """Write the recorded solves as Chrome trace JSON"""
+        _write_atomic(path, json.dumps(self.chrome_trace()))
+
+
+def _write_atomic(path: str, text: str):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temporary, path)
@@ -0,0 +1,364 @@
+"""
+Plot panel of the GUI.
+Draws sampled data (ODE trajectories) and functions (interpolants,
+integrands) on a Tk canvas. Data is reduced to at most a few points per
+pixel column with min/max decimation over a precomputed level-of-detail
+pyramid, so the cost of a redraw depends on the canvas width rather than
+on the number of points. Functions are evaluated on a pixel grid that is
+kept across pans and nests across zooms, so panning only evaluates the
+newly exposed columns and zooming reuses the samples on the new grid.
+NumPy is imported when something is plotted, not when the GUI starts.
+"""
+import math
+import tkinter as tk
+from tkinter import ttk
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ZOOM_STEP = 1.25  # View scale factor per mouse wheel step
+
+
+class MinMaxPyramid:
+    """
+    Level-of-detail pyramid of a polyline with increasing x.
+
+    Level k holds the minimum and maximum y of consecutive blocks of 2**k
+    points, so any view can be decimated from the coarsest level that still
+    has a few blocks per pixel column.
+    """
+
+    def __init__(self, x, y):
+        import numpy as np
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("x and y must be one-dimensional arrays of equal length")
+        if len(x) and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind='stable')
+            x, y = x[order], y[order]
+        # Each level: (block start x, block minimum y, block maximum y)
+        self.levels = [(x, y, y)]
+        while len(self.levels[-1][0]) > 1:
+            bx, low, high = self.levels[-1]
+            even = len(bx) - len(bx) % 2
+            bx_next = bx[:even:2]
+            low_next = np.fmin(low[:even:2], low[1:even:2])
+            high_next = np.fmax(high[:even:2], high[1:even:2])
+            if even < len(bx):  # Odd block at the end stays on its own
+                bx_next = np.append(bx_next, bx[-1])
+                low_next = np.append(low_next, low[-1])
+                high_next = np.append(high_next, high[-1])
+            self.levels.append((bx_next, low_next, high_next))
+
+    @property
+    def x(self) -> 'np.ndarray':
+        return self.levels[0][0]
+
+    @property
+    def y(self) -> 'np.ndarray':
+        return self.levels[0][1]
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """(x min, x max, y min, y max) of the finite data"""
+        import numpy as np
+        x, y = self.x, self.y
+        finite = np.isfinite(y)
+        if not finite.any():
+            return float(x[0]), float(x[-1]), -1.0, 1.0
+        return float(x[0]), float(x[-1]), float(np.min(y[finite])), float(np.max(y[finite]))
+
+    def sample(self, x_min: float, x_max: float, columns: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Polyline of the view [x_min, x_max] with at most two points per
+        pixel column (its minimum and maximum), plus one neighbouring point
+        on each side so that lines continue to the edges.
+        """
+        import numpy as np
+        x = self.x
+        start = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(x, x_max, side='right')) + 1, len(x))
+        visible = stop - start
+        if visible <= 2 * columns:
+            return x[start:stop], self.y[start:stop]
+
+        # Coarsest level that still has at least two blocks per column
+        level = min(int(math.log2(visible / (2 * columns))), len(self.levels) - 1)
+        bx, low, high = self.levels[level]
+        first, last = start >> level, min((stop - 1) >> level, len(bx) - 1) + 1
+        bx, low, high = bx[first:last], low[first:last], high[first:last]
+
+        # Group blocks into pixel columns and reduce each group
+        width = (x_max - x_min) / columns
+        column = np.clip(((bx - x_min) / width).astype(np.int64), -1, columns)
+        starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+        lows = np.fmin.reduceat(low, starts)
+        highs = np.fmax.reduceat(high, starts)
+        centers = x_min + (column[starts] + 0.5) * width
+        xs = np.repeat(centers, 2)
+        ys = np.column_stack((lows, highs)).ravel()
+        return xs, ys
+
+
+class FunctionSampler:
+    """
+    Samples a function on a dyadic pixel grid of a view.
+
+    The grid step is the pixel width of the first view scaled by a power of
+    two, the largest one not above the current pixel width (one to two
+    samples per pixel column). Grid points are multiples of the step, so a
+    pan keeps the grid and only the columns that came into view are
+    evaluated; a zoom keeps the grid until the pixel width crosses a power
+    of two, and then halving the step keeps every other sample while
+    doubling it keeps every sample of the coarser grid.
+    """
+
+    def __init__(self, func: Callable):
+        """
+        Args:
+            func: Function of one variable; evaluated on arrays if its
+                `vectorized` attribute is true, point by point otherwise
+        """
+        import numpy as np
+        self.func = func
+        self.evaluations = 0
+        self._base = None  # Pixel width of the first view
+        self._level = None  # Grid step is _base * 2**_level
+        self._step = None
+        self._first = 0  # Grid index of the first cached sample
+        self._values = np.empty(0)
+
+    def _evaluate(self, indices: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+        x = indices * self._step
+        self.evaluations += len(x)
+        with np.errstate(all='ignore'):
+            if getattr(self.func, 'vectorized', False):
+                values = np.broadcast_to(np.asarray(self.func(x), dtype=float), x.shape)
+                return np.array(values)
+            values = np.empty(len(x))
+            for i, point in enumerate(x.tolist()):
+                try:
+                    values[i] = self.func(point)
+                except (ArithmeticError, ValueError):
+                    values[i] = np.nan
+            return values
+
+    def _regrid(self, level: int, first: int, stop: int):
+        """Replace the cache by grid points first..stop-1 of another level"""
+        import numpy as np
+        indices = np.arange(first, stop)
+        shift = self._level - level
+        if shift > 0:  # Finer grid: every 2**shift-th point is a cached one
+            old = indices // 2 ** shift - self._first
+            known = (indices % 2 ** shift == 0) & (old >= 0) & (old < len(self._values))
+        elif shift > -32:  # Coarser grid: every point is a cached one, if in range
+            old = indices * 2 ** -shift - self._first
+            known = (old >= 0) & (old < len(self._values))
+        else:
+            old, known = indices, np.zeros(len(indices), dtype=bool)
+        values = np.empty(len(indices))
+        values[known] = self._values[old[known]]
+        self._level, self._step = level, math.ldexp(self._base, level)
+        values[~known] = self._evaluate(indices[~known])
+        self._first, self._values = first, values
+
+    def sample(self, x_min: float, x_max: float, columns: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Function values at the grid points of the view"""
+        import numpy as np
+        if not x_max > x_min or columns < 1:
+            raise ValueError("View must have a positive width")
+        width = (x_max - x_min) / columns
+        if self._base is None:
+            self._base = width
+        level = math.floor(math.log2(width / self._base) + 1e-9)
+        step = math.ldexp(self._base, level)
+        first = math.floor(x_min / step)
+        stop = math.ceil(x_max / step) + 1
+        if self._level is None:
+            self._level, self._step = level, step
+        elif level != self._level:
+            self._regrid(level, first, stop)
+        cached_stop = self._first + len(self._values)
+        if stop <= self._first or first >= cached_stop:
+            self._first, self._values = first, self._evaluate(np.arange(first, stop))
+        else:
+            # Extend the cached range by the newly exposed columns only
+            if first < self._first:
+                left = self._evaluate(np.arange(first, self._first))
+                self._values = np.concatenate((left, self._values))
+                self._first = first
+            if stop > cached_stop:
+                right = self._evaluate(np.arange(cached_stop, stop))
+                self._values = np.concatenate((self._values, right))
+            # Keep the cache bounded to a few views' worth of samples
+            if len(self._values) > 8 * (stop - first):
+                offset = first - self._first
+                self._values = self._values[offset:offset + stop - first]
+                self._first = first
+        offset = first - self._first
+        values = self._values[offset:offset + stop - first]
+        return np.arange(first, stop) * self._step, values
+
+
+class PlotPanel(ttk.Frame):
+    """Canvas plot of data series and functions with mouse zoom and pan"""
+
+    MARGIN = 40  # Pixels reserved for the tick labels
+
+    def __init__(self, master, width: int = 400, height: int = 300):
+        super().__init__(master)
+        self.canvas = tk.Canvas(self, width=width, height=height, background='white')
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.series: List[Tuple[str, object, str]] = []  # (kind, source, color)
+        self.view: Optional[List[float]] = None  # x min, x max, y min, y max
+        self._redraw_pending = False
+        self._drag = None
+
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+        self.canvas.bind('<ButtonPress-1>', self._start_drag)
+        self.canvas.bind('<B1-Motion>', self._drag_to)
+        self.canvas.bind('<MouseWheel>', lambda event: self._zoom(event, event.delta > 0))
+        self.canvas.bind('<Button-4>', lambda event: self._zoom(event, True))
+        self.canvas.bind('<Button-5>', lambda event: self._zoom(event, False))
+        self.canvas.bind('<Double-Button-1>', lambda event: self.reset_view())
+
+    def clear(self):
+        self.series = []
+        self.view = None
+        self.canvas.delete('all')
+
+    def plot_data(self, x, y, color: str = 'blue'):
+        """Add a polyline of (possibly millions of) points"""
+        self.series.append(('data', MinMaxPyramid(x, y), color))
+        self.reset_view()
+
+    def plot_points(self, x, y, color: str = 'red'):
+        """Add point markers, e.g. interpolation nodes"""
+        self.series.append(('points', MinMaxPyramid(x, y), color))
+        self.reset_view()
+
+    def plot_function(self, func: Callable, x_min: float, x_max: float, color: str = 'blue'):
+        """Add a function of one variable, initially shown on [x_min, x_max]"""
+        x_min, x_max = _widen(x_min, x_max)  # e.g. an integral with equal bounds
+        self.series.append(('function', (FunctionSampler(func), x_min, x_max), color))
+        self.reset_view()
+
+    def reset_view(self):
+        """Fit the view to all series"""
+        import numpy as np
+        boxes = []
+        for kind, source, _ in self.series:
+            if kind == 'function':
+                sampler, x_min, x_max = source
+                left, _, right, _ = self._plot_area()
+                _, values = sampler.sample(x_min, x_max, right - left)
+                finite = values[np.isfinite(values)]
+                if len(finite):
+                    boxes.append((x_min, x_max, float(finite.min()), float(finite.max())))
+            elif len(source.x):
+                boxes.append(source.bounds())
+        if not boxes:
+            return
+        x_min, x_max = min(b[0] for b in boxes), max(b[1] for b in boxes)
+        y_min, y_max = min(b[2] for b in boxes), max(b[3] for b in boxes)
+        x_min, x_max = _widen(x_min, x_max)
+        pad = (y_max - y_min) * 0.05 or max(abs(y_max), 1.0) * 0.05
+        self.view = [x_min, x_max, y_min - pad, y_max + pad]
+        self.redraw()
+
+    def _plot_area(self) -> Tuple[int, int, int, int]:
+        """Canvas coordinates (left, top, right, bottom) of the plotting area"""
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1:  # Not mapped yet
+            width, height = self.canvas.winfo_reqwidth(), self.canvas.winfo_reqheight()
+        left, top = self.MARGIN, 10
+        return left, top, max(width - 10, left + 1), max(height - self.MARGIN // 2 - 10, top + 1)
+
+    def redraw(self):
+        """Schedule a redraw; several requests before the next idle time draw once"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._draw)
+
+    def _draw(self):
+        import numpy as np
+        self._redraw_pending = False
+        self.canvas.delete('all')
+        if self.view is None:
+            return
+        x_min, x_max, y_min, y_max = self.view
+        left, top, right, bottom = self._plot_area()
+        columns, height = right - left, bottom - top
+        sx = (right - left) / (x_max - x_min)
+        sy = (bottom - top) / (y_max - y_min)
+
+        def to_canvas(xs, ys):
+            px = left + (xs - x_min) * sx
+            # Clip far-away values so that Tk coordinates stay finite and small
+            py = np.clip(bottom - (ys - y_min) * sy, -10 * height, 11 * height)
+            keep = np.isfinite(py)
+            return px[keep], py[keep]
+
+        self._draw_axes(left, top, right, bottom)
+        for kind, source, color in self.series:
+            if kind == 'function':
+                xs, ys = source[0].sample(x_min, x_max, columns)
+            else:
+                xs, ys = source.sample(x_min, x_max, columns)
+            px, py = to_canvas(xs, ys)
+            if kind == 'points':
+                for cx, cy in zip(px.tolist(), py.tolist()):
+                    self.canvas.create_oval(cx - 3, cy - 3, cx + 3, cy + 3, fill=color, outline=color)
+            elif len(px) >= 2:
+                coords = np.column_stack((px, py)).ravel().tolist()
+                self.canvas.create_line(*coords, fill=color)
+
+    def _draw_axes(self, left, top, right, bottom):
+        import numpy as np
+        x_min, x_max, y_min, y_max = self.view
+        self.canvas.create_rectangle(left, top, right, bottom, outline='gray')
+        for value, position in zip(_ticks(x_min, x_max), np.linspace(left, right, 5)):
+            self.canvas.create_text(position, bottom + 4, text=value, anchor=tk.N)
+        for value, position in zip(_ticks(y_min, y_max), np.linspace(bottom, top, 5)):
+            self.canvas.create_text(left - 4, position, text=value, anchor=tk.E)
+
+    def _start_drag(self, event):
+        self._drag = (event.x, event.y, list(self.view) if self.view else None)
+
+    def _drag_to(self, event):
+        if not self._drag or self._drag[2] is None:
+            return
+        x0, y0, (x_min, x_max, y_min, y_max) = self._drag
+        left, top, right, bottom = self._plot_area()
+        dx = (event.x - x0) * (x_max - x_min) / (right - left)
+        dy = (event.y - y0) * (y_max - y_min) / (bottom - top)
+        self.view = [x_min - dx, x_max - dx, y_min + dy, y_max + dy]
+        self.redraw()
+
+    def _zoom(self, event, zoom_in: bool):
+        if self.view is None:
+            return
+        x_min, x_max, y_min, y_max = self.view
+        left, top, right, bottom = self._plot_area()
+        # Keep the point under the cursor in place
+        fx = min(max((event.x - left) / (right - left), 0.0), 1.0)
+        fy = min(max((bottom - event.y) / (bottom - top), 0.0), 1.0)
+        cx, cy = x_min + fx * (x_max - x_min), y_min + fy * (y_max - y_min)
+        factor = 1 / ZOOM_STEP if zoom_in else ZOOM_STEP
+        self.view = [cx - (cx - x_min) * factor, cx + (x_max - cx) * factor,
+                     cy - (cy - y_min) * factor, cy + (y_max - cy) * factor]
+        self.redraw()
+
+
+def _widen(low: float, high: float) -> Tuple[float, float]:
+    """Range of positive width around a single value"""
+    if high <= low:
+        return low - 1, high + 1
+    return low, high
+
+
+def _ticks(low: float, high: float, count: int = 5) -> List[str]:
+    import numpy as np
+    return [f"{value:.3g}" for value in np.linspace(low, high, count)]
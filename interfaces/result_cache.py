@@ -0,0 +1,269 @@
+"""
+Persistent cache of solver results.
+Results are stored in an SQLite database under a content hash of the solver
+type, its parameters, the normalized source of its expressions and the
+arguments of the solve call. Only solvers whose functions were compiled from
+expressions (and so carry their `source`) can be cached. Results are stored
+as compressed JSON with arrays as raw buffers, never as pickles, so a cache
+file written by someone else cannot make the reader run code.
+
+Usage:
+    cache = ResultCache('results.sqlite')
+    result = cache.solve(solver, 0, 1)  # Computed once, then read from disk
+"""
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, Optional
+import numpy as np
+from expressions.cache import normalize_source
+from solvers.results import (SolverResult, ExtremumResult, LinearSystemResult,
+                             DifferentialResult, IntegralResult, InterpolationResult)
+
+# Public solver attributes that hold run state rather than parameters
+RUNTIME_ATTRIBUTES = {'evaluations'}
+
+
+def _canonical(value):
+    """JSON-compatible canonical form of a solver parameter"""
+    if callable(value):
+        source = getattr(value, 'source', None)
+        if source is None:
+            raise TypeError("Functions without expression source cannot be cached")
+        return {'source': normalize_source(source),
+                'variables': list(getattr(value, 'variables', ())),
+                'backend': getattr(value, 'backend', None),
+                'derivatives': hasattr(value, 'value_and_gradient')}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    raise TypeError(f"Cannot cache parameter of type {type(value).__name__}")
+
+
+_RESULT_TYPES = {cls.__name__: cls for cls in (ExtremumResult, LinearSystemResult,
+                                                DifferentialResult, IntegralResult,
+                                                InterpolationResult)}
+
+
+def _encode(value):
+    """
+    JSON-compatible form of a stored result. Results, arrays, tuples and
+    dictionaries are tagged so that _decode restores their types.
+
+    Raises:
+        TypeError for values that cannot be stored (e.g. functions)
+    """
+    if isinstance(value, SolverResult):
+        if type(value).__name__ not in _RESULT_TYPES:
+            raise TypeError(f"Cannot store result of type {type(value).__name__}")
+        return {'__result__': type(value).__name__,
+                'items': {key: _encode(item) for key, item in value.items()}}
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind not in 'biuf':
+            raise TypeError(f"Cannot store array of type {value.dtype}")
+        return {'__array__': base64.b64encode(np.ascontiguousarray(value).tobytes()).decode('ascii'),
+                'dtype': value.dtype.str, 'shape': list(value.shape)}
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("Cannot store dictionary with non-string keys")
+        return {'__dict__': {key: _encode(item) for key, item in value.items()}}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, np.generic):
+        return _encode(value.item())
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+
+def _decode(document: Dict):
+    """json.loads object hook that restores the values tagged by _encode"""
+    if '__result__' in document:
+        if document['__result__'] not in _RESULT_TYPES:
+            raise ValueError(f"Unknown result type {document['__result__']}")
+        return _RESULT_TYPES[document['__result__']](**document['items'])
+    if '__array__' in document:
+        dtype = np.dtype(document['dtype'])
+        if dtype.kind not in 'biuf':
+            raise ValueError(f"Unsupported array type {dtype}")
+        data = base64.b64decode(document['__array__'])
+        return np.frombuffer(data, dtype=dtype).reshape(document['shape']).copy()
+    if '__dict__' in document:
+        return document['__dict__']
+    if '__tuple__' in document:
+        return tuple(document['__tuple__'])
+    return document
+
+
+def solver_key(solver, *args) -> Optional[str]:
+    """
+    Content hash identifying a solve call, or None if it cannot be cached.
+
+    Args:
+        solver: Configured solver instance
+        *args: Arguments of the solve call
+    """
+    parameters = {name: value for name, value in vars(solver).items()
+                  if not name.startswith('_') and name not in RUNTIME_ATTRIBUTES}
+    try:
+        document = json.dumps({'solver': type(solver).__name__,
+                               'parameters': _canonical(parameters),
+                               'arguments': _canonical(args)}, sort_keys=True)
+    except TypeError:
+        return None
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded, least-recently-used store of solver results in SQLite.
+
+    Safe to share between processes: every process opens its own connection
+    and SQLite serializes writers.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            path: Database file, created if missing
+            max_bytes: Total size of stored results before old ones are evicted
+        """
+        if max_bytes < 1:
+            raise ValueError("Cache size must be positive")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid = None
+        connection = self._connect()
+        connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                           "key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                           "size INTEGER NOT NULL, accessed REAL NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        # Running total of the stored sizes, kept in step with every write so
+        # that eviction does not have to sum the whole table
+        connection.execute("CREATE TABLE IF NOT EXISTS usage ("
+                           "id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)")
+        connection.execute("INSERT OR IGNORE INTO usage SELECT 0, COALESCE(SUM(size), 0) FROM results")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so each process opens its own
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Stored result for a key, or None"""
+        connection = self._connect()
+        row = connection.execute("SELECT data FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            result = json.loads(zlib.decompress(row[0]), object_hook=_decode)
+        except (zlib.error, ValueError, TypeError, KeyError):
+            self.misses += 1  # Written in another format, e.g. by an older version
+            return None
+        connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict) -> bool:
+        """
+        Store a result, evicting least recently used entries beyond max_bytes.
+
+        Returns:
+            False if the result cannot be serialized (e.g. it holds a function)
+        """
+        try:
+            data = zlib.compress(json.dumps(_encode(result)).encode())
+        except TypeError:
+            return False
+        if len(data) > self.max_bytes:
+            return False
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                               (key, data, len(data), time.time()))
+            self._add_usage(connection, len(data) - (row[0] if row is not None else 0))
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return True
+
+    @staticmethod
+    def _add_usage(connection: sqlite3.Connection, delta: int):
+        connection.execute("UPDATE usage SET bytes = bytes + ? WHERE id = 0", (delta,))
+
+    @staticmethod
+    def _usage(connection: sqlite3.Connection) -> int:
+        return connection.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()[0]
+
+    def _evict(self, connection: sqlite3.Connection):
+        excess = self._usage(connection) - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        freed = 0
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", victims)
+        self._add_usage(connection, -freed)
+
+    def solve(self, solver, *args) -> Dict:
+        """Return the cached result of solver.solve(*args), solving on a miss"""
+        key = solver_key(solver, *args)
+        if key is not None:
+            result = self.get(key)
+            if result is not None:
+                return result
+        result = solver.solve(*args)
+        if key is not None:
+            self.put(key, result)
+        return result
+
+    def stats(self) -> Dict:
+        """Hit and miss counts of this instance, entry count and stored bytes"""
+        connection = self._connect()
+        count = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': count,
+                'bytes': self._usage(connection), 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        """Remove all stored results"""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM results")
+            connection.execute("UPDATE usage SET bytes = 0 WHERE id = 0")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        """Close this process's database connection"""
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
@@ -0,0 +1,150 @@
+"""
+Result pane of the GUI.
+Shows short results as text and large tabular results (ODE trajectories,
+solution vectors) as a summary with paginated rows. Each page is rendered
+with a single widget call, so the pane stays fast for millions of rows;
+the full table can be exported to CSV or .npy instead of being displayed.
+NumPy is imported when the first table is built, not when the GUI starts.
+"""
+import io
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from typing import Dict, List, Optional, Sequence
+
+PAGE_SIZE = 500  # Table rows rendered at once
+
+
+class ResultTable:
+    """Numeric table with a summary, fixed-size pages and file export"""
+
+    def __init__(self, columns: Sequence[str], data, page_size: int = PAGE_SIZE):
+        """
+        Args:
+            columns: Column names
+            data: Rows of numbers convertible to a 2D float array
+            page_size: Rows per page
+        """
+        import numpy as np
+        self.columns = list(columns)
+        self.data = np.asarray(data, dtype=float).reshape(-1, len(self.columns))
+        if page_size < 1:
+            raise ValueError("Page size must be positive")
+        self.page_size = page_size
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-len(self.data) // self.page_size))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """First, last, minimum and maximum value of every column"""
+        if len(self.data) == 0:
+            return {}
+        return {name: {'first': float(column[0]), 'last': float(column[-1]),
+                       'min': float(column.min()), 'max': float(column.max())}
+                for name, column in zip(self.columns, self.data.T)}
+
+    def summary_text(self) -> str:
+        lines = [f"Строк: {len(self.data)}\n"]
+        for name, values in self.summary().items():
+            lines.append(f"{name}: от {values['first']:.6g} до {values['last']:.6g}, "
+                         f"мин. {values['min']:.6g}, макс. {values['max']:.6g}\n")
+        return "".join(lines)
+
+    def page_text(self, page: int, precision: int = 6) -> str:
+        """Rows of one page (counted from 0) as aligned text"""
+        import numpy as np
+        if not 0 <= page < self.pages:
+            raise ValueError("Page out of range")
+        rows = self.data[page * self.page_size:(page + 1) * self.page_size]
+        buffer = io.StringIO()
+        np.savetxt(buffer, rows, fmt=f'%14.{precision}f', delimiter=' ')
+        header = ' '.join(f'{name:>14}' for name in self.columns)
+        return header + '\n' + buffer.getvalue()
+
+    def export(self, path: str):
+        """Write the full table to .npy (by extension) or CSV"""
+        import numpy as np
+        if path.lower().endswith('.npy'):
+            np.save(path, self.data)
+        else:
+            np.savetxt(path, self.data, delimiter=',', header=','.join(self.columns),
+                       comments='', fmt='%.17g')
+
+
+class ResultView(ttk.Frame):
+    """Text result pane with optional table pages and export"""
+
+    def __init__(self, master, **text_options):
+        super().__init__(master)
+        self.table: Optional[ResultTable] = None
+        self.page = 0
+        self._header = ""
+        self.text = tk.Text(self, state=tk.DISABLED, **text_options)
+        self.controls = ttk.Frame(self)
+        self.previous_button = ttk.Button(self.controls, text="<", width=3,
+                                          command=lambda: self.show_page(self.page - 1))
+        self.page_var = tk.StringVar()
+        self.page_label = ttk.Label(self.controls, textvariable=self.page_var)
+        self.next_button = ttk.Button(self.controls, text=">", width=3,
+                                      command=lambda: self.show_page(self.page + 1))
+        self.rows_button = ttk.Button(self.controls, text="Показать строки",
+                                      command=lambda: self.show_page(self.page))
+        self.export_button = ttk.Button(self.controls, text="Экспорт...", command=self._export)
+
+        self.text.grid(row=0, column=0, sticky=tk.NSEW)
+        for column, widget in enumerate((self.previous_button, self.page_label, self.next_button,
+                                         self.rows_button, self.export_button)):
+            widget.grid(row=0, column=column, padx=2)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+    def _set_text(self, text: str):
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, text)
+        self.text.config(state=tk.DISABLED)
+
+    def show_text(self, lines: List[str]):
+        """Show plain result lines and hide the table controls"""
+        self.table = None
+        self.controls.grid_remove()
+        self._set_text("".join(lines))
+
+    def show_table(self, lines: List[str], table: ResultTable):
+        """
+        Show result lines with the table summary; rows are rendered on
+        demand one page at a time.
+        """
+        self.table = table
+        self.page = 0
+        self._header = "".join(lines) + table.summary_text()
+        self.controls.grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.page_var.set(f"{table.pages} стр.")
+        self._set_text(self._header)
+
+    def show_page(self, page: int):
+        """Show the summary followed by one page of rows"""
+        if self.table is None:
+            return
+        self.page = min(max(page, 0), self.table.pages - 1)
+        self.page_var.set(f"Стр. {self.page + 1} из {self.table.pages}")
+        self._set_text(self._header + "\n" + self.table.page_text(self.page))
+
+    def clear(self):
+        self.show_text([])
+
+    def _export(self):
+        if self.table is None:
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension='.csv',
+            filetypes=[("CSV", "*.csv"), ("NumPy", "*.npy")])
+        if not path:
+            return
+        try:
+            self.table.export(path)
+        except OSError as e:
+            messagebox.showerror("Ошибка", str(e))
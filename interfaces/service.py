@@ -0,0 +1,278 @@
+"""
+Local HTTP/JSON solve service.
+Accepts the problem specifications of the batch runner over HTTP, solves
+them on a process pool and coalesces identical in-flight requests into a
+single computation. Uses only the standard library.
+
+Endpoints:
+    POST /solve   body: problem specification, response: result record
+    GET  /health  service statistics
+    GET  /metrics solver metrics in OpenMetrics text format (with --metrics)
+
+Usage:
+    python -m interfaces.service --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple, Union
+from expressions.compiler import ExpressionError
+from interfaces.batch import check_spec, run_problem
+from interfaces.metrics import MetricsRegistry, OPENMETRICS_CONTENT_TYPE
+
+MAX_BODY_SIZE = 1 << 20  # Largest accepted request body in bytes
+MAX_HEADER_COUNT = 100  # Most header lines accepted in a request
+MAX_HEADER_SIZE = 1 << 16  # Largest accepted total size of the header lines in bytes
+READ_TIMEOUT = 30.0  # Seconds a client has to send its whole request
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+            500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class ServiceBusy(Exception):
+    """Raised when the number of pending computations reaches its limit"""
+
+
+class _RejectedRequest(Exception):
+    """Raised while reading a request that is answered with an error status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SolveService:
+    """
+    Runs problem specifications on an executor with bounded concurrency.
+
+    Identical specifications (ignoring 'id') that are requested while one of
+    them is still being computed share that computation.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 64,
+                 executor: Optional[Executor] = None, metrics: Optional[MetricsRegistry] = None,
+                 read_timeout: float = READ_TIMEOUT):
+        """
+        Args:
+            workers: Number of worker processes (None for one per CPU)
+            max_pending: Maximum number of distinct computations in flight;
+                further requests are rejected until one finishes
+            executor: Executor to use instead of a new process pool
+            metrics: Registry that receives every computed solve and is
+                served at /metrics
+            read_timeout: Seconds a client has to send its request before
+                the connection is closed
+        """
+        if max_pending < 1:
+            raise ValueError("Pending limit must be positive")
+        if executor is None:
+            # Workers forked from the server would inherit open client sockets
+            # and keep those connections alive after the server closes them
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context(method))
+        self.executor = executor
+        self.max_pending = max_pending
+        self.metrics = metrics
+        self.read_timeout = read_timeout
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {'requests': 0, 'computed': 0, 'coalesced': 0, 'rejected': 0}
+
+    @staticmethod
+    def validate(spec) -> None:
+        """
+        Check the fields and expression syntax of a specification.
+
+        Runs on the event loop, so it only parses the expression; compiling
+        and solving happen in the executor.
+
+        Raises:
+            ValueError for invalid specifications
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("Problem specification must be a JSON object")
+        try:
+            check_spec(spec)
+        except ExpressionError as e:
+            raise ValueError(f"Invalid expression: {e}")
+        except (TypeError, KeyError) as e:
+            raise ValueError(f"Invalid specification: {e}")
+
+    async def solve(self, spec: Dict) -> Dict:
+        """
+        Solve a validated specification, sharing identical in-flight work.
+
+        Raises:
+            ServiceBusy if too many computations are pending
+        """
+        self.stats['requests'] += 1
+        key = json.dumps({k: v for k, v in spec.items() if k != 'id'}, sort_keys=True)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+        else:
+            if len(self._inflight) >= self.max_pending:
+                self.stats['rejected'] += 1
+                raise ServiceBusy("Too many pending requests")
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(loop.run_in_executor(self.executor, run_problem, spec))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            if self.metrics is not None:
+                future.add_done_callback(lambda done: self._observe(spec, done))
+            self.stats['computed'] += 1
+        # Shield so that a disconnecting client does not cancel shared work
+        record = dict(await asyncio.shield(future))
+        record['id'] = spec.get('id')
+        return record
+
+    def _observe(self, spec: Dict, future: asyncio.Future):
+        """Add a solve computed by a worker process to the metrics"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.metrics.observe_record(spec, future.result())
+
+    def health(self) -> Dict:
+        """Service statistics"""
+        return dict(self.stats, pending=len(self._inflight), max_pending=self.max_pending)
+
+    async def handle_request(self, method: str, path: str, body: bytes) -> Tuple[int, Union[Dict, str]]:
+        """Route one HTTP request, returning (status code, JSON payload or OpenMetrics text)"""
+        if path == '/health':
+            if method != 'GET':
+                return 405, {'error': 'Use GET'}
+            return 200, self.health()
+        if path == '/metrics' and self.metrics is not None:
+            if method != 'GET':
+                return 405, {'error': 'Use GET'}
+            return 200, self.metrics.openmetrics()
+        if path != '/solve':
+            return 404, {'error': 'Unknown path'}
+        if method != 'POST':
+            return 405, {'error': 'Use POST'}
+        try:
+            spec = json.loads(body)
+            self.validate(spec)
+        except (ValueError, UnicodeDecodeError) as e:
+            return 400, {'status': 'error', 'error': str(e)}
+        try:
+            return 200, await self.solve(spec)
+        except ServiceBusy as e:
+            return 503, {'status': 'error', 'error': str(e)}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one HTTP/1.1 request on a connection and close it"""
+        try:
+            status, payload = await self._read_and_handle(reader)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            status, payload = 500, {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        if isinstance(payload, str):
+            data, content_type = payload.encode(), OPENMETRICS_CONTENT_TYPE
+        else:
+            data, content_type = json.dumps(payload, allow_nan=False).encode(), 'application/json'
+        headers = [f"HTTP/1.1 {status} {_REASONS[status]}",
+                   f"Content-Type: {content_type}",
+                   f"Content-Length: {len(data)}",
+                   "Connection: close"]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode() + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_and_handle(self, reader: asyncio.StreamReader) -> Tuple[int, Union[Dict, str]]:
+        try:
+            method, path, body = await asyncio.wait_for(self._read_request(reader),
+                                                        self.read_timeout)
+        except _RejectedRequest as e:
+            return e.status, {'error': str(e)}
+        return await self.handle_request(method, path.split('?')[0], body)
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        """
+        Read the request line, headers and body of a request.
+
+        Raises:
+            _RejectedRequest for malformed or oversized requests
+        """
+        request_line = (await reader.readline()).decode('latin-1').split()
+        if len(request_line) != 3:
+            raise _RejectedRequest(400, 'Malformed request line')
+        method, path, _ = request_line
+        length = 0
+        count = size = 0
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:  # Line longer than the stream buffer limit
+                raise _RejectedRequest(431, 'Request header too large')
+            count += 1
+            size += len(line)
+            if count > MAX_HEADER_COUNT or size > MAX_HEADER_SIZE:
+                raise _RejectedRequest(431, 'Request headers too large')
+            line = line.decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'content-length':
+                try:
+                    length = int(value)
+                except ValueError:
+                    raise _RejectedRequest(400, 'Invalid Content-Length')
+        if length > MAX_BODY_SIZE:
+            raise _RejectedRequest(413, 'Request body too large')
+        body = await reader.readexactly(length) if length > 0 else b''
+        return method, path, body
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.AbstractServer:
+        """Start listening; the returned server reports its bound sockets"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """Shut down the executor"""
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8080, workers: Optional[int] = None,
+                max_pending: int = 64, metrics: Optional[MetricsRegistry] = None):
+    """Run the service until cancelled"""
+    service = SolveService(workers, max_pending, metrics=metrics)
+    server = await service.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Serve solvers over HTTP/JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--max-pending', type=int, default=64,
+                        help="Computations in flight before requests are rejected")
+    parser.add_argument('--metrics', action='store_true', help="Serve solver metrics at /metrics")
+    args = parser.parse_args(argv)
+    metrics = MetricsRegistry() if args.metrics else None
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending, metrics))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Background solves for interactive front ends.
+Runs a solver on a worker thread while the caller polls for progress, and
+stops it cooperatively on request or when a time limit expires. Iterative
+solvers check for cancellation after every reported iteration; direct
+solvers (linear systems, interpolation) run to completion.
+
+Expensive preparation (compiling expressions) can be passed as a setup
+function that runs on the worker thread too, so it never blocks the caller.
+
+Usage:
+    job = BackgroundSolve(solver, 0.0, 1.0, time_limit=30)
+    job.start()
+    ...                              # Poll job.done and job.progress
+    result = job.result()            # Raises SolveCancelled if stopped
+
+    job = BackgroundSolve(setup=lambda: (make_solver(), (0.0, 1.0))).start()
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from solvers.base import Instrumentation
+
+
+class SolveCancelled(Exception):
+    """Raised inside a solve that was cancelled or exceeded its time limit"""
+
+
+class _Monitor(Instrumentation):
+    """
+    Per-solver instrumentation that records progress and stops the solve.
+    Events are forwarded to the instrumentation the solver had before.
+    """
+    enabled = True
+
+    def __init__(self, inner: Instrumentation, cancelled: threading.Event,
+                 deadline: Optional[float]):
+        self.inner = inner
+        self.cancelled = cancelled
+        self.deadline = deadline
+        self.progress: Optional[Tuple[int, Optional[float]]] = None
+
+    def solver_created(self, solver, problem_type):
+        self.inner.solver_created(solver, problem_type)
+
+    def solve_started(self, solver, record):
+        if self.inner.enabled:
+            self.inner.solve_started(solver, record)
+
+    def iteration(self, solver, record, iteration, point, error):
+        self.progress = (iteration, error)
+        if self.inner.enabled:
+            self.inner.iteration(solver, record, iteration, point, error)
+        if self.cancelled.is_set():
+            raise SolveCancelled("Solve cancelled")
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SolveCancelled("Time limit exceeded")
+
+    def solve_finished(self, solver, record, result):
+        if self.inner.enabled:
+            self.inner.solve_finished(solver, record, result)
+
+
+class BackgroundSolve:
+    """One solve running on a daemon thread"""
+
+    def __init__(self, solver=None, *args, time_limit: Optional[float] = None,
+                 setup: Optional[Callable[[], Tuple[object, tuple]]] = None):
+        """
+        Args:
+            solver: MathSolver instance (None if setup creates it)
+            *args: Positional arguments for its solve method
+            time_limit: Seconds after which the solve is stopped (None for no limit)
+            setup: Function returning (solver, arguments), called on the worker
+                thread before the solve; the time limit includes it
+        """
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("Time limit must be positive")
+        if (solver is None) == (setup is None):
+            raise ValueError("Either a solver or a setup function is required")
+        self.solver = solver
+        self.args = args
+        self.setup = setup
+        self.time_limit = time_limit
+        self.started = None
+        self.finished = None
+        self._deadline = None
+        self._cancelled = threading.Event()
+        self._monitor = None
+        self._own_instrumentation = None
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> 'BackgroundSolve':
+        self.started = time.perf_counter()
+        if self.time_limit is not None:
+            self._deadline = self.started + self.time_limit
+        if self.setup is None:
+            self._install_monitor()
+        self._thread.start()
+        return self
+
+    def _install_monitor(self):
+        self._own_instrumentation = self.solver.__dict__.get('instrumentation')
+        self._monitor = _Monitor(self.solver.instrumentation, self._cancelled, self._deadline)
+        self.solver.instrumentation = self._monitor
+
+    def _run(self):
+        try:
+            if self.setup is not None:
+                self.solver, self.args = self.setup()
+                if self._cancelled.is_set():
+                    raise SolveCancelled("Solve cancelled")
+                if self.timed_out:
+                    raise SolveCancelled("Time limit exceeded")
+                self._install_monitor()
+            self._result = self.solver.solve(*self.args)
+        except Exception as e:
+            self._error = e
+        finally:
+            # Restore the solver's own or class-level instrumentation
+            if self._monitor is not None:
+                if self._own_instrumentation is None:
+                    del self.solver.instrumentation
+                else:
+                    self.solver.instrumentation = self._own_instrumentation
+            self.finished = time.perf_counter()
+
+    def cancel(self):
+        """Ask the solve to stop at its next iteration"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel was called"""
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    @property
+    def preparing(self) -> bool:
+        """
+        Whether the setup function is still running. Setup cannot be
+        interrupted, so callers may abandon a job that is cancelled or timed
+        out while preparing; its thread then finishes in the background.
+        """
+        return self.started is not None and self._monitor is None and not self.done
+
+    @property
+    def timed_out(self) -> bool:
+        """Whether the time limit has passed"""
+        return self._deadline is not None and (self.finished or time.perf_counter()) > self._deadline
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since start"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def progress(self) -> Optional[Tuple[int, Optional[float]]]:
+        """(iteration, error estimate) of the last reported iteration, if any"""
+        return self._monitor.progress if self._monitor is not None else None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the solve finishes; True if it did"""
+        self._thread.join(timeout)
+        return self.done
+
+    def result(self) -> Dict:
+        """
+        Result of the finished solve.
+
+        Raises:
+            SolveCancelled if the solve was stopped, any exception of the
+            solve itself, or RuntimeError if it is still running
+        """
+        if not self.done:
+            raise RuntimeError("Solve is still running")
+        if self._error is not None:
+            raise self._error
+        return self._result
@@ -1,8 +1,57 @@
+import argparse
+import hashlib
+import json
 import os
 import sys
 import subprocess
-from interfaces.gui import MathAppGUI  # Adjust import to your structure
-import tkinter as tk
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Fingerprint of the last source tree that passed the self-tests
+SELF_TEST_CACHE = os.path.join(PROJECT_DIR, '.selftest.json')
+FINGERPRINT_FILES = ('.py', '.ini', '.toml', '.cfg')
+# Files and directories whose contents decide the self-test outcome
+SOURCE_PATHS = ('main.py', 'tox.ini', 'solvers', 'expressions', 'interfaces', 'benchmarks', 'tests')
+
+
+def source_fingerprint(root: str = PROJECT_DIR, paths=SOURCE_PATHS) -> str:
+    """Hash of the Python version and the source and configuration files of paths under root"""
+    digest = hashlib.sha256(sys.version.encode())
+    for path in paths:
+        path = os.path.join(root, path)
+        if os.path.isfile(path):
+            _hash_file(digest, path, root)
+        for directory, subdirectories, files in os.walk(path):
+            # Skip hidden directories and bytecode caches
+            subdirectories[:] = sorted(d for d in subdirectories
+                                       if not d.startswith('.') and d != '__pycache__')
+            for name in sorted(files):
+                if name.endswith(FINGERPRINT_FILES):
+                    _hash_file(digest, os.path.join(directory, name), root)
+    return digest.hexdigest()
+
+
+def _hash_file(digest, path: str, root: str):
+    digest.update(os.path.relpath(path, root).encode() + b'\0')
+    with open(path, 'rb') as f:
+        digest.update(hashlib.sha256(f.read()).digest())
+
+
+def tests_passed_for(fingerprint: str) -> bool:
+    """Whether the self-tests already passed for this source tree"""
+    try:
+        with open(SELF_TEST_CACHE, encoding='utf-8') as f:
+            return json.load(f).get('fingerprint') == fingerprint
+    except (OSError, ValueError):
+        return False
+
+
+def remember_passed(fingerprint: str):
+    try:
+        with open(SELF_TEST_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint}, f)
+    except OSError:
+        pass  # Read-only installation: tests simply run again next time
+
 
 def run_tox_tests():
     """Run tox tests and display colored output"""
@@ -14,7 +63,8 @@ def run_tox_tests():
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True
+            text=True,
+            cwd=PROJECT_DIR
         )
         print(result.stdout)
         return True
@@ -24,13 +74,39 @@ def run_tox_tests():
         print(e.stderr)
         return False
 
-if __name__ == "__main__":
-    # Run tests first
+
+def run_self_tests(force: bool = False) -> bool:
+    """Run the tests unless they already passed for the current source tree"""
+    fingerprint = source_fingerprint()
+    if not force and tests_passed_for(fingerprint):
+        return True
     if not run_tox_tests():
+        return False
+    remember_passed(fingerprint)
+    return True
+
+
+if __name__ == "__main__":
+    # Headless batch mode: python main.py batch problems.jsonl -o results.jsonl
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from interfaces.batch import main as run_batch_main
+        sys.exit(run_batch_main(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="PyCalculus")
+    tests = parser.add_mutually_exclusive_group()
+    tests.add_argument('--skip-tests', action='store_true', help="Start without running the tests")
+    tests.add_argument('--run-tests', action='store_true',
+                       help="Run the tests even if they passed for the current sources")
+    args = parser.parse_args()
+
+    # Tests run only when the sources changed since they last passed
+    if not args.skip_tests and not run_self_tests(force=args.run_tests):
         sys.exit(1)
 
     # Only proceed if tests pass
     print("Starting main application...")
+    import tkinter as tk
+    from interfaces.gui import MathAppGUI
     root = tk.Tk()
     app = MathAppGUI(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
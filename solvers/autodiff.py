@@ -0,0 +1,301 @@
+"""
+Forward-mode automatic differentiation.
+Implements dual numbers for exact gradients and hyper-dual numbers for exact
+Hessians, together with drop-in replacements for the `math` functions.
+
+Functions written with plain arithmetic or with the functions of this module
+(e.g. `autodiff.sin` instead of `math.sin`) can be differentiated exactly:
+
+    from solvers import autodiff
+    f = lambda x, y: autodiff.sin(x) * y ** 2
+    autodiff.gradient(f, [0.5, 2.0])
+"""
+import math
+import numpy as np
+from typing import List, Tuple, Callable
+
+pi = math.pi
+e = math.e
+tau = math.tau
+inf = math.inf
+nan = math.nan
+
+
+class Dual:
+    """Number carrying a value and its gradient with respect to all inputs"""
+    __slots__ = ('value', 'grad')
+    __array_ufunc__ = None  # Make NumPy scalars defer to the reflected operators
+
+    def __init__(self, value: float, grad):
+        self.value = value
+        self.grad = grad
+
+    def _chain(self, f0: float, f1: float, f2: float) -> 'Dual':
+        """Apply a scalar function with value f0 and derivative f1"""
+        return Dual(f0, f1 * self.grad)
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.grad + other.grad)
+        return Dual(self.value + other, self.grad)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, self.grad - other.grad)
+        return Dual(self.value - other, self.grad)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, -self.grad)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value,
+                        self.value * other.grad + other.value * self.grad)
+        return Dual(self.value * other, other * self.grad)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return self * _reciprocal(other)
+        return Dual(self.value / other, self.grad / other)
+
+    def __rtruediv__(self, other):
+        return other * _reciprocal(self)
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            return exp(other * log(self))
+        return _power(self, other)
+
+    def __rpow__(self, other):
+        return _exponential(self, other)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.grad)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.value < 0 else self
+
+    def __lt__(self, other):
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        return self.value >= _value(other)
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.grad!r})"
+
+
+class HyperDual:
+    """
+    Number carrying a value, first derivatives along two directions and the
+    mixed second derivative.
+
+    `eps1` is the derivative along a single seed direction, while `eps2` and
+    `eps12` are vectors over all inputs, so one evaluation yields a full row
+    of the Hessian.
+    """
+    __slots__ = ('value', 'eps1', 'eps2', 'eps12')
+    __array_ufunc__ = None
+
+    def __init__(self, value: float, eps1, eps2, eps12):
+        self.value = value
+        self.eps1 = eps1
+        self.eps2 = eps2
+        self.eps12 = eps12
+
+    def _chain(self, f0: float, f1: float, f2: float) -> 'HyperDual':
+        """Apply a scalar function with value f0, derivative f1 and second derivative f2"""
+        return HyperDual(f0, f1 * self.eps1, f1 * self.eps2,
+                         f1 * self.eps12 + f2 * self.eps1 * self.eps2)
+
+    def __add__(self, other):
+        if isinstance(other, HyperDual):
+            return HyperDual(self.value + other.value, self.eps1 + other.eps1,
+                             self.eps2 + other.eps2, self.eps12 + other.eps12)
+        return HyperDual(self.value + other, self.eps1, self.eps2, self.eps12)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, HyperDual):
+            return HyperDual(self.value - other.value, self.eps1 - other.eps1,
+                             self.eps2 - other.eps2, self.eps12 - other.eps12)
+        return HyperDual(self.value - other, self.eps1, self.eps2, self.eps12)
+
+    def __rsub__(self, other):
+        return HyperDual(other - self.value, -self.eps1, -self.eps2, -self.eps12)
+
+    def __mul__(self, other):
+        if isinstance(other, HyperDual):
+            return HyperDual(self.value * other.value,
+                             self.value * other.eps1 + self.eps1 * other.value,
+                             self.value * other.eps2 + self.eps2 * other.value,
+                             self.value * other.eps12 + self.eps1 * other.eps2 +
+                             self.eps2 * other.eps1 + self.eps12 * other.value)
+        return HyperDual(self.value * other, self.eps1 * other,
+                         self.eps2 * other, self.eps12 * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, HyperDual):
+            return self * _reciprocal(other)
+        return HyperDual(self.value / other, self.eps1 / other,
+                         self.eps2 / other, self.eps12 / other)
+
+    def __rtruediv__(self, other):
+        return other * _reciprocal(self)
+
+    def __pow__(self, other):
+        if isinstance(other, HyperDual):
+            return exp(other * log(self))
+        return _power(self, other)
+
+    def __rpow__(self, other):
+        return _exponential(self, other)
+
+    def __neg__(self):
+        return HyperDual(-self.value, -self.eps1, -self.eps2, -self.eps12)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.value < 0 else self
+
+    def __lt__(self, other):
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        return self.value >= _value(other)
+
+    def __repr__(self):
+        return f"HyperDual({self.value!r}, {self.eps1!r}, {self.eps2!r}, {self.eps12!r})"
+
+
+def _value(x) -> float:
+    """Real part of a (hyper-)dual number, or the number itself"""
+    return x.value if isinstance(x, (Dual, HyperDual)) else x
+
+
+def _reciprocal(x):
+    v = x.value
+    return x._chain(1 / v, -1 / (v * v), 2 / (v * v * v))
+
+
+def _power(x, exponent: float):
+    """x ** exponent for a constant exponent"""
+    v = x.value
+    if exponent == 0:
+        return x._chain(1.0, 0.0, 0.0)
+    if exponent == 1:
+        return x
+    f1 = exponent * v ** (exponent - 1)
+    f2 = exponent * (exponent - 1) * v ** (exponent - 2)
+    return x._chain(v ** exponent, f1, f2)
+
+
+def _exponential(x, base: float):
+    """base ** x for a constant base"""
+    f0 = base ** x.value
+    log_base = math.log(base)
+    return x._chain(f0, log_base * f0, log_base * log_base * f0)
+
+
+def _elementary(func: Callable, first: Callable, second: Callable) -> Callable:
+    """Build a math function that also propagates derivatives"""
+    def wrapper(x):
+        if isinstance(x, (Dual, HyperDual)):
+            v = x.value
+            return x._chain(func(v), first(v), second(v))
+        return func(x)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+sin = _elementary(math.sin, math.cos, lambda v: -math.sin(v))
+cos = _elementary(math.cos, lambda v: -math.sin(v), lambda v: -math.cos(v))
+tan = _elementary(math.tan, lambda v: 1 / math.cos(v) ** 2,
+                  lambda v: 2 * math.tan(v) / math.cos(v) ** 2)
+asin = _elementary(math.asin, lambda v: 1 / math.sqrt(1 - v * v),
+                   lambda v: v / (1 - v * v) ** 1.5)
+acos = _elementary(math.acos, lambda v: -1 / math.sqrt(1 - v * v),
+                   lambda v: -v / (1 - v * v) ** 1.5)
+atan = _elementary(math.atan, lambda v: 1 / (1 + v * v),
+                   lambda v: -2 * v / (1 + v * v) ** 2)
+sinh = _elementary(math.sinh, math.cosh, math.sinh)
+cosh = _elementary(math.cosh, math.sinh, math.cosh)
+tanh = _elementary(math.tanh, lambda v: 1 - math.tanh(v) ** 2,
+                   lambda v: -2 * math.tanh(v) * (1 - math.tanh(v) ** 2))
+exp = _elementary(math.exp, math.exp, math.exp)
+expm1 = _elementary(math.expm1, math.exp, math.exp)
+log1p = _elementary(math.log1p, lambda v: 1 / (1 + v), lambda v: -1 / (1 + v) ** 2)
+log10 = _elementary(math.log10, lambda v: 1 / (v * math.log(10)),
+                    lambda v: -1 / (v * v * math.log(10)))
+log2 = _elementary(math.log2, lambda v: 1 / (v * math.log(2)),
+                   lambda v: -1 / (v * v * math.log(2)))
+sqrt = _elementary(math.sqrt, lambda v: 0.5 / math.sqrt(v),
+                   lambda v: -0.25 / v ** 1.5)
+fabs = _elementary(math.fabs, lambda v: math.copysign(1.0, v), lambda v: 0.0)
+_natural_log = _elementary(math.log, lambda v: 1 / v, lambda v: -1 / (v * v))
+
+
+def log(x, base: float = None):
+    """Natural logarithm, or logarithm to the given base"""
+    if base is None:
+        return _natural_log(x)
+    return _natural_log(x) / math.log(base)
+
+
+def gradient(func: Callable, point: List[float]) -> List[float]:
+    """Compute the exact gradient of func at point in one forward pass"""
+    return value_and_gradient(func, point)[1]
+
+
+def value_and_gradient(func: Callable, point: List[float]) -> Tuple[float, List[float]]:
+    """Compute function value and exact gradient in one forward pass"""
+    n = len(point)
+    seeds = np.eye(n)
+    result = func(*[Dual(float(v), seeds[i]) for i, v in enumerate(point)])
+    if not isinstance(result, Dual):
+        # Function does not depend on its arguments
+        return float(result), [0.0] * n
+    return float(result.value), result.grad.tolist()
+
+
+def hessian(func: Callable, point: List[float]) -> List[List[float]]:
+    """Compute the exact Hessian of func at point, one row per forward pass"""
+    n = len(point)
+    seeds = np.eye(n)
+    zeros = np.zeros(n)
+    rows = []
+    for i in range(n):
+        args = [HyperDual(float(v), seeds[i][j], seeds[j], zeros)
+                for j, v in enumerate(point)]
+        result = func(*args)
+        if isinstance(result, HyperDual):
+            rows.append(np.broadcast_to(result.eps12, (n,)).tolist())
+        else:
+            rows.append([0.0] * n)
+    return rows
@@ -1,12 +1,195 @@
 """
 Abstract base class for all mathematical solvers.
-Defines the common interface that all solvers must implement.
+Defines the common interface that all solvers must implement, and the
+instrumentation hooks that every solve reports into.
 """
+import functools
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict
+from collections import deque
+from typing import Dict, Callable, Optional
+
+
+class SolveRecord:
+    """Measurements of one instrumented solve"""
+    __slots__ = ('solver', 'method', 'started', 'first_iteration', 'finished',
+                 'iterations', 'evaluations', 'evaluation_time', 'error')
+
+    def __init__(self, solver: 'MathSolver'):
+        self.solver = type(solver).__name__
+        self.method = getattr(solver, 'method', None)
+        self.started = time.perf_counter()
+        self.first_iteration = None
+        self.finished = None
+        self.iterations = 0
+        self.evaluations = 0
+        self.evaluation_time = 0.0
+        self.error = None  # Exception type name if the solve raised
+
+    @property
+    def elapsed(self) -> float:
+        """Wall time of the whole solve in seconds"""
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        """
+        Wall time per phase in seconds. Setup lasts until the first reported
+        iteration; evaluation time is spent inside the user function and is
+        part of the other two phases.
+        """
+        end = self.finished or time.perf_counter()
+        split = self.first_iteration or end
+        return {'setup': split - self.started, 'iteration': end - split,
+                'evaluation': self.evaluation_time}
+
+    def as_dict(self) -> Dict:
+        return {'solver': self.solver, 'method': self.method, 'elapsed': self.elapsed,
+                'iterations': self.iterations, 'evaluations': self.evaluations,
+                'phases': self.phases, 'error': self.error}
+
+
+class Instrumentation:
+    """
+    Receiver of solver events.
+
+    This base class is disabled and ignores all events; solvers check
+    `enabled` once per solve, so it costs next to nothing. Subclasses set
+    `enabled = True` and override the event methods.
+    """
+    enabled = False
+
+    def solver_created(self, solver: 'MathSolver', problem_type: str):
+        """Called by MathSolverFactory after creating a solver"""
+
+    def solve_started(self, solver: 'MathSolver', record: SolveRecord):
+        """Called before a solve begins"""
+
+    def iteration(self, solver: 'MathSolver', record: SolveRecord, iteration: int,
+                  point, error: Optional[float]):
+        """Called after each iteration with the current iterate and error estimate"""
+
+    def solve_finished(self, solver: 'MathSolver', record: SolveRecord, result: Optional[Dict]):
+        """Called when a solve returns (result) or raises (None)"""
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+class SolverStatistics(Instrumentation):
+    """
+    Instrumentation that keeps the records of recent solves and optionally
+    forwards every iteration to a callback.
+    """
+    enabled = True
+
+    def __init__(self, callback: Optional[Callable] = None, history: int = 1000):
+        """
+        Args:
+            callback: Called as callback(iteration, point, error) after each iteration
+            history: Number of recent solve records kept
+        """
+        self.callback = callback
+        self.records = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def iteration(self, solver, record, iteration, point, error):
+        if self.callback is not None:
+            self.callback(iteration, point, error)
+
+    def solve_finished(self, solver, record, result):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> Dict:
+        """Totals over the kept records"""
+        with self._lock:
+            records = list(self.records)
+        phases = {'setup': 0.0, 'iteration': 0.0, 'evaluation': 0.0}
+        for record in records:
+            for phase, seconds in record.phases.items():
+                phases[phase] += seconds
+        return {'solves': len(records),
+                'iterations': sum(record.iterations for record in records),
+                'evaluations': sum(record.evaluations for record in records),
+                'phases': phases}
+
+
+# Attributes of user functions that evaluate them and are counted as well
+_EVALUATING_ATTRIBUTES = ('gradient', 'value_and_gradient', 'hessian')
+
+
+class _CountedFunction:
+    """User function wrapper that counts and times its calls for a solve record"""
+
+    def __init__(self, func: Callable, record: SolveRecord):
+        self._func = func
+        self._record = record
+        # The user function itself, for caches keyed on the function's identity
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._func(*args, **kwargs)
+        finally:
+            self._record.evaluation_time += time.perf_counter() - start
+            # Array arguments evaluate the function at every element
+            self._record.evaluations += getattr(args[0], 'size', 1) if args else 1
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        value = getattr(self._func, name)
+        if name in _EVALUATING_ATTRIBUTES and callable(value):
+            return _CountedFunction(value, self._record)
+        return value
+
+
+def _instrumented(solve: Callable) -> Callable:
+    """Wrap a solve method so that it reports to the solver's instrumentation"""
+    @functools.wraps(solve)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        if not instrumentation.enabled or self._record is not None:
+            return solve(self, *args, **kwargs)
+
+        record = self._record = SolveRecord(self)
+        originals = {name: getattr(self, name) for name in self._function_attributes
+                     if callable(getattr(self, name, None))}
+        for name, func in originals.items():
+            setattr(self, name, _CountedFunction(func, record))
+        instrumentation.solve_started(self, record)
+        result = None
+        try:
+            result = solve(self, *args, **kwargs)
+            return result
+        except BaseException as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.finished = time.perf_counter()
+            for name, func in originals.items():
+                setattr(self, name, func)
+            self._record = None
+            instrumentation.solve_finished(self, record, result)
+    return wrapper
 
 
 class MathSolver(ABC):
+    # Receiver of solve events; assign an enabled Instrumentation to the class
+    # (all solvers) or to an instance (one solver) to measure solves
+    instrumentation: Instrumentation = NULL_INSTRUMENTATION
+    # Attributes holding user functions, counted and timed while instrumented
+    _function_attributes: tuple = ()
+    _record: Optional[SolveRecord] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'solve' in cls.__dict__:
+            cls.solve = _instrumented(cls.solve)
+
     @abstractmethod
     def solve(self) -> Dict:
         """Main method to solve the mathematical problem"""
@@ -16,3 +199,14 @@ class MathSolver(ABC):
     def validate_input(self) -> bool:
         """Validate input parameters before solving"""
         pass
+
+    def _report_iteration(self, iteration: int, point, error: Optional[float] = None):
+        """
+        Report the state after an iteration. Callers check `self._record is
+        not None` first, so nothing is computed for uninstrumented solves.
+        """
+        record = self._record
+        if record.first_iteration is None:
+            record.first_iteration = time.perf_counter()
+        record.iterations = iteration
+        self.instrumentation.iteration(self, record, iteration, point, error)
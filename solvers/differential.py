@@ -2,11 +2,16 @@
 Solver for ordinary differential equations (ODEs).
 Implements Euler and Runge-Kutta 4th order methods.
 """
+from array import array
 from typing import List, Tuple, Dict, Callable
+import numpy as np
 from .base import MathSolver
+from .results import DifferentialResult
 
 
 class DifferentialEquationSolver(MathSolver):
+    _function_attributes = ('equation',)
+
     def __init__(self, equation: Callable, method: str = 'rk4'):
         """
         Initialize ODE solver with differential equation.
@@ -27,7 +32,7 @@ class DifferentialEquationSolver(MathSolver):
             raise ValueError("Method must be 'euler' or 'rk4'")
         return True
 
-    def solve(self, x0: float, y0: float, x_end: float) -> Dict:
+    def solve(self, x0: float, y0: float, x_end: float) -> DifferentialResult:
         """
         Solve ODE with initial conditions over interval.
 
@@ -40,7 +45,8 @@ class DifferentialEquationSolver(MathSolver):
         if x_end <= x0:
             raise ValueError("End point must be greater than initial point")
 
-        points = [(x0, y0)]
+        # Flat (x, y, x, y, ...) buffer, viewed as an (n, 2) array at the end
+        points = array('d', (x0, y0))
         x = x0
         y = y0
 
@@ -59,10 +65,12 @@ class DifferentialEquationSolver(MathSolver):
                 y += h * (k1 + 2 * k2 + 2 * k3 + k4) / 6
 
             x += h
-            points.append((x, y))
+            points.extend((x, y))
+            if self._record is not None:
+                self._report_iteration(len(points) // 2 - 1, (x, y))
 
-        return {
-            'points': points,
-            'method': self.method,
-            'step_size': self.step_size
-        }
+        return DifferentialResult(
+            points=np.frombuffer(points, dtype=float).reshape(-1, 2),
+            method=self.method,
+            step_size=self.step_size
+        )
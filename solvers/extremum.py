@@ -1,27 +1,74 @@
 """
 Solver for finding extrema (minima/maxima) of multivariable functions.
-Implements gradient descent and Newton's method for optimization.
+Implements gradient descent, Newton's method, the quasi-Newton BFGS and
+L-BFGS methods and the derivative-free Nelder-Mead simplex method for
+optimization, with an optional parallel multi-start mode for non-convex
+objectives.
 """
 import math
-from typing import List, Dict, Callable
-from .base import MathSolver
+import multiprocessing
+import pickle
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import OrderedDict
+from typing import List, Dict, Callable, Optional, Sequence, Tuple
+from .base import MathSolver, Instrumentation
+from .results import ExtremumResult
+from . import autodiff
+from .sparsity import CSRMatrix, normalize_pattern, color_columns
+
+
+class _EvaluationBudgetExceeded(Exception):
+    """Raised internally when a solve runs out of function evaluations"""
+
+
+class _SearchStopped(Exception):
+    """Raised inside a multi-start search once another search reached the target"""
 
 
 class ExtremumFinder(MathSolver):
-    def __init__(self, func: Callable, variables: List[str], method: str = 'gradient'):
+    _function_attributes = ('func',)
+
+    def __init__(self, func: Callable, variables: List[str], method: str = 'gradient',
+                 vectorized: Optional[bool] = None, differentiation: str = 'numeric'):
         """
         Initialize extremum finder with target function and optimization method.
 
         Args:
             func: The function to optimize
             variables: List of variable names in the function
-            method: Optimization method ('gradient' or 'newton')
+            method: Optimization method ('gradient', 'newton', 'bfgs', 'lbfgs'
+                or 'nelder_mead')
+            vectorized: Whether func accepts NumPy arrays and evaluates them
+                element-wise (None to use the function's own `vectorized`
+                attribute, or to detect on first gradient evaluation)
+            differentiation: How derivatives are obtained ('numeric' for finite
+                differences, 'automatic' for forward-mode dual numbers or
+                'symbolic' for the compiled derivatives of an expression)
         """
         self.func = func
         self.variables = variables
         self.method = method
+        self.vectorized = vectorized
+        self.differentiation = differentiation
+        self._batch_supported = vectorized if vectorized is not None else getattr(func, 'vectorized', None)
         self.precision = 1e-6  # Convergence threshold
         self.max_iterations = 1000  # Maximum iterations before stopping
+        # Gradient descent step rule: 'fixed', 'armijo', 'wolfe',
+        # 'barzilai_borwein', 'momentum' or 'nesterov'
+        self.step_rule = 'fixed'
+        self.step_size = 0.01  # Fixed or initial gradient descent step
+        self.momentum = 0.9  # Velocity decay for momentum and Nesterov steps
+        self.memory = 10  # Number of correction pairs kept by L-BFGS
+        self.max_evaluations = None  # Hard limit on function evaluations per solve
+        self.cache_size = 4096  # Number of recent evaluations remembered per solve
+        # Hessian nonzero structure: boolean matrix or (row, column) pairs,
+        # 'detect' to find it at the start point, or None for a dense Hessian.
+        # Sparsity saves function evaluations only; Newton still factors the
+        # Hessian as a dense matrix
+        self.hessian_sparsity = None
+        self._sparsity = None
+        self._reset_evaluations()
 
     def validate_input(self) -> bool:
         """Validate that inputs are properly formatted"""
@@ -29,66 +76,556 @@ class ExtremumFinder(MathSolver):
             raise ValueError("Function must be callable")
         if not isinstance(self.variables, list) or len(self.variables) == 0:
             raise ValueError("Variables must be a non-empty list")
-        if self.method not in ['gradient', 'newton']:
-            raise ValueError("Method must be 'gradient' or 'newton'")
+        if self.method not in ['gradient', 'newton', 'bfgs', 'lbfgs', 'nelder_mead']:
+            raise ValueError("Method must be 'gradient', 'newton', 'bfgs', 'lbfgs' or 'nelder_mead'")
+        if self.differentiation not in ['numeric', 'automatic', 'symbolic']:
+            raise ValueError("Differentiation must be 'numeric', 'automatic' or 'symbolic'")
+        if self.differentiation == 'symbolic' and not hasattr(self.func, 'value_and_gradient'):
+            raise ValueError("Symbolic differentiation requires a function compiled with derivatives")
+        if self.step_rule not in ['fixed', 'armijo', 'wolfe', 'barzilai_borwein', 'momentum', 'nesterov']:
+            raise ValueError("Step rule must be 'fixed', 'armijo', 'wolfe', "
+                             "'barzilai_borwein', 'momentum' or 'nesterov'")
         return True
 
-    def solve(self, start_point: List[float]) -> Dict:
+    def solve(self, start_point: List[float]) -> ExtremumResult:
         """Find extremum starting from given point"""
         self.validate_input()
         if len(start_point) != len(self.variables):
             raise ValueError("Start point dimension must match variables count")
 
-        if self.method == 'gradient':
-            return self._gradient_descent(start_point)
+        self._reset_evaluations()
+        try:
+            if self.method == 'gradient':
+                result = self._gradient_descent(start_point)
+            elif self.method == 'newton':
+                result = self._newton_method(start_point)
+            elif self.method == 'bfgs':
+                result = self._bfgs_method(start_point)
+            elif self.method == 'nelder_mead':
+                result = self._nelder_mead_method(start_point)
+            else:
+                result = self._lbfgs_method(start_point)
+        except _EvaluationBudgetExceeded:
+            value, point = self._best if self._best is not None else (None, list(start_point))
+            result = ExtremumResult(
+                point=point,
+                value=value,
+                iterations=self._iterations,
+                converged=False,
+                message='Evaluation budget exhausted'
+            )
+        result['evaluations'] = self.evaluations
+        return result
+
+    def solve_multistart(self, start_points: Optional[List[List[float]]] = None,
+                         bounds: Optional[Sequence[Tuple[float, float]]] = None,
+                         n_starts: int = 16, workers: Optional[int] = None,
+                         target: Optional[float] = None, tolerance: float = 1e-4) -> Dict:
+        """
+        Run local searches from many start points, concurrently in a process pool.
+
+        Args:
+            start_points: Explicit start points; if omitted, n_starts points are
+                generated from a Halton low-discrepancy sequence over bounds
+            bounds: (low, high) pair for every variable
+            n_starts: Number of generated start points
+            workers: Number of worker processes (1 runs searches in this process,
+                None uses one process per CPU)
+            target: Stop early once a search reaches a value at or below target;
+                searches that are already running in the pool stop at their
+                next iteration and are not counted
+            tolerance: Distance below which two minima are considered the same
+
+        Returns:
+            Best local result extended with the list of distinct 'optima' and
+            the number of completed 'starts'
+
+        Raises:
+            ValueError if no search evaluated the function within the
+            evaluation budget
+        """
+        self.validate_input()
+        if start_points is None:
+            if bounds is None:
+                raise ValueError("Either start points or bounds must be given")
+            if len(bounds) != len(self.variables):
+                raise ValueError("Bounds dimension must match variables count")
+            start_points = _halton_points(bounds, n_starts)
+        if len(start_points) == 0:
+            raise ValueError("At least one start point is required")
+        for point in start_points:
+            if len(point) != len(self.variables):
+                raise ValueError("Start point dimension must match variables count")
+
+        results = []
+        if workers == 1:
+            for point in start_points:
+                results.append(self.solve(list(point)))
+                if _reached(results[-1], target):
+                    break
         else:
-            return self._newton_method(start_point)
+            try:
+                pickle.dumps(self.func)
+            except Exception:
+                raise ValueError("Function must be picklable to run in a process pool")
+            context = multiprocessing.get_context()
+            stop = context.Event()
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                           initializer=_init_worker, initargs=(stop,))
+            try:
+                futures = [executor.submit(_local_search, self, list(point)) for point in start_points]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result is None:
+                        continue
+                    results.append(result)
+                    if _reached(result, target):
+                        stop.set()
+                        break
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+        # Searches stopped by the budget before the first evaluation have no value
+        evaluated = [result for result in results if result['value'] is not None]
+        if not evaluated:
+            raise ValueError("Evaluation budget exhausted before any search evaluated the function")
+        optima = _distinct_optima(evaluated, tolerance)
+        best = min(evaluated, key=lambda r: r['value']).copy()
+        best['optima'] = optima
+        best['starts'] = len(results)
+        return best
 
     def _gradient_descent(self, start_point: List[float]) -> Dict:
-        """Gradient descent optimization implementation"""
-        x = start_point.copy()
-        step_size = 0.01
+        """Gradient descent with the step size rule selected by `step_rule`"""
+        x = np.asarray(start_point, dtype=float)
+        step_size = self.step_size
+        velocity = np.zeros(len(x))
+        prev_x = prev_grad = None
+        f, grad = self._value_and_gradient(x) if self.step_rule == 'wolfe' \
+            else (None, np.asarray(self._compute_gradient(x.tolist())))
         iteration = 0
+        stalled = False
 
         while iteration < self.max_iterations:
-            grad = self._compute_gradient(x)
-            if all(abs(g) < self.precision for g in grad):
+            if np.all(np.abs(grad) < self.precision):
                 break
-            for i in range(len(x)):
-                x[i] -= step_size * grad[i]
+
+            if self.step_rule == 'wolfe':
+                step_size, f, grad_new = self._wolfe_line_search(x, f, grad, -grad)
+                x = x - step_size * grad
+            elif self.step_rule == 'armijo':
+                step_size = self._backtracking_line_search(x, grad, -grad)
+                if step_size == 0.0:
+                    stalled = True
+                    break
+                x = x - step_size * grad
+            elif self.step_rule == 'barzilai_borwein':
+                if prev_x is not None:
+                    s = x - prev_x
+                    sy = float(np.dot(s, grad - prev_grad))
+                    # Fall back to the configured step on non-positive curvature
+                    step_size = float(np.dot(s, s)) / sy if sy > 0 else self.step_size
+                prev_x, prev_grad = x, grad
+                x = x - step_size * grad
+            elif self.step_rule == 'momentum':
+                velocity = self.momentum * velocity - step_size * grad
+                x = x + velocity
+            elif self.step_rule == 'nesterov':
+                # x holds the look-ahead point, so one gradient per iteration suffices
+                velocity_new = self.momentum * velocity - step_size * grad
+                x = x + self.momentum * velocity_new - step_size * grad
+                velocity = velocity_new
+            else:
+                x = x - step_size * grad
+
+            if self.step_rule == 'wolfe':
+                grad = grad_new
+            else:
+                grad = np.asarray(self._compute_gradient(x.tolist()))
             iteration += 1
+            self._iterations = iteration
+            if self._record is not None:
+                self._report_iteration(iteration, x, float(np.max(np.abs(grad))))
 
-        return {
-            'point': x,
-            'value': self.func(*x),
-            'iterations': iteration,
-            'converged': iteration < self.max_iterations
-        }
+        result = ExtremumResult(
+            point=x.tolist(),
+            value=self._evaluate(x.tolist()),
+            iterations=iteration,
+            converged=not stalled and iteration < self.max_iterations
+        )
+        if stalled:
+            result['message'] = 'Line search failed'
+        return result
 
     def _newton_method(self, start_point: List[float]) -> Dict:
-        """Newton's method optimization implementation"""
-        x = start_point.copy()
+        """Newton's method with a full Hessian solve and backtracking line search"""
+        x = np.asarray(start_point, dtype=float)
+        iteration = 0
+        message = None
+
+        while iteration < self.max_iterations:
+            grad = np.asarray(self._compute_gradient(x.tolist()))
+            if np.all(np.abs(grad) < self.precision):
+                break
+            if self.hessian_sparsity is not None:
+                hessian = self._compute_sparse_hessian(x.tolist()).toarray()
+            else:
+                hessian = np.asarray(self._compute_hessian(x.tolist()))
+            if not (np.all(np.isfinite(grad)) and np.all(np.isfinite(hessian))):
+                message = 'Non-finite derivatives'
+                break
+            direction = self._newton_direction(hessian, grad)
+            step_size = self._backtracking_line_search(x, grad, direction)
+            if step_size == 0.0:
+                message = 'Line search failed'
+                break
+            x = x + step_size * direction
+            iteration += 1
+            self._iterations = iteration
+            if self._record is not None:
+                self._report_iteration(iteration, x, float(np.max(np.abs(step_size * direction))))
+
+        result = ExtremumResult(
+            point=x.tolist(),
+            value=self._evaluate(x.tolist()),
+            iterations=iteration,
+            converged=message is None and iteration < self.max_iterations
+        )
+        if message is not None:
+            result['message'] = message
+        return result
+
+    @staticmethod
+    def _newton_direction(hessian: np.ndarray, grad: np.ndarray) -> np.ndarray:
+        """
+        Solve H·p = -g through a Cholesky factorization.
+
+        If the Hessian is not positive definite, a multiple of the identity is
+        added until the factorization succeeds, so the step is always a
+        descent direction.
+        """
+        hessian = (hessian + hessian.T) / 2
+        identity = np.eye(len(grad))
+        beta = 1e-3
+        min_diagonal = np.min(np.diag(hessian))
+        tau = 0.0 if min_diagonal > 0 else beta - min_diagonal
+
+        while True:
+            try:
+                lower = np.linalg.cholesky(hessian + tau * identity)
+                break
+            except np.linalg.LinAlgError:
+                tau = max(2 * tau, beta)
+
+        # Forward and back substitution with the triangular factors, O(n²)
+        n = len(grad)
+        y = np.empty(n)
+        for i in range(n):
+            y[i] = (-grad[i] - lower[i, :i] @ y[:i]) / lower[i, i]
+        direction = np.empty(n)
+        for i in reversed(range(n)):
+            direction[i] = (y[i] - lower[i + 1:, i] @ direction[i + 1:]) / lower[i, i]
+        return direction
+
+    def _backtracking_line_search(self, x: np.ndarray, grad: np.ndarray,
+                                  direction: np.ndarray) -> float:
+        """
+        Find step size satisfying the Armijo sufficient decrease condition.
+
+        Returns:
+            The step size, or 0.0 if no step down to 1e-10 decreases the function
+        """
+        c1 = 1e-4  # Sufficient decrease constant
+        shrink = 0.5
+        step_size = 1.0
+        f = self._evaluate(x.tolist())
+        slope = float(np.dot(grad, direction))
+
+        while step_size > 1e-10:
+            if self._evaluate((x + step_size * direction).tolist()) <= f + c1 * step_size * slope:
+                return step_size
+            step_size *= shrink
+        return 0.0
+
+    def _bfgs_method(self, start_point: List[float]) -> Dict:
+        """BFGS quasi-Newton optimization with inverse Hessian updates"""
+        x = np.asarray(start_point, dtype=float)
+        f, grad = self._value_and_gradient(x)
+        inverse_hessian = np.eye(len(x))
+        iteration = 0
+
+        while iteration < self.max_iterations:
+            if np.all(np.abs(grad) < self.precision):
+                break
+            direction = -inverse_hessian @ grad
+            step_size, f_new, grad_new = self._wolfe_line_search(x, f, grad, direction)
+            s = step_size * direction
+            y = grad_new - grad
+            sy = float(np.dot(s, y))
+
+            if sy > 1e-12:
+                if iteration == 0:
+                    # Scale the initial approximation to the curvature seen so far
+                    inverse_hessian = np.eye(len(x)) * sy / float(np.dot(y, y))
+                rho = 1.0 / sy
+                hy = inverse_hessian @ y
+                inverse_hessian = (inverse_hessian
+                                   - rho * (np.outer(s, hy) + np.outer(hy, s))
+                                   + (rho * rho * float(np.dot(y, hy)) + rho) * np.outer(s, s))
+
+            x = x + s
+            f, grad = f_new, grad_new
+            iteration += 1
+            self._iterations = iteration
+            if self._record is not None:
+                self._report_iteration(iteration, x, float(np.max(np.abs(grad))))
+
+        return ExtremumResult(
+            point=x.tolist(),
+            value=f,
+            iterations=iteration,
+            converged=iteration < self.max_iterations
+        )
+
+    def _lbfgs_method(self, start_point: List[float]) -> Dict:
+        """Limited-memory BFGS keeping the last `memory` correction pairs"""
+        x = np.asarray(start_point, dtype=float)
+        n = len(x)
+        m = self.memory
+        # Correction pairs are stored in a ring buffer of preallocated arrays
+        s_history = np.zeros((m, n))
+        y_history = np.zeros((m, n))
+        rho_history = np.zeros(m)
+        count = 0
+        head = 0
+
+        f, grad = self._value_and_gradient(x)
+        iteration = 0
+
+        while iteration < self.max_iterations:
+            if np.all(np.abs(grad) < self.precision):
+                break
+            direction = self._lbfgs_direction(grad, s_history, y_history, rho_history, count, head)
+            step_size, f_new, grad_new = self._wolfe_line_search(x, f, grad, direction)
+            s = step_size * direction
+            y = grad_new - grad
+            sy = float(np.dot(s, y))
+
+            if sy > 1e-12:
+                s_history[head] = s
+                y_history[head] = y
+                rho_history[head] = 1.0 / sy
+                head = (head + 1) % m
+                count = min(count + 1, m)
+
+            x = x + s
+            f, grad = f_new, grad_new
+            iteration += 1
+            self._iterations = iteration
+            if self._record is not None:
+                self._report_iteration(iteration, x, float(np.max(np.abs(grad))))
+
+        return ExtremumResult(
+            point=x.tolist(),
+            value=f,
+            iterations=iteration,
+            converged=iteration < self.max_iterations
+        )
+
+    def _nelder_mead_method(self, start_point: List[float]) -> Dict:
+        """
+        Nelder-Mead simplex optimization without derivatives.
+
+        Uses the dimension-dependent coefficients of Gao and Han, which keep
+        the simplex from degenerating in higher dimensions.
+        """
+        n = len(start_point)
+        m = max(n, 2)
+        reflection = 1.0
+        expansion = 1 + 2 / m
+        contraction = 0.75 - 1 / (2 * m)
+        shrink = 1 - 1 / m
+
+        # Vertices are rows of one array, with their function values alongside
+        simplex = np.tile(np.asarray(start_point, dtype=float), (n + 1, 1))
+        for i in range(n):
+            simplex[i + 1, i] += 0.05 * simplex[i + 1, i] if simplex[i + 1, i] != 0 else 0.00025
+        values = np.array([self._evaluate(vertex.tolist()) for vertex in simplex])
         iteration = 0
 
         while iteration < self.max_iterations:
-            grad = self._compute_gradient(x)
-            hessian = self._compute_hessian(x)
-            if all(abs(g) < self.precision for g in grad):
+            order = np.argsort(values)
+            simplex, values = simplex[order], values[order]
+            if (np.max(np.abs(values[1:] - values[0])) <= self.precision and
+                    np.max(np.abs(simplex[1:] - simplex[0])) <= self.precision):
                 break
-            step_size = 0.1
-            for i in range(len(x)):
-                x[i] -= step_size * grad[i] / (hessian[i][i] + 1e-8)
+
+            centroid = simplex[:-1].mean(axis=0)
+            reflected = centroid + reflection * (centroid - simplex[-1])
+            f_reflected = self._evaluate(reflected.tolist())
+
+            if f_reflected < values[0]:
+                expanded = centroid + expansion * (reflected - centroid)
+                f_expanded = self._evaluate(expanded.tolist())
+                if f_expanded < f_reflected:
+                    simplex[-1], values[-1] = expanded, f_expanded
+                else:
+                    simplex[-1], values[-1] = reflected, f_reflected
+            elif f_reflected < values[-2]:
+                simplex[-1], values[-1] = reflected, f_reflected
+            else:
+                if f_reflected < values[-1]:
+                    contracted = centroid + contraction * (reflected - centroid)
+                    f_contracted = self._evaluate(contracted.tolist())
+                    accepted = f_contracted <= f_reflected
+                else:
+                    contracted = centroid + contraction * (simplex[-1] - centroid)
+                    f_contracted = self._evaluate(contracted.tolist())
+                    accepted = f_contracted < values[-1]
+
+                if accepted:
+                    simplex[-1], values[-1] = contracted, f_contracted
+                else:
+                    simplex[1:] = simplex[0] + shrink * (simplex[1:] - simplex[0])
+                    values[1:] = [self._evaluate(vertex.tolist()) for vertex in simplex[1:]]
+
             iteration += 1
+            self._iterations = iteration
+            if self._record is not None:
+                self._report_iteration(iteration, simplex[int(np.argmin(values))],
+                                       float(np.max(values) - np.min(values)))
+
+        best = int(np.argmin(values))
+        return ExtremumResult(
+            point=simplex[best].tolist(),
+            value=float(values[best]),
+            iterations=iteration,
+            converged=iteration < self.max_iterations
+        )
+
+    @staticmethod
+    def _lbfgs_direction(grad: np.ndarray, s_history: np.ndarray, y_history: np.ndarray,
+                         rho_history: np.ndarray, count: int, head: int) -> np.ndarray:
+        """Compute -H·g with the L-BFGS two-loop recursion"""
+        m = len(rho_history)
+        order = [(head - 1 - k) % m for k in range(count)]  # Newest pair first
+        alpha = np.zeros(count)
+        q = grad.copy()
 
-        return {
-            'point': x,
-            'value': self.func(*x),
-            'iterations': iteration,
-            'converged': iteration < self.max_iterations
-        }
+        for k, idx in enumerate(order):
+            alpha[k] = rho_history[idx] * np.dot(s_history[idx], q)
+            q -= alpha[k] * y_history[idx]
+
+        if count > 0:
+            newest = order[0]
+            q *= np.dot(s_history[newest], y_history[newest]) / np.dot(y_history[newest], y_history[newest])
+
+        for k in reversed(range(count)):
+            idx = order[k]
+            beta = rho_history[idx] * np.dot(y_history[idx], q)
+            q += s_history[idx] * (alpha[k] - beta)
+        return -q
+
+    def _value_and_gradient(self, x: np.ndarray):
+        """Evaluate function value and gradient at a point"""
+        point = x.tolist()
+        if self.differentiation == 'automatic':
+            self._count_evaluations(1)
+            value, grad = autodiff.value_and_gradient(self.func, point)
+            self._record_best(value, point)
+            return value, np.asarray(grad)
+        if self.differentiation == 'symbolic':
+            self._count_evaluations(1)
+            value, grad = self.func.value_and_gradient(*point)
+            self._record_best(value, point)
+            return value, np.asarray(grad, dtype=float)
+        return self._evaluate(point), np.asarray(self._compute_gradient(point))
+
+    def _wolfe_line_search(self, x: np.ndarray, f: float, grad: np.ndarray,
+                           direction: np.ndarray):
+        """
+        Find step size satisfying the strong Wolfe conditions.
+
+        Returns:
+            Tuple of (step size, function value, gradient) at the accepted point
+        """
+        c1 = 1e-4  # Sufficient decrease constant
+        c2 = 0.9  # Curvature constant
+        slope0 = float(np.dot(grad, direction))
+        prev_step, prev_f, prev_slope = 0.0, f, slope0
+        step_size = 1.0
+
+        for i in range(20):
+            f_new, grad_new = self._value_and_gradient(x + step_size * direction)
+            slope = float(np.dot(grad_new, direction))
+
+            if f_new > f + c1 * step_size * slope0 or (i > 0 and f_new >= prev_f):
+                return self._wolfe_zoom(x, f, slope0, direction,
+                                        (prev_step, prev_f, prev_slope),
+                                        (step_size, f_new, slope))
+            if abs(slope) <= -c2 * slope0:
+                return step_size, f_new, grad_new
+            if slope >= 0:
+                return self._wolfe_zoom(x, f, slope0, direction,
+                                        (step_size, f_new, slope),
+                                        (prev_step, prev_f, prev_slope))
+
+            prev_step, prev_f, prev_slope = step_size, f_new, slope
+            step_size *= 2
+
+        return step_size, f_new, grad_new
+
+    def _wolfe_zoom(self, x: np.ndarray, f: float, slope0: float, direction: np.ndarray,
+                    low: tuple, high: tuple):
+        """Shrink the bracketing interval [low, high] until a Wolfe step is found"""
+        c1 = 1e-4
+        c2 = 0.9
+
+        for _ in range(30):
+            step_lo, f_lo, slope_lo = low
+            step_hi, f_hi, _ = high
+            width = step_hi - step_lo
+
+            # Minimizer of the quadratic through f_lo, slope_lo and f_hi
+            denominator = 2 * (f_hi - f_lo - slope_lo * width)
+            if denominator > 0:
+                step_size = step_lo - slope_lo * width * width / denominator
+            else:
+                step_size = step_lo + width / 2
+            # Keep the trial step safely inside the interval
+            lower, upper = sorted((step_lo + 0.1 * width, step_hi - 0.1 * width))
+            if not lower <= step_size <= upper:
+                step_size = step_lo + width / 2
+
+            f_new, grad_new = self._value_and_gradient(x + step_size * direction)
+            slope = float(np.dot(grad_new, direction))
+
+            if f_new > f + c1 * step_size * slope0 or f_new >= f_lo:
+                high = (step_size, f_new, slope)
+            else:
+                if abs(slope) <= -c2 * slope0:
+                    return step_size, f_new, grad_new
+                if slope * width >= 0:
+                    high = low
+                low = (step_size, f_new, slope)
+
+            if abs(width) < 1e-12:
+                break
+
+        return step_size, f_new, grad_new
 
     def _compute_gradient(self, point: List[float]) -> List[float]:
         """Compute gradient using central differences"""
+        if self.differentiation == 'automatic':
+            self._count_evaluations(1)
+            return autodiff.gradient(self.func, point)
+        if self.differentiation == 'symbolic':
+            self._count_evaluations(1)
+            return [float(g) for g in self.func.gradient(*point)]
+        if self._batch_supported is not False:
+            grad = self._compute_gradient_batched(point)
+            if grad is not None:
+                return grad
         h = 1e-6
         grad = []
         for i in range(len(point)):
@@ -96,12 +633,52 @@ class ExtremumFinder(MathSolver):
             point_minus = point.copy()
             point_plus[i] += h
             point_minus[i] -= h
-            partial_derivative = (self.func(*point_plus) - self.func(*point_minus)) / (2 * h)
+            partial_derivative = (self._evaluate(point_plus) - self._evaluate(point_minus)) / (2 * h)
             grad.append(partial_derivative)
         return grad
 
+    def _compute_gradient_batched(self, point: List[float]) -> Optional[List[float]]:
+        """
+        Compute gradient using central differences with a single function call.
+
+        All 2n perturbed points are stacked into one array and passed to the
+        function column by column. Returns None if the function turns out not
+        to support array arguments, so the caller can fall back to the loop.
+        """
+        h = 1e-6
+        n = len(point)
+        steps = np.eye(n) * h
+        batch = np.vstack((np.asarray(point, dtype=float) + steps,
+                           np.asarray(point, dtype=float) - steps))
+
+        self._check_budget(2 * n)
+        try:
+            values = np.asarray(self.func(*batch.T), dtype=float)
+        except Exception:
+            if self._batch_supported:
+                raise
+            values = None
+
+        if values is None or values.shape != (2 * n,):
+            if self._batch_supported:
+                raise ValueError("Vectorized function must return one value per point")
+            self._batch_supported = False
+            return None
+
+        self._batch_supported = True
+        self._count_evaluations(2 * n)
+        best = int(np.argmin(values))
+        self._record_best(float(values[best]), batch[best].tolist())
+        return ((values[:n] - values[n:]) / (2 * h)).tolist()
+
     def _compute_hessian(self, point: List[float]) -> List[List[float]]:
         """Compute Hessian matrix using finite differences"""
+        if self.differentiation == 'automatic':
+            self._count_evaluations(len(point))
+            return autodiff.hessian(self.func, point)
+        if self.differentiation == 'symbolic':
+            self._count_evaluations(1)
+            return self.func.hessian(*point)
         h = 1e-6
         n = len(point)
         hessian = [[0.0 for _ in range(n)] for _ in range(n)]
@@ -114,9 +691,9 @@ class ExtremumFinder(MathSolver):
                     point_minus = point.copy()
                     point_plus[i] += h
                     point_minus[i] -= h
-                    f_plus = self.func(*point_plus)
-                    f_minus = self.func(*point_minus)
-                    f = self.func(*point)
+                    f_plus = self._evaluate(point_plus)
+                    f_minus = self._evaluate(point_minus)
+                    f = self._evaluate(point)
                     hessian[i][j] = (f_plus - 2 * f + f_minus) / (h * h)
                 else:
                     # Off-diagonal elements (mixed derivatives)
@@ -132,6 +709,227 @@ class ExtremumFinder(MathSolver):
                     point_mp[j] += h
                     point_mm[i] -= h
                     point_mm[j] -= h
-                    hessian[i][j] = (self.func(*point_pp) - self.func(*point_pm) -
-                                     self.func(*point_mp) + self.func(*point_mm)) / (4 * h * h)
+                    hessian[i][j] = (self._evaluate(point_pp) - self._evaluate(point_pm) -
+                                     self._evaluate(point_mp) + self._evaluate(point_mm)) / (4 * h * h)
         return hessian
+
+    def _compute_sparse_hessian(self, point: List[float]) -> CSRMatrix:
+        """
+        Compute sparse Hessian from gradient differences using column coloring.
+
+        Structurally independent columns are perturbed together, so the cost
+        is two gradient evaluations per color instead of O(n^2) evaluations.
+        """
+        pattern, groups = self._hessian_structure(point)
+        return self._hessian_from_gradients(point, pattern, groups)
+
+    def _hessian_structure(self, point: List[float]):
+        """Return the Hessian sparsity pattern and its column coloring"""
+        # The structure is cached per sparsity setting, function and dimension;
+        # instrumented solves see the function through a counting wrapper
+        current = getattr(self.func, '__wrapped__', self.func)
+        source, func, n = self._sparsity[0] if self._sparsity is not None else (None, None, None)
+        if self._sparsity is None or source is not self.hessian_sparsity \
+                or func is not current or n != len(point):
+            if isinstance(self.hessian_sparsity, str):
+                if self.hessian_sparsity != 'detect':
+                    raise ValueError("Hessian sparsity must be a pattern or 'detect'")
+                pattern = self._detect_sparsity(point)
+            else:
+                pattern = normalize_pattern(self.hessian_sparsity, len(point))
+            self._sparsity = ((self.hessian_sparsity, current, len(point)), pattern,
+                              color_columns(pattern))
+        return self._sparsity[1], self._sparsity[2]
+
+    def _detect_sparsity(self, point: List[float]):
+        """
+        Find the Hessian nonzero structure by perturbing every column.
+
+        Entries can vanish at a particular point (the cross term of x²y² at
+        the origin), so the pattern is the union of the structures found at
+        point and at a randomly shifted copy of it.
+
+        Detection costs two dense stencils of n gradient pairs each, more than
+        a single dense Hessian. It only pays off because the pattern is
+        cached for later iterations and solves of the same function; for a
+        few Newton steps a declared pattern or a dense Hessian is cheaper.
+        """
+        n = len(point)
+        x = np.asarray(point, dtype=float)
+        shift = np.random.default_rng(0).uniform(-0.1, 0.1, n) * (1 + np.abs(x))
+        full = [set(range(n)) for _ in range(n)]
+        nonzero = np.zeros((n, n), dtype=bool)
+        for probe in (x, x + shift):
+            try:
+                dense = self._hessian_from_gradients(probe.tolist(), full,
+                                                     [[j] for j in range(n)]).toarray()
+            except (ArithmeticError, ValueError):
+                if probe is x:
+                    raise
+                continue  # Shifted point outside the domain of the function
+            finite = np.abs(dense[np.isfinite(dense)])
+            # Finite-difference noise scales with the function and Hessian magnitudes
+            threshold = 1e-5 * max(1.0, abs(self._evaluate(probe.tolist())),
+                                   float(np.max(finite)) if finite.size else 0.0)
+            # Entries that could not be evaluated are kept as nonzero
+            nonzero |= ~(np.abs(dense) <= threshold)
+        return normalize_pattern(nonzero, n)
+
+    def _hessian_from_gradients(self, point: List[float], pattern, groups) -> CSRMatrix:
+        """Fill the pattern with central differences of gradients along each color"""
+        h = 1e-4
+        n = len(point)
+        x = np.asarray(point, dtype=float)
+        color = np.empty(n, dtype=np.int64)
+        differences = np.empty((len(groups), n))
+
+        for c, columns in enumerate(groups):
+            color[columns] = c
+            step = np.zeros(n)
+            step[columns] = h
+            grad_plus = np.asarray(self._compute_gradient((x + step).tolist()))
+            grad_minus = np.asarray(self._compute_gradient((x - step).tolist()))
+            differences[c] = (grad_plus - grad_minus) / (2 * h)
+
+        hessian = CSRMatrix.from_pattern(pattern)
+        rows = np.repeat(np.arange(n), np.diff(hessian.indptr))
+        # Row i of a color's difference holds H[i, j] for the one column j of
+        # that color that is nonzero in row i
+        hessian.data = differences[color[hessian.indices], rows]
+        return hessian
+
+    def _reset_evaluations(self):
+        """Clear the evaluation cache and counters before a new solve"""
+        self._cache = OrderedDict()
+        self._best = None
+        self._iterations = 0
+        self.evaluations = 0
+
+    def _evaluate(self, point: List[float]) -> float:
+        """Evaluate the function, reusing the value if the point was seen recently"""
+        key = tuple(point)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self._check_budget(1)
+        value = self.func(*point)
+        self.evaluations += 1
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        self._record_best(value, list(point))
+        return value
+
+    def _check_budget(self, count: int):
+        """Stop the solve if count more evaluations would exceed the budget"""
+        if self.max_evaluations is not None and self.evaluations + count > self.max_evaluations:
+            raise _EvaluationBudgetExceeded()
+
+    def _count_evaluations(self, count: int):
+        """Account for evaluations made outside of _evaluate"""
+        self._check_budget(count)
+        self.evaluations += count
+
+    def _record_best(self, value: float, point: List[float]):
+        """Remember the lowest function value seen during the solve"""
+        if self._best is None or value < self._best[0]:
+            self._best = (value, point)
+
+
+class _StopFlag(Instrumentation):
+    """
+    Instrumentation of multi-start worker searches that stops a search once
+    the shared stop event is set, forwarding events to the solver's own
+    instrumentation
+    """
+    enabled = True
+
+    def __init__(self, inner: Instrumentation, event):
+        self.inner = inner
+        self.event = event
+
+    def solve_started(self, solver, record):
+        if self.inner.enabled:
+            self.inner.solve_started(solver, record)
+
+    def iteration(self, solver, record, iteration, point, error):
+        if self.event.is_set():
+            raise _SearchStopped()
+        if self.inner.enabled:
+            self.inner.iteration(solver, record, iteration, point, error)
+
+    def solve_finished(self, solver, record, result):
+        if self.inner.enabled:
+            self.inner.solve_finished(solver, record, result)
+
+
+# Stop event shared by the worker processes of a multi-start pool
+_stop_event = None
+
+
+def _init_worker(event):
+    """Keep the pool's stop event in each worker process"""
+    global _stop_event
+    _stop_event = event
+
+
+def _local_search(finder: ExtremumFinder, start_point: List[float]) -> Optional[Dict]:
+    """
+    Run a single local search (module level so it can be sent to worker
+    processes). Returns None if the search was stopped because another
+    search reached the target.
+    """
+    if _stop_event is not None:
+        if _stop_event.is_set():
+            return None
+        finder.instrumentation = _StopFlag(finder.instrumentation, _stop_event)
+    try:
+        return finder.solve(start_point)
+    except _SearchStopped:
+        return None
+
+
+def _reached(result: Dict, target: Optional[float]) -> bool:
+    """Whether a local result reached the early stopping target"""
+    return target is not None and result['value'] is not None and result['value'] <= target
+
+
+def _halton_points(bounds: Sequence[Tuple[float, float]], count: int) -> List[List[float]]:
+    """Generate count points of the Halton sequence scaled to the given box"""
+    primes = []
+    candidate = 2
+    while len(primes) < len(bounds):
+        if all(candidate % p for p in primes):
+            primes.append(candidate)
+        candidate += 1
+
+    points = []
+    for index in range(1, count + 1):
+        point = []
+        for (low, high), base in zip(bounds, primes):
+            # Radical inverse of index in the given base
+            fraction, scale, i = 0.0, 1.0 / base, index
+            while i > 0:
+                fraction += (i % base) * scale
+                i //= base
+                scale /= base
+            point.append(low + fraction * (high - low))
+        points.append(point)
+    return points
+
+
+def _distinct_optima(results: List[Dict], tolerance: float) -> List[Dict]:
+    """Group converged local results whose points lie within tolerance of each other"""
+    optima = []
+    for result in sorted(results, key=lambda r: r['value']):
+        if not result['converged']:
+            continue
+        point = np.asarray(result['point'], dtype=float)  # Optima points are arrays like result points
+        for optimum in optima:
+            if np.linalg.norm(point - optimum['point']) < tolerance:
+                optimum['count'] += 1
+                break
+        else:
+            optima.append({'point': point, 'value': result['value'], 'count': 1})
+    return optima
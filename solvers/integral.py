@@ -5,9 +5,12 @@ Implements trapezoid rule, Simpson's rule, and Monte Carlo methods.
 import numpy as np
 from typing import List, Tuple, Dict, Callable
 from .base import MathSolver
+from .results import IntegralResult
 
 
 class Integrator(MathSolver):
+    _function_attributes = ('func',)
+
     def __init__(self, func: Callable, method: str = 'trapezoid'):
         """
         Initialize integrator with function to integrate.
@@ -27,7 +30,7 @@ class Integrator(MathSolver):
             raise ValueError("Function must be callable")
         return True
 
-    def solve(self, a: float, b: float, *args) -> Dict:
+    def solve(self, a: float, b: float, *args) -> IntegralResult:
         """
         Compute integral of function from a to b.
         Supports multidimensional integrals through repeated 1D integration.
@@ -66,11 +69,11 @@ class Integrator(MathSolver):
 
             integral = self._single_integral(a, b)
             result *= integral['value']
-        return {
-            'value': result,
-            'method': f"Repeated 1D {self.method}",
-            'bounds': current_bounds
-        }
+        return IntegralResult(
+            value=result,
+            method=f"Repeated 1D {self.method}",
+            bounds=current_bounds
+        )
 
     def _trapezoid_rule(self, a: float, b: float) -> Dict:
         """Trapezoidal rule with adaptive refinement"""
@@ -83,10 +86,17 @@ class Integrator(MathSolver):
             integral = 0.5 * (self.func(a) + self.func(b))
 
             # Sum function values at intermediate points
-            for i in range(1, n):
-                integral += self.func(a + i * h)
+            if getattr(self.func, 'vectorized', False):
+                integral += float(np.sum(self.func(a + np.arange(1, n) * h)))
+            else:
+                for i in range(1, n):
+                    integral += self.func(a + i * h)
             integral *= h
 
+            if self._record is not None:
+                self._report_iteration(iterations + 1, integral,
+                                       abs(integral - prev_integral) if iterations > 0 else None)
+
             # Check for convergence
             if iterations > 0 and abs(integral - prev_integral) < self.precision:
                 break
@@ -95,12 +105,12 @@ class Integrator(MathSolver):
             n *= 2  # Double number of segments for next iteration
             iterations += 1
 
-        return {
-            'value': integral,
-            'segments': n,
-            'iterations': iterations,
-            'converged': iterations < self.max_iterations
-        }
+        return IntegralResult(
+            value=integral,
+            segments=n,
+            iterations=iterations,
+            converged=iterations < self.max_iterations
+        )
 
     def _simpson_rule(self, a: float, b: float) -> Dict:
         """Simpson's rule with adaptive refinement"""
@@ -113,14 +123,22 @@ class Integrator(MathSolver):
             integral = self.func(a) + self.func(b)
 
             # Weighted sum of function values
-            for i in range(1, n):
-                x = a + i * h
-                if i % 2 == 1:  # Odd indices get weight 4
-                    integral += 4 * self.func(x)
-                else:  # Even indices get weight 2
-                    integral += 2 * self.func(x)
+            if getattr(self.func, 'vectorized', False):
+                values = self.func(a + np.arange(1, n) * h)
+                integral += float(4 * np.sum(values[0::2]) + 2 * np.sum(values[1::2]))
+            else:
+                for i in range(1, n):
+                    x = a + i * h
+                    if i % 2 == 1:  # Odd indices get weight 4
+                        integral += 4 * self.func(x)
+                    else:  # Even indices get weight 2
+                        integral += 2 * self.func(x)
             integral *= h / 3
 
+            if self._record is not None:
+                self._report_iteration(iterations + 1, integral,
+                                       abs(integral - prev_integral) if iterations > 0 else None)
+
             # Check for convergence
             if iterations > 0 and abs(integral - prev_integral) < self.precision:
                 break
@@ -129,12 +147,12 @@ class Integrator(MathSolver):
             n *= 2  # Double number of segments
             iterations += 1
 
-        return {
-            'value': integral,
-            'segments': n,
-            'iterations': iterations,
-            'converged': iterations < self.max_iterations
-        }
+        return IntegralResult(
+            value=integral,
+            segments=n,
+            iterations=iterations,
+            converged=iterations < self.max_iterations
+        )
 
     import numpy as np
 
@@ -159,6 +177,10 @@ class Integrator(MathSolver):
             hits = np.sum(y_samples <= self.func(x_samples))
             integral = (hits / n) * range_width * max_f
 
+            if self._record is not None:
+                self._report_iteration(iterations + 1, integral,
+                                       abs(integral - prev_integral) if iterations > 0 else None)
+
             # Check convergence
             if iterations > 0 and abs(integral - prev_integral) < self.precision:
                 break
@@ -167,9 +189,9 @@ class Integrator(MathSolver):
             n *= 2  # Double sample count for next iteration
             iterations += 1
 
-        return {
-            'value': integral,
-            'segments': n,
-            'iterations': iterations,
-            'converged': iterations < self.max_iterations
-        }
+        return IntegralResult(
+            value=integral,
+            segments=n,
+            iterations=iterations,
+            converged=iterations < self.max_iterations
+        )
@@ -1,9 +1,13 @@
 """
 Numerical interpolation solver.
 Implements Lagrange, Newton, and cubic spline interpolation methods.
+The interpolating functions accept a float or a NumPy array of x values.
 """
+import bisect
+import numpy as np
 from typing import List, Tuple, Dict, Callable
 from .base import MathSolver
+from .results import InterpolationResult
 
 
 class Interpolator(MathSolver):
@@ -29,7 +33,7 @@ class Interpolator(MathSolver):
             raise ValueError("Method must be 'lagrange', 'newton' or 'spline'")
         return True
 
-    def solve(self) -> Dict:
+    def solve(self) -> InterpolationResult:
         """Create interpolation function using specified method"""
         self.validate_input()
         if self.method == 'lagrange':
@@ -42,8 +46,28 @@ class Interpolator(MathSolver):
     def _lagrange_interpolation(self) -> Dict:
         """Lagrange polynomial interpolation"""
         n = len(self.points)
+        nodes = np.array([p[0] for p in self.points], dtype=float)
+        values = np.array([p[1] for p in self.points], dtype=float)
+        # Barycentric weights for array evaluation in O(n) per point; the
+        # differences are scaled to keep the products within float range
+        scale = 4 / (np.ptp(nodes) or 1.0)
+        differences = (nodes[:, None] - nodes[None, :]) * scale
+        np.fill_diagonal(differences, 1.0)
+        weights = 1 / np.prod(differences, axis=1)
+
+        def barycentric(x: np.ndarray) -> np.ndarray:
+            # First (modified Lagrange) form, which is also stable outside the nodes
+            offsets = (x[..., None] - nodes) * scale
+            exact = offsets == 0
+            offsets[exact] = 1.0  # Nodes themselves are taken from values below
+            result = np.prod(offsets, axis=-1) * ((weights / offsets) @ values)
+            hit = exact.any(axis=-1)
+            result[hit] = values[np.argmax(exact[hit], axis=-1)]
+            return result
 
         def lagrange_poly(x: float) -> float:
+            if np.ndim(x):
+                return barycentric(np.asarray(x, dtype=float))
             result = 0.0
             for i in range(n):
                 xi, yi = self.points[i]
@@ -55,11 +79,12 @@ class Interpolator(MathSolver):
                 result += term
             return result
 
-        return {
-            'function': lagrange_poly,
-            'method': 'Lagrange',
-            'degree': n - 1
-        }
+        lagrange_poly.vectorized = True
+        return InterpolationResult(
+            function=lagrange_poly,
+            method='Lagrange',
+            degree=n - 1
+        )
 
     def _newton_interpolation(self) -> Dict:
         """Newton divided differences interpolation"""
@@ -80,6 +105,8 @@ class Interpolator(MathSolver):
 
         def newton_poly(x: float) -> float:
             """Newton interpolation polynomial"""
+            if np.ndim(x):
+                x = np.asarray(x, dtype=float)
             result = diff_table[0][0]
             product = 1.0
             for i in range(1, n):
@@ -87,11 +114,12 @@ class Interpolator(MathSolver):
                 result += diff_table[0][i] * product
             return result
 
-        return {
-            'function': newton_poly,
-            'method': 'Newton',
-            'degree': n - 1
-        }
+        newton_poly.vectorized = True
+        return InterpolationResult(
+            function=newton_poly,
+            method='Newton',
+            degree=n - 1
+        )
 
     def _spline_interpolation(self) -> Dict:
         """Cubic spline interpolation"""
@@ -134,22 +162,26 @@ class Interpolator(MathSolver):
             b[i] = (y[i + 1] - y[i]) / h[i] - h[i] * (c[i + 1] + 2 * c[i]) / 3
             d[i] = (c[i + 1] - c[i]) / (3 * h[i])
 
+        coefficients = np.array([y[:-1], b, c[:-1], d], dtype=float)
+        knots = np.array(x, dtype=float)
+
         def spline_function(x_val: float) -> float:
             """Piecewise cubic spline function"""
-            if x_val <= x[0]:
-                i = 0
-            elif x_val >= x[-1]:
-                i = n - 2
-            else:
-                # Find the right interval
-                for i in range(n - 1):
-                    if x_val <= x[i + 1]:
-                        break
+            if np.ndim(x_val):
+                x_val = np.asarray(x_val, dtype=float)
+                # Same interval choice as for scalars: the first i with x <= x[i + 1]
+                i = np.clip(np.searchsorted(knots, x_val) - 1, 0, n - 2)
+                dx = x_val - knots[i]
+                a_i, b_i, c_i, d_i = coefficients[:, i]
+                return a_i + dx * (b_i + dx * (c_i + dx * d_i))
+            i = min(max(bisect.bisect_left(x, x_val) - 1, 0), n - 2)
             dx = x_val - x[i]
             return y[i] + b[i] * dx + c[i] * dx ** 2 + d[i] * dx ** 3
 
-        return {
-            'function': spline_function,
-            'method': 'Cubic Spline',
-            'segments': n - 1
-        }
+        spline_function.vectorized = True
+
+        return InterpolationResult(
+            function=spline_function,
+            method='Cubic Spline',
+            segments=n - 1
+        )
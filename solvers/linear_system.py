@@ -4,6 +4,7 @@ Implements Gaussian elimination with partial pivoting.
 """
 from typing import List, Dict
 from .base import MathSolver
+from .results import LinearSystemResult
 
 
 class LinearSystemSolver(MathSolver):
@@ -31,7 +32,7 @@ class LinearSystemSolver(MathSolver):
             raise ValueError("Vector dimension must match matrix size")
         return True
 
-    def solve(self) -> Dict:
+    def solve(self) -> LinearSystemResult:
         """Solve the linear system using Gaussian elimination"""
         self.validate_input()
         n = len(self.matrix)
@@ -53,11 +54,11 @@ class LinearSystemSolver(MathSolver):
 
             # Check for singular matrix
             if abs(matrix[col][col]) < self.precision:
-                return {
-                    'solution': None,
-                    'is_singular': True,
-                    'message': 'Matrix is singular or nearly singular'
-                }
+                return LinearSystemResult(
+                    solution=None,
+                    is_singular=True,
+                    message='Matrix is singular or nearly singular'
+                )
 
             # Eliminate current column in lower rows
             for row in range(col + 1, n):
@@ -74,8 +75,8 @@ class LinearSystemSolver(MathSolver):
                 sum_ax += matrix[row][col] * solution[col]
             solution[row] = (vector[row] - sum_ax) / matrix[row][row]
 
-        return {
-            'solution': solution,
-            'is_singular': False,
-            'message': 'Solution found'
-        }
+        return LinearSystemResult(
+            solution=solution,
+            is_singular=False,
+            message='Solution found'
+        )
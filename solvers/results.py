@@ -0,0 +1,144 @@
+"""
+Typed solver results.
+Each solver returns a result object with a fixed set of slots instead of a
+dictionary. Vector payloads are stored as NumPy float arrays, so results
+are compact, cheap to pickle (arrays travel as out-of-band buffers with
+pickle protocol 5) and still behave like the dictionaries solvers used to
+return: result['value'], 'segments' in result and dict(result) all work.
+"""
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, Tuple
+import numpy as np
+
+
+class SolverResult(MutableMapping):
+    """
+    Base class of solver results.
+
+    Subclasses list their fields in __slots__ and the fields holding
+    vectors in _arrays. A field that was never set is absent, like a
+    missing dictionary key; keys outside the fields (e.g. values added by
+    callers) are kept in a separate dictionary.
+    """
+    __slots__ = ('_extra',)
+    _fields: Tuple[str, ...] = ()
+    _arrays: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(name for klass in reversed(cls.__mro__)
+                            for name in klass.__dict__.get('__slots__', ())
+                            if not name.startswith('_'))
+
+    def __init__(self, **values):
+        self._extra = None
+        for key, value in values.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._fields:
+            if key in self._arrays and value is not None:
+                value = np.asarray(value, dtype=float)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self._fields:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._fields:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Mapping) and _equal(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+    def copy(self) -> 'SolverResult':
+        return type(self)(**self)
+
+    def __reduce__(self):
+        # Arrays are passed on as they are, so protocol 5 can send them out of band
+        return _restore, (type(self), dict(self))
+
+
+def _restore(cls, values: Dict) -> SolverResult:
+    return cls(**values)
+
+
+def _equal(a, b) -> bool:
+    """Equality that compares arrays element by element, also inside containers"""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return a is not None and b is not None and np.array_equal(a, b)
+    if isinstance(a, Mapping) and isinstance(b, Mapping):
+        return set(a) == set(b) and all(_equal(a[key], b[key]) for key in a)
+    if isinstance(a, (list, tuple)) and type(a) is type(b):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    return bool(a == b)
+
+
+class ExtremumResult(SolverResult):
+    """Result of ExtremumFinder; point is an array of variable values"""
+    __slots__ = ('point', 'value', 'iterations', 'converged', 'message', 'evaluations',
+                 'optima', 'starts')
+    _arrays = ('point',)
+
+
+class LinearSystemResult(SolverResult):
+    """Result of LinearSystemSolver; solution is an array, or None for singular systems"""
+    __slots__ = ('solution', 'is_singular', 'message')
+    _arrays = ('solution',)
+
+
+class DifferentialResult(SolverResult):
+    """Result of DifferentialEquationSolver; points is an (n, 2) array of (x, y) rows"""
+    __slots__ = ('points', 'method', 'step_size')
+    _arrays = ('points',)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.points[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.points[:, 1]
+
+
+class IntegralResult(SolverResult):
+    """Result of Integrator"""
+    __slots__ = ('value', 'segments', 'iterations', 'converged', 'method', 'bounds')
+
+
+class InterpolationResult(SolverResult):
+    """Result of Interpolator; function accepts floats and arrays"""
+    __slots__ = ('function', 'method', 'degree', 'segments')
@@ -0,0 +1,106 @@
+"""
+Sparse matrix helpers for finite-difference Hessians.
+Implements sparsity pattern normalization, greedy column coloring and a
+compact CSR (compressed sparse row) matrix.
+"""
+import numpy as np
+from typing import List, Set
+
+
+class CSRMatrix:
+    """Square sparse matrix in compressed sparse row format"""
+    __slots__ = ('indptr', 'indices', 'data', 'shape')
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (n, n)
+
+    @classmethod
+    def from_pattern(cls, pattern: List[Set[int]]) -> 'CSRMatrix':
+        """Create a zero-filled matrix with the given nonzero structure"""
+        n = len(pattern)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in pattern])
+        indices = np.fromiter((j for row in pattern for j in sorted(row)),
+                              dtype=np.int64, count=int(indptr[-1]))
+        return cls(indptr, indices, np.zeros(len(indices)), n)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries"""
+        return len(self.data)
+
+    def toarray(self) -> np.ndarray:
+        """Convert to a dense NumPy array"""
+        dense = np.zeros(self.shape)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+    def dot(self, vector) -> np.ndarray:
+        """Matrix-vector product"""
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        products = self.data * np.asarray(vector, dtype=float)[self.indices]
+        return np.bincount(rows, weights=products, minlength=self.shape[0])
+
+    def tolist(self) -> List[List[float]]:
+        """Convert to a dense list of lists"""
+        return self.toarray().tolist()
+
+
+def normalize_pattern(pattern, n: int) -> List[Set[int]]:
+    """
+    Convert a declared Hessian sparsity pattern to per-row sets of columns.
+
+    Args:
+        pattern: Boolean n x n matrix, or iterable of (row, column) pairs of
+            structurally nonzero entries
+        n: Number of variables
+
+    Returns:
+        Symmetric pattern including the diagonal
+    """
+    rows = [{i} for i in range(n)]
+    array = np.asarray(pattern)
+    if array.dtype == bool:
+        if array.shape != (n, n):
+            raise ValueError("Sparsity matrix must be square with one row per variable")
+        pairs = zip(*np.nonzero(array))
+    else:
+        pairs = pattern
+
+    for i, j in pairs:
+        i, j = int(i), int(j)
+        if not (0 <= i < n and 0 <= j < n):
+            raise ValueError("Sparsity pattern index out of range")
+        rows[i].add(j)
+        rows[j].add(i)
+    return rows
+
+
+def color_columns(pattern: List[Set[int]]) -> List[List[int]]:
+    """
+    Group columns that share no nonzero row (structurally orthogonal columns).
+
+    Uses greedy coloring in order of decreasing column degree. Columns in
+    the same group can be perturbed together in one finite-difference step.
+
+    Returns:
+        List of column groups, one per color
+    """
+    n = len(pattern)
+    color_of = [-1] * n
+    groups = []
+    for column in sorted(range(n), key=lambda j: -len(pattern[j])):
+        # Columns sharing a row with this one (distance-2 neighbours)
+        forbidden = {color_of[k] for row in pattern[column] for k in pattern[row]}
+        color = 0
+        while color in forbidden:
+            color += 1
+        color_of[column] = color
+        if color == len(groups):
+            groups.append([])
+        groups[color].append(column)
+    return groups
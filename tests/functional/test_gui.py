@@ -27,3 +27,87 @@ def test_invalid_function_creation(app):
     with pytest.raises(ValueError):
         app._create_function_from_string('__import__("os")', ['x'])
 
+
+
+def wait_for_solve(app, timeout=10):
+    import time
+    deadline = time.monotonic() + timeout
+    while app._job is not None and time.monotonic() < deadline:
+        app.root.update()
+        time.sleep(0.01)
+    assert app._job is None
+
+
+def test_solve_runs_in_background(app):
+    app.problem_var.set('integral')
+    app._update_input_fields()
+    app._solve_problem()
+    assert str(app.cancel_button['state']) == 'normal'
+    wait_for_solve(app)
+    assert 'Значение интеграла: 0.333333' in app.solution_text.get('1.0', tk.END)
+    assert str(app.solve_button['state']) == 'normal'
+
+
+def test_cancel_solve(app):
+    app.problem_var.set('differential')
+    app._update_input_fields()
+    app.x_end_entry.delete(0, tk.END)
+    app.x_end_entry.insert(0, '1e7')  # Far more steps than finish before the cancel
+    app._solve_problem()
+    app._cancel_solve()
+    wait_for_solve(app)
+    assert app.status_var.get() == 'Вычисление отменено'
+
+
+def test_large_trajectory_is_paginated(app):
+    app.problem_var.set('differential')
+    app._update_input_fields()
+    app.x_end_entry.delete(0, tk.END)
+    app.x_end_entry.insert(0, '1000')  # 10000 steps
+    app.equation_entry.delete(0, tk.END)
+    app.equation_entry.insert(0, '-y')
+    app.time_limit_var.set('')
+    app._solve_problem()
+    wait_for_solve(app)
+    assert app.result_view.table is not None and len(app.result_view.table) == 10001
+    assert int(app.solution_text.index('end-1c').split('.')[0]) < 20  # Summary only
+    app.result_view.show_page(1)
+    assert 'Стр. 2 из' in app.result_view.page_var.get()
+
+
+def test_interpolation_is_plotted(app):
+    app.problem_var.set('interpolation')
+    app._update_input_fields()
+    app._solve_problem()
+    wait_for_solve(app)
+    assert [kind for kind, _, _ in app.plot_panel.series] == ['function', 'points']
+    assert app.plot_panel.view is not None
+
+
+def test_expression_compiled_off_main_thread(app):
+    import threading
+    threads = []
+    create = app._create_function_from_string
+
+    def recording(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return create(*args, **kwargs)
+
+    app._create_function_from_string = recording
+    app.problem_var.set('integral')
+    app._update_input_fields()
+    app._solve_problem()
+    wait_for_solve(app)
+    assert threads and threading.main_thread() not in threads
+
+
+def test_integral_with_equal_bounds_is_plotted(app):
+    app.problem_var.set('integral')
+    app._update_input_fields()
+    app.upper_bound_entry.delete(0, tk.END)
+    app.upper_bound_entry.insert(0, '0')
+    with patch('tkinter.messagebox.showerror') as showerror:
+        app._solve_problem()
+        wait_for_solve(app)
+    showerror.assert_not_called()
+    assert 'Значение интеграла: 0.000000' in app.solution_text.get('1.0', tk.END)
@@ -0,0 +1,104 @@
+import pytest
+import io
+import json
+import multiprocessing
+import os
+import interfaces.batch
+from interfaces.batch import run_problem, run_batch, read_specs, main
+
+PROBLEMS = [
+    {'id': 'min', 'type': 'extremum', 'expression': '(x - 1)**2 + (y + 2)**2',
+     'variables': ['x', 'y'], 'start': [0, 0], 'method': 'bfgs'},
+    {'id': 'area', 'type': 'integral', 'expression': 'x**2', 'bounds': [0, 1], 'method': 'simpson'},
+    {'id': 'ode', 'type': 'differential', 'expression': 'x + y', 'x0': 0, 'y0': 1, 'x_end': 1,
+     'options': {'step_size': 0.05}},
+    {'id': 'linear', 'type': 'linear_system', 'matrix': [[2, 1], [1, 3]], 'vector': [4, 5]},
+    {'id': 'interp', 'type': 'interpolation', 'points': [[0, 0], [1, 1], [2, 4]], 'evaluate': [1.5]},
+]
+
+
+def test_run_problem_types():
+    records = {spec['id']: run_problem(spec) for spec in PROBLEMS}
+    assert all(record['status'] == 'ok' for record in records.values())
+    assert records['min']['result']['point'] == pytest.approx([1, -2], abs=1e-4)
+    assert records['area']['result']['value'] == pytest.approx(1 / 3)
+    assert records['ode']['result']['points'][-1][0] == pytest.approx(1.0)
+    assert records['linear']['result']['solution'][0] == pytest.approx(1.4)
+    assert records['interp']['result']['values'] == pytest.approx([2.25])
+    assert 'function' not in records['interp']['result']
+    assert all(record['elapsed'] >= 0 for record in records.values())
+    json.dumps(list(records.values()))
+
+
+def test_non_finite_results_are_null():
+    record = run_problem({'id': 'nan', 'type': 'integral', 'expression': 'x * nan',
+                          'bounds': [0, 1], 'method': 'simpson',
+                          'options': {'max_iterations': 2}})
+    assert record['status'] == 'ok'
+    assert record['result']['value'] is None
+    assert json.loads(json.dumps(record, allow_nan=False)) == record
+
+
+@pytest.mark.parametrize('spec, message', [
+    ({'id': 1, 'type': 'unknown'}, 'Unknown problem type'),
+    ({'id': 2, 'type': 'integral', 'expression': 'x'}, 'Missing field(s): bounds'),
+    ({'id': 3, 'type': 'integral', 'expression': 'x +', 'bounds': [0, 1]}, 'ExpressionError'),
+    ({'id': 4, 'type': 'linear_system', 'matrix': [[1]], 'vector': [1], 'options': {'_x': 1}},
+     'Unknown option: _x'),
+    ({'id': 5, 'type': 'linear_system', 'matrix': [[1]], 'vector': [1],
+      'options': {'matrix': [[2]]}}, 'Option matrix is set by the problem specification'),
+    ({'id': 6, 'type': 'integral', 'expression': 'x', 'bounds': [0, 1], 'method': 'simpson',
+      'options': {'method': 'monte_carlo'}}, 'Option method is set by the problem specification'),
+])
+def test_errors_are_reported(spec, message):
+    record = run_problem(spec)
+    assert record['id'] == spec['id']
+    assert record['status'] == 'error'
+    assert message in record['error']
+
+
+@pytest.mark.parametrize('workers, chunksize', [(1, 1), (2, 1), (2, 3)])
+def test_run_batch(workers, chunksize):
+    records = list(run_batch(PROBLEMS * 2, workers=workers, chunksize=chunksize, max_pending=2))
+    assert sorted(record['id'] for record in records) == sorted([spec['id'] for spec in PROBLEMS] * 2)
+    assert all(record['status'] == 'ok' for record in records)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="Workers must inherit the patched runner")
+def test_run_batch_survives_killed_worker(monkeypatch):
+    solve = interfaces.batch.run_problem
+
+    def crashing(spec, cache_path=None):
+        if spec['id'] == 'crash':
+            os._exit(1)  # Like a worker killed for running out of memory
+        return solve(spec, cache_path)
+
+    monkeypatch.setattr(interfaces.batch, 'run_problem', crashing)
+    crash = {'id': 'crash', 'type': 'linear_system', 'matrix': [[1]], 'vector': [1]}
+    records = list(run_batch([crash] + PROBLEMS * 2, workers=2, max_pending=1))
+    assert sorted(record['id'] for record in records) == \
+        sorted(['crash'] + [spec['id'] for spec in PROBLEMS] * 2)
+    failed = {record['id']: record for record in records if record['status'] == 'error'}
+    assert failed['crash']['error'].startswith('BrokenProcessPool')
+    # Problems submitted after the failure run on a new pool
+    assert records[-1]['status'] == 'ok'
+
+
+def test_read_specs():
+    stream = io.StringIO('{"type": "integral"}\n\n{not json\n{"id": "x"}\n')
+    specs = list(read_specs(stream))
+    assert [spec['id'] for spec in specs] == [1, 3, 'x']
+    assert run_problem(specs[1])['error'].startswith('ValueError: Invalid JSON')
+
+
+def test_command_line(tmp_path):
+    problems = tmp_path / 'problems.jsonl'
+    results = tmp_path / 'results.jsonl'
+    problems.write_text('\n'.join(json.dumps(spec) for spec in PROBLEMS) + '\n')
+    assert main([str(problems), '-o', str(results), '--workers', '1']) == 0
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert [record['id'] for record in records] == [spec['id'] for spec in PROBLEMS]
+
+    problems.write_text('{"type": "unknown"}\n')
+    assert main([str(problems), '-o', str(results), '--workers', '1']) == 1
@@ -0,0 +1,44 @@
+import json
+from benchmarks.suite import build_suite, run_suite, compare, main
+
+
+def test_suite_covers_every_solver():
+    names = [benchmark.name for benchmark in build_suite(quick=True)]
+    assert len(names) == len(set(names))
+    for prefix in ('linear_system', 'interpolation/spline', 'extremum/lbfgs',
+                   'integral/simpson', 'differential/rk4'):
+        assert any(name.startswith(prefix) for name in names)
+
+
+def test_measurements():
+    results = run_suite(build_suite(quick=True), repeat=1, pattern='differential/euler/step=0.1')
+    result = results['differential/euler/step=0.1']
+    assert result['evaluations'] == 20
+    assert result['time'] > 0
+    assert result['peak_memory'] > 0
+
+
+def test_compare():
+    baseline = {'a': {'time': 0.1, 'evaluations': 100, 'peak_memory': 1000}}
+    assert compare({'a': {'time': 0.11, 'evaluations': 100, 'peak_memory': 1000}}, baseline) == []
+    regressions = compare({'a': {'time': 0.2, 'evaluations': 150, 'peak_memory': 1000},
+                           'new': {'time': 1.0, 'evaluations': None, 'peak_memory': 1}}, baseline)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('a: time')
+    # Very short timings are not compared
+    assert compare({'a': {'time': 0.0009}}, {'a': {'time': 0.0001}}) == []
+
+
+def test_history_and_baseline(tmp_path):
+    history, baseline = tmp_path / 'history.json', tmp_path / 'baseline.json'
+    args = ['--quick', '--repeat', '1', '--filter', 'differential/rk4',
+            '--history', str(history), '--baseline', str(baseline)]
+    assert main(args + ['--save-baseline']) == 0
+    assert set(json.loads(baseline.read_text())) == {'differential/rk4/step=0.1', 'differential/rk4/step=0.01'}
+
+    data = json.loads(baseline.read_text())
+    for result in data.values():
+        result['evaluations'] //= 2  # Pretend the baseline needed half the evaluations
+    baseline.write_text(json.dumps(data))
+    assert main(args) == 1
+    assert len(json.loads(history.read_text())) == 2
@@ -1,4 +1,6 @@
 import pytest
+import subprocess
+import sys
 from interfaces.factory import MathSolverFactory
 
 
@@ -36,4 +38,30 @@ def test_factory_creation():
 
 def test_invalid_solver_type():
     with pytest.raises(ValueError, match="Unknown problem type"):
-        MathSolverFactory.create_solver('invalid_type')
\ No newline at end of file
+        MathSolverFactory.create_solver('invalid_type')
+
+
+def test_solver_modules_are_imported_on_first_use():
+    code = ("import sys; from interfaces.factory import MathSolverFactory; "
+            "assert 'solvers.integral' not in sys.modules and 'numpy' not in sys.modules; "
+            "MathSolverFactory.create_solver('linear_system', [[1]], [1]); "
+            "assert 'solvers.linear_system' in sys.modules and 'solvers.integral' not in sys.modules")
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_plugin_registration():
+    from solvers.linear_system import LinearSystemSolver
+
+    class TransposedSolver(LinearSystemSolver):
+        pass
+
+    MathSolverFactory.register('transposed', TransposedSolver)
+    MathSolverFactory.register('lazy_linear', 'solvers.linear_system:LinearSystemSolver')
+    try:
+        assert isinstance(MathSolverFactory.create_solver('transposed', [[1]], [1]), TransposedSolver)
+        assert MathSolverFactory.solver_class('lazy_linear') is LinearSystemSolver
+        assert {'transposed', 'lazy_linear'} <= set(MathSolverFactory.problem_types())
+    finally:
+        del MathSolverFactory._registry['transposed'], MathSolverFactory._registry['lazy_linear']
+    with pytest.raises(ValueError):
+        MathSolverFactory.register('broken', 'solvers.linear_system.LinearSystemSolver')
@@ -0,0 +1,72 @@
+import pytest
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from expressions.compiler import compile_expression
+from interfaces.factory import MathSolverFactory
+from interfaces.metrics import MetricsRegistry, Histogram
+from interfaces.service import SolveService
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry(trace_iterations=True)
+    registry.install()
+    yield registry
+    registry.uninstall()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.cumulative() == [('1', 2), ('10', 3), ('+Inf', 4)]
+    assert (histogram.count, histogram.sum) == (4, 56.5)
+
+
+def test_solves_are_aggregated(registry):
+    func = compile_expression('(x - 2)**2', ['x'])
+    for start in (0.0, 5.0):
+        MathSolverFactory.create_solver('extremum', func, ['x'], method='newton').solve([start])
+    MathSolverFactory.create_solver('integral', compile_expression('x', ['x'])).solve(0, 1)
+
+    text = registry.openmetrics()
+    assert text.endswith('# EOF\n')
+    assert 'solvers_created_total{problem_type="extremum"} 2' in text
+    assert 'solver_solves_total{solver="ExtremumFinder",method="newton",status="ok"} 2' in text
+    assert 'solver_latency_seconds_count{solver="ExtremumFinder",method="newton"} 2' in text
+    assert 'solver_latency_seconds_bucket{solver="Integrator",method="trapezoid",le="+Inf"} 1' in text
+    assert 'cache_hit_ratio{cache="expressions"}' in text
+
+
+def test_chrome_trace(registry, tmp_path):
+    finder = MathSolverFactory.create_solver('extremum', compile_expression('(x - 2)**2', ['x']),
+                                             ['x'], method='gradient')
+    finder.solve([0.0])
+    registry.write_chrome_trace(str(tmp_path / 'trace.json'))
+    events = json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+    solve = next(event for event in events if event['cat'] == 'solve')
+    assert solve['name'] == 'ExtremumFinder.gradient'
+    assert solve['ph'] == 'X' and solve['dur'] > 0
+    assert {'setup', 'iterations'} <= {event['name'] for event in events if event.get('cat') == 'phase'}
+    assert sum(event['name'] == 'iteration' for event in events) == solve['args']['iterations']
+
+
+def test_write_openmetrics(registry, tmp_path):
+    registry.observe_solve('Integrator', 'simpson', 0.002, evaluations=129, status='error')
+    path = tmp_path / 'solvers.prom'
+    registry.write_openmetrics(str(path))
+    text = path.read_text()
+    assert 'solver_solves_total{solver="Integrator",method="simpson",status="error"} 1' in text
+    assert 'solver_evaluations_bucket{solver="Integrator",method="simpson",le="1000.0"} 1' in text
+
+
+def test_service_metrics_endpoint():
+    async def scenario():
+        service = SolveService(executor=ThreadPoolExecutor(2), metrics=MetricsRegistry())
+        await service.solve({'type': 'integral', 'expression': 'x**2', 'bounds': [0, 1]})
+        return await service.handle_request('GET', '/metrics', b'')
+
+    status, text = asyncio.run(scenario())
+    assert status == 200
+    assert 'solver_solves_total{solver="Integrator",method="trapezoid",status="ok"} 1' in text
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+from interfaces.plot import MinMaxPyramid, FunctionSampler, _widen
+from solvers.interpolation import Interpolator
+
+
+@pytest.fixture
+def pyramid():
+    x = np.linspace(0, 100, 1_000_001)
+    y = np.sin(x)
+    y[500_000] = 5.0  # A single spike must survive decimation
+    return MinMaxPyramid(x, y)
+
+
+def test_decimation_preserves_extremes(pyramid):
+    xs, ys = pyramid.sample(0, 100, 500)
+    assert len(xs) <= 2 * 501
+    assert ys.max() == 5.0
+    assert ys.min() == pytest.approx(-1.0, abs=1e-6)
+    assert np.all(np.diff(xs) >= 0)
+
+
+def test_small_views_return_raw_points(pyramid):
+    xs, ys = pyramid.sample(50, 50.01, 500)
+    # About 101 points in the view and one neighbour on each side
+    assert xs[0] < 50 < 50.01 < xs[-1] and len(xs) <= 103
+    start = int(np.searchsorted(pyramid.x, xs[0]))
+    assert np.array_equal(ys, pyramid.y[start:start + len(xs)])
+
+
+def test_unsorted_and_nan_data():
+    pyramid = MinMaxPyramid([3.0, 2.0, 1.0, 0.0], [np.nan, 1.0, 2.0, 3.0])
+    assert pyramid.x.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert pyramid.bounds() == (0.0, 3.0, 1.0, 3.0)
+    assert pyramid.levels[-1][1].tolist() == [1.0]
+    with pytest.raises(ValueError):
+        MinMaxPyramid([0, 1], [0])
+
+
+def test_function_sampler_reuses_samples_on_pan():
+    xs = np.linspace(0, 10, 50)
+    spline = Interpolator(list(zip(xs.tolist(), np.sin(xs).tolist())), 'spline').solve()['function']
+    sampler = FunctionSampler(spline)
+    x, values = sampler.sample(0, 10, 100)
+    assert sampler.evaluations == len(x) == 101
+    assert values == pytest.approx(np.sin(x), abs=1e-2)  # Natural spline ends are less accurate
+
+    x, values = sampler.sample(1, 11, 100)  # Pan by ten columns
+    assert sampler.evaluations == 111
+    assert values == pytest.approx([spline(v) for v in x.tolist()])
+
+    x, values = sampler.sample(0, 5, 100)  # Zoom halves the step and keeps every other sample
+    assert sampler.evaluations == 111 + 50
+    assert values == pytest.approx([spline(v) for v in x.tolist()])
+
+    sampler.sample(1, 4, 50)  # Within a factor of two the grid is kept
+    assert sampler.evaluations == 161
+
+    x, values = sampler.sample(0, 20, 100)  # Zoom out keeps the samples on the coarser grid
+    assert sampler.evaluations == 161 + 75
+    assert values == pytest.approx([spline(v) for v in x.tolist()])
+
+
+def test_function_sampler_without_vectorization():
+    sampler = FunctionSampler(lambda x: 1 / x)
+    x, values = sampler.sample(-1, 1, 4)
+    assert np.isnan(values[x == 0]).all()
+    assert values[x == 1.0] == [1.0]
+
+
+def test_degenerate_ranges_are_widened():
+    # An integral with equal bounds or interpolation through one x value
+    assert _widen(1.0, 1.0) == (0.0, 2.0)
+    assert _widen(0.0, 1.0) == (0.0, 1.0)
+    sampler = FunctionSampler(lambda x: x)
+    with pytest.raises(ValueError, match="positive width"):
+        sampler.sample(1.0, 1.0, 500)
+    x, values = sampler.sample(*_widen(1.0, 1.0), 500)
+    assert x[0] == pytest.approx(0.0) and x[-1] == pytest.approx(2.0)
@@ -0,0 +1,120 @@
+import pytest
+import pickle
+import sqlite3
+import zlib
+import numpy as np
+from expressions.compiler import compile_expression
+from interfaces.batch import run_batch
+from interfaces.result_cache import ResultCache, solver_key
+from solvers.extremum import ExtremumFinder
+from solvers.integral import Integrator
+from solvers.results import ExtremumResult
+from solvers.interpolation import Interpolator
+
+
+def integrator(source='x**2', method='simpson'):
+    return Integrator(compile_expression(source, ['x']), method)
+
+
+def test_solver_key():
+    key = solver_key(integrator(), 0, 1)
+    assert key == solver_key(integrator('x ** 2'), 0, 1)
+    assert key != solver_key(integrator(), 0, 2)
+    assert key != solver_key(integrator(method='trapezoid'), 0, 1)
+    tighter = integrator()
+    tighter.precision = 1e-9
+    assert key != solver_key(tighter, 0, 1)
+    assert solver_key(Integrator(lambda x: x), 0, 1) is None
+
+
+def test_results_are_reused(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite'))
+    finder = ExtremumFinder(compile_expression('(x - 1)**2', ['x']), ['x'], method='newton')
+    first = cache.solve(finder, [0.0])
+    finder.evaluations = 123  # Run state does not change the key
+    second = cache.solve(finder, [0.0])
+    assert second == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Another process (or a later run) opening the same file sees the result
+    reopened = ResultCache(str(tmp_path / 'results.sqlite'))
+    assert reopened.get(solver_key(finder, [0.0])) == first
+
+
+def test_arrays_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite'))
+    assert cache.put('key', {'values': np.arange(5.0)})
+    assert np.array_equal(cache.get('key')['values'], np.arange(5.0))
+
+
+def test_typed_results_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite'))
+    result = ExtremumResult(point=[1.0, -2.0], value=0.0, iterations=np.int64(3), converged=True)
+    result['optima'] = [{'point': np.array([1.0, -2.0]), 'count': 2}]
+    result['bounds'] = (0, float('inf'))
+    assert cache.put('key', result)
+    stored = cache.get('key')
+    assert type(stored) is ExtremumResult
+    assert stored == result
+    assert type(stored['bounds']) is tuple
+
+
+class Exploit:
+    loaded = False
+
+    def __reduce__(self):
+        return setattr, (Exploit, 'loaded', True)
+
+
+def test_pickled_entries_are_not_loaded(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    cache = ResultCache(path)
+    payload = zlib.compress(pickle.dumps(Exploit()))
+    connection = sqlite3.connect(path)
+    connection.execute("INSERT INTO results VALUES ('key', ?, ?, 0)", (payload, len(payload)))
+    connection.commit()
+    connection.close()
+    assert cache.get('key') is None
+    assert not Exploit.loaded
+
+
+def test_unserializable_results_are_not_stored(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite'))
+    result = cache.solve(Interpolator([(0, 0), (1, 1)], 'lagrange'))
+    assert result['function'](0.5) == pytest.approx(0.5)
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite'), max_bytes=2500)
+    payload = lambda seed: {'values': np.random.default_rng(seed).random(100)}
+    cache.put('a', payload(0))
+    cache.put('b', payload(1))
+    cache.get('a')
+    cache.put('c', payload(2))  # Evicts 'b', the least recently used entry
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['bytes'] <= 2500
+
+
+def test_stored_size_is_tracked(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    cache = ResultCache(path, max_bytes=2500)
+    payload = lambda seed, n=100: {'values': np.random.default_rng(seed).random(n)}
+    for seed in range(6):
+        cache.put(str(seed % 4), payload(seed, 50 + 10 * seed))  # Replaces and evicts
+    connection = sqlite3.connect(path)
+    stored = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    connection.close()
+    assert cache.stats()['bytes'] == stored <= 2500
+    cache.clear()
+    assert cache.stats()['bytes'] == 0
+
+
+def test_batch_with_cache(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    specs = [{'id': i, 'type': 'integral', 'expression': 'x**2', 'bounds': [0, i + 1]} for i in range(4)]
+    first = sorted(run_batch(specs, workers=2, cache_path=path), key=lambda r: r['id'])
+    second = sorted(run_batch(specs, workers=2, cache_path=path), key=lambda r: r['id'])
+    assert [r['result'] for r in first] == [r['result'] for r in second]
+    assert ResultCache(path).stats()['entries'] == 4
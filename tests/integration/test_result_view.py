@@ -0,0 +1,36 @@
+import pytest
+import numpy as np
+from interfaces.result_view import ResultTable
+
+
+@pytest.fixture
+def table():
+    x = np.linspace(0, 1, 1001)
+    return ResultTable(['x', 'y'], list(zip(x.tolist(), (x ** 2).tolist())), page_size=100)
+
+
+def test_pages(table):
+    assert len(table) == 1001
+    assert table.pages == 11
+    lines = table.page_text(10).splitlines()
+    assert lines[0].split() == ['x', 'y']
+    assert [float(v) for v in lines[1].split()] == [1.0, 1.0]
+    assert len(table.page_text(0).splitlines()) == 101
+    with pytest.raises(ValueError):
+        table.page_text(11)
+
+
+def test_summary(table):
+    summary = table.summary()
+    assert summary['y'] == {'first': 0.0, 'last': 1.0, 'min': 0.0, 'max': 1.0}
+    assert table.summary_text().startswith('Строк: 1001\n')
+    assert ResultTable(['x'], []).summary() == {}
+
+
+def test_export(table, tmp_path):
+    table.export(str(tmp_path / 'points.csv'))
+    loaded = np.loadtxt(tmp_path / 'points.csv', delimiter=',', skiprows=1)
+    assert np.array_equal(loaded, table.data)
+    assert (tmp_path / 'points.csv').read_text().startswith('x,y\n')
+    table.export(str(tmp_path / 'points.npy'))
+    assert np.array_equal(np.load(tmp_path / 'points.npy'), table.data)
@@ -0,0 +1,119 @@
+import pytest
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from interfaces.service import SolveService, ServiceBusy, MAX_HEADER_COUNT
+
+SPEC = {'type': 'integral', 'expression': 'x**2', 'bounds': [0, 1], 'method': 'simpson'}
+
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = b'' if payload is None else (payload if isinstance(payload, bytes) else json.dumps(payload).encode())
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(data)
+
+
+def test_http_endpoints():
+    async def scenario():
+        service = SolveService(workers=2)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            status, record = await request(port, 'POST', '/solve', dict(SPEC, id=7))
+            assert status == 200
+            assert record['id'] == 7
+            assert record['result']['value'] == pytest.approx(1 / 3)
+
+            assert (await request(port, 'POST', '/solve', b'{not json'))[0] == 400
+            assert (await request(port, 'POST', '/solve', {'type': 'unknown'}))[0] == 400
+            assert (await request(port, 'POST', '/solve', dict(SPEC, expression='x +')))[0] == 400
+            assert (await request(port, 'GET', '/solve'))[0] == 405
+            assert (await request(port, 'GET', '/missing'))[0] == 404
+
+            status, health = await request(port, 'GET', '/health')
+            assert status == 200
+            assert health['computed'] == 1
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    asyncio.run(scenario())
+
+
+def test_oversized_headers_and_slow_clients():
+    async def scenario():
+        service = SolveService(executor=ThreadPoolExecutor(1), read_timeout=0.2)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            # Exactly the lines the server reads, so none are left unread at close
+            writer.write(b"GET /health HTTP/1.1\r\n" + b"X-Filler: 1\r\n" * (MAX_HEADER_COUNT + 1))
+            response = await reader.read()
+            writer.close()
+            assert response.startswith(b"HTTP/1.1 431 ")
+
+            # A client that stops sending is disconnected without a response
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\n")
+            assert await asyncio.wait_for(reader.read(), 5) == b''
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    asyncio.run(scenario())
+
+
+def test_validation_does_not_compile(monkeypatch):
+    import interfaces.batch
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Expression compiled during validation")
+
+    monkeypatch.setattr(interfaces.batch, 'cached_expression', fail)
+    SolveService.validate({'type': 'extremum', 'expression': '9**9**9 * x**2',
+                           'variables': ['x'], 'start': [1]})
+    with pytest.raises(ValueError, match="Invalid expression"):
+        SolveService.validate({'type': 'extremum', 'expression': '__import__("os")',
+                               'variables': ['x'], 'start': [1]})
+    with pytest.raises(ValueError, match="Missing field"):
+        SolveService.validate({'type': 'differential', 'expression': 'x'})
+
+
+def test_identical_requests_are_coalesced():
+    async def scenario():
+        service = SolveService(executor=ThreadPoolExecutor(2))
+        records = await asyncio.gather(*[service.solve(dict(SPEC, id=i)) for i in range(5)])
+        service.close()
+        return service, records
+
+    service, records = asyncio.run(scenario())
+    assert [record['id'] for record in records] == list(range(5))
+    assert len({record['result']['value'] for record in records}) == 1
+    assert service.stats['computed'] == 1
+    assert service.stats['coalesced'] == 4
+    assert service.health()['pending'] == 0
+
+
+def test_backpressure():
+    async def scenario():
+        service = SolveService(max_pending=1, executor=ThreadPoolExecutor(1))
+        other = dict(SPEC, bounds=[0, 2])
+        results = await asyncio.gather(service.solve(SPEC), service.solve(other),
+                                       return_exceptions=True)
+        service.close()
+        return service, results
+
+    service, results = asyncio.run(scenario())
+    assert results[0]['status'] == 'ok'
+    assert isinstance(results[1], ServiceBusy)
+    assert service.stats['rejected'] == 1
@@ -37,4 +37,13 @@ def test_interpolation_solver_integration():
         'interpolation', [(0, 0), (1, 1), (2, 4)], method='lagrange'
     )
     result = solver.solve()
-    assert abs(result['function'](1.5) - 2.25) < 1e-6
\ No newline at end of file
+    assert abs(result['function'](1.5) - 2.25) < 1e-6
+
+def test_extremum_nelder_mead_integration():
+    solver = MathSolverFactory.create_solver(
+        'extremum', lambda x, y: (x - 1)**2 + (y + 2)**2, ['x', 'y'], method='nelder_mead'
+    )
+    result = solver.solve([0.0, 0.0])
+    assert result['converged'] is True
+    assert abs(result['point'][0] - 1) < 1e-3
+    assert abs(result['point'][1] + 2) < 1e-3
@@ -0,0 +1,40 @@
+import pytest
+import subprocess
+import sys
+import main
+
+
+def test_fingerprint_tracks_sources(tmp_path):
+    (tmp_path / 'solvers').mkdir()
+    (tmp_path / 'solvers' / 'module.py').write_text('x = 1\n')
+    (tmp_path / 'solvers' / '__pycache__').mkdir()
+    (tmp_path / 'main.py').write_text('')
+    first = main.source_fingerprint(str(tmp_path))
+    (tmp_path / 'solvers' / '__pycache__' / 'module.pyc').write_bytes(b'ignored')
+    (tmp_path / 'solvers' / 'notes.md').write_text('ignored')
+    # Files outside the source paths, e.g. a virtual environment, are not read
+    (tmp_path / 'venv').mkdir()
+    (tmp_path / 'venv' / 'site.py').write_text('ignored')
+    assert main.source_fingerprint(str(tmp_path)) == first
+    (tmp_path / 'solvers' / 'module.py').write_text('x = 2\n')
+    second = main.source_fingerprint(str(tmp_path))
+    assert second != first
+    (tmp_path / 'main.py').write_text('import solvers\n')
+    assert main.source_fingerprint(str(tmp_path)) != second
+
+
+def test_self_tests_are_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'SELF_TEST_CACHE', str(tmp_path / 'selftest.json'))
+    runs = []
+    monkeypatch.setattr(main, 'run_tox_tests', lambda: runs.append(1) or True)
+    assert main.run_self_tests()
+    assert main.run_self_tests()
+    assert len(runs) == 1
+    assert main.run_self_tests(force=True)
+    assert len(runs) == 2
+
+
+def test_gui_imports_without_numpy():
+    pytest.importorskip('tkinter')
+    code = "import sys, interfaces.gui; assert 'numpy' not in sys.modules"
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -0,0 +1,98 @@
+import pytest
+import threading
+from interfaces.worker import BackgroundSolve, SolveCancelled
+from solvers.base import NULL_INSTRUMENTATION, SolverStatistics
+from solvers.differential import DifferentialEquationSolver
+from solvers.integral import Integrator
+
+
+def long_ode():
+    solver = DifferentialEquationSolver(lambda x, y: -y, 'euler')
+    solver.step_size = 1e-7  # Ten million steps
+    return solver
+
+
+def test_background_solve_completes():
+    solver = Integrator(lambda x: x ** 2, 'simpson')
+    statistics = SolverStatistics()
+    solver.instrumentation = statistics
+    job = BackgroundSolve(solver, 0, 1).start()
+    assert job.wait(10)
+    assert job.result()['value'] == pytest.approx(1 / 3)
+    assert job.progress[0] >= 1
+    # Events reached the solver's own instrumentation, which is restored
+    assert len(statistics.records) == 1
+    assert solver.instrumentation is statistics
+
+
+def test_cancel():
+    solver = long_ode()
+    job = BackgroundSolve(solver, 0.0, 1.0, 1.0).start()
+    job.cancel()
+    assert job.wait(10)
+    assert job.cancelled
+    with pytest.raises(SolveCancelled, match="cancelled"):
+        job.result()
+    assert solver.instrumentation is NULL_INSTRUMENTATION
+    assert 'instrumentation' not in vars(solver)
+
+
+def test_time_limit():
+    job = BackgroundSolve(long_ode(), 0.0, 1.0, 1.0, time_limit=0.05).start()
+    assert job.wait(10)
+    assert not job.cancelled
+    with pytest.raises(SolveCancelled, match="Time limit"):
+        job.result()
+    assert job.elapsed < 5
+
+
+def test_errors_are_raised_by_result():
+    job = BackgroundSolve(Integrator(lambda x: 1 / x, 'trapezoid'), 0, 1).start()
+    assert job.wait(10)
+    with pytest.raises(ZeroDivisionError):
+        job.result()
+    with pytest.raises(ValueError):
+        BackgroundSolve(long_ode(), time_limit=0)
+
+
+def test_setup_runs_on_worker_thread():
+    threads = []
+
+    def setup():
+        threads.append(threading.current_thread())
+        return Integrator(lambda x: x, 'trapezoid'), (0, 2)
+
+    job = BackgroundSolve(setup=setup).start()
+    assert job.wait(10)
+    assert job.result()['value'] == pytest.approx(2)
+    assert threads == [job._thread]
+    assert isinstance(job.solver, Integrator)
+
+
+def test_cancel_during_setup():
+    release = threading.Event()
+
+    def setup():
+        release.wait(10)  # Like compiling a slow expression
+        return long_ode(), (0.0, 1.0, 1.0)
+
+    job = BackgroundSolve(setup=setup, time_limit=60).start()
+    assert job.preparing
+    job.cancel()
+    release.set()
+    assert job.wait(10)
+    assert not job.preparing
+    with pytest.raises(SolveCancelled, match="cancelled"):
+        job.result()
+
+
+def test_setup_errors_and_arguments():
+    def setup():
+        raise ValueError("Invalid expression")
+
+    job = BackgroundSolve(setup=setup).start()
+    assert job.wait(10)
+    with pytest.raises(ValueError, match="Invalid expression"):
+        job.result()
+    with pytest.raises(ValueError, match="Either a solver or a setup"):
+        BackgroundSolve()
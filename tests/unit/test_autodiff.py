@@ -0,0 +1,73 @@
+import pytest
+import math
+import numpy as np
+from solvers import autodiff
+from solvers.autodiff import Dual, HyperDual
+from solvers.extremum import ExtremumFinder
+
+
+def test_dual_arithmetic():
+    x = Dual(3.0, np.array([1.0, 0.0]))
+    y = Dual(2.0, np.array([0.0, 1.0]))
+    result = (x * y - 1 / y + x ** 2) / 2
+    assert result.value == pytest.approx((6 - 0.5 + 9) / 2)
+    assert result.grad[0] == pytest.approx((2 + 6) / 2)
+    assert result.grad[1] == pytest.approx((3 + 1 / 4) / 2)
+
+
+def test_gradient_math_functions():
+    func = lambda x, y: autodiff.sin(x) * autodiff.exp(y) + autodiff.log(x * y) + autodiff.sqrt(y)
+    x, y = 0.7, 1.3
+    grad = autodiff.gradient(func, [x, y])
+    assert grad[0] == pytest.approx(math.cos(x) * math.exp(y) + 1 / x, rel=1e-14)
+    assert grad[1] == pytest.approx(math.sin(x) * math.exp(y) + 1 / y + 0.5 / math.sqrt(y), rel=1e-14)
+
+
+def test_math_functions_accept_plain_numbers():
+    assert autodiff.cos(0.0) == 1.0
+    assert autodiff.log(8, 2) == pytest.approx(3.0)
+
+
+def test_hessian_exact():
+    func = lambda x, y: x ** 3 * y + autodiff.cos(x * y) + 2 ** y
+    x, y = 0.5, 2.0
+    hessian = autodiff.hessian(func, [x, y])
+    assert hessian[0][0] == pytest.approx(6 * x * y - y * y * math.cos(x * y), rel=1e-14)
+    assert hessian[1][1] == pytest.approx(-x * x * math.cos(x * y) + math.log(2) ** 2 * 2 ** y, rel=1e-14)
+    mixed = 3 * x ** 2 - math.sin(x * y) - x * y * math.cos(x * y)
+    assert hessian[0][1] == pytest.approx(mixed, rel=1e-14)
+    assert hessian[1][0] == pytest.approx(mixed, rel=1e-14)
+
+
+def test_hyperdual_chain_rule():
+    x = HyperDual(0.5, 1.0, 1.0, 0.0)
+    result = autodiff.tanh(x)
+    assert result.eps1 == pytest.approx(1 - math.tanh(0.5) ** 2)
+    assert result.eps12 == pytest.approx(-2 * math.tanh(0.5) * (1 - math.tanh(0.5) ** 2))
+
+
+def test_constant_function():
+    assert autodiff.gradient(lambda x, y: 5.0, [1.0, 2.0]) == [0.0, 0.0]
+    assert autodiff.hessian(lambda x: 5.0, [1.0]) == [[0.0]]
+
+
+def test_extremum_automatic_gradient_descent():
+    solver = ExtremumFinder(lambda x, y: x ** 2 + y ** 2, ['x', 'y'], differentiation='automatic')
+    result = solver.solve([1.0, 1.0])
+    assert result['converged'] is True
+    assert result['point'] == pytest.approx([0.0, 0.0], abs=1e-4)
+
+
+@pytest.mark.parametrize('method', ['newton', 'bfgs', 'lbfgs'])
+def test_extremum_automatic_differentiation(method):
+    rosenbrock = lambda x, y: (1 - x) ** 2 + 100 * (y - x ** 2) ** 2
+    solver = ExtremumFinder(rosenbrock, ['x', 'y'], method=method, differentiation='automatic')
+    result = solver.solve([-1.2, 1.0])
+    assert result['converged'] is True
+    assert result['point'] == pytest.approx([1.0, 1.0], abs=1e-6)
+
+
+def test_extremum_invalid_differentiation():
+    solver = ExtremumFinder(lambda x: x ** 2, ['x'], differentiation='complex_step')
+    with pytest.raises(ValueError, match="Differentiation must be"):
+        solver.validate_input()
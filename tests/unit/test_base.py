@@ -1,5 +1,9 @@
 import pytest
-from solvers.base import MathSolver
+from solvers.base import MathSolver, SolverStatistics, NULL_INSTRUMENTATION
+from solvers.differential import DifferentialEquationSolver
+from solvers.extremum import ExtremumFinder
+from solvers.integral import Integrator
+from solvers.linear_system import LinearSystemSolver
 
 
 def test_math_solver_abstract_class():
@@ -20,4 +24,49 @@ def test_math_solver_subclass():
 
     solver = ConcreteSolver()
     assert solver.solve() == {"result": "test"}
-    assert solver.validate_input() is True
\ No newline at end of file
+    assert solver.validate_input() is True
+
+
+def test_instrumentation_disabled_by_default():
+    solver = Integrator(lambda x: x ** 2, 'simpson')
+    assert solver.instrumentation is NULL_INSTRUMENTATION
+    assert solver.solve(0, 1)['value'] == pytest.approx(1 / 3)
+    assert solver._record is None
+
+
+def test_solver_statistics():
+    iterations = []
+    statistics = SolverStatistics(callback=lambda i, point, error: iterations.append((i, error)))
+    func = lambda x, y: (x - 1) ** 2 + (y + 2) ** 2
+    solver = ExtremumFinder(func, ['x', 'y'], method='bfgs')
+    solver.instrumentation = statistics
+    result = solver.solve([0.0, 0.0])
+
+    assert solver.func is func  # Counting wrapper removed after the solve
+    record = statistics.records[-1]
+    assert (record.solver, record.method) == ('ExtremumFinder', 'bfgs')
+    assert record.iterations == result['iterations'] == len(iterations)
+    assert record.evaluations == result['evaluations']
+    assert iterations[-1][1] < solver.precision
+    phases = record.phases
+    assert phases['setup'] >= 0 and phases['iteration'] > 0
+    assert 0 < phases['evaluation'] <= record.elapsed
+    assert statistics.summary()['solves'] == 1
+
+
+def test_instrumentation_for_all_solvers():
+    statistics = SolverStatistics()
+    MathSolver.instrumentation = statistics
+    try:
+        DifferentialEquationSolver(lambda x, y: y, 'rk4').solve(0, 1, 1)
+        Integrator(lambda x: x, 'trapezoid').solve(0, 1)
+        LinearSystemSolver([[2.0]], [4.0]).solve()
+        with pytest.raises(ValueError):
+            Integrator(None).solve(0, 1)
+    finally:
+        MathSolver.instrumentation = NULL_INSTRUMENTATION
+    ode, integral, linear, failed = statistics.records
+    assert ode.evaluations == 4 * ode.iterations > 0  # Four stages per RK4 step
+    assert integral.iterations > 0 and integral.evaluations > 0
+    assert (linear.iterations, linear.evaluations) == (0, 0)
+    assert failed.error == 'ValueError'
@@ -0,0 +1,58 @@
+import pytest
+import threading
+from expressions.cache import ExpressionCache, normalize_source
+from expressions.compiler import ExpressionError
+
+
+def test_normalize_source():
+    assert normalize_source(' x**2 +(y) ') == normalize_source('x ** 2 + y')
+    assert normalize_source('x +') == 'x +'
+
+
+def test_hits_and_misses():
+    cache = ExpressionCache()
+    first = cache.get('x**2 + y', ['x', 'y'])
+    assert cache.get('x ** 2 + y', ['x', 'y']) is first
+    assert cache.get('x**2 + y', ['y', 'x']) is not first
+    assert cache.get('x**2 + y', ['x', 'y'], backend='numpy') is not first
+    assert cache.get('x**2 + y', ['x', 'y'], derivatives=True).gradient(1.0, 2.0) == [2.0, 1]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 4, 4)
+    assert stats['hit_rate'] == pytest.approx(0.2)
+
+
+def test_least_recently_used_eviction():
+    cache = ExpressionCache(maxsize=2)
+    a = cache.get('x', ['x'])
+    cache.get('x + 1', ['x'])
+    cache.get('x', ['x'])
+    cache.get('x + 2', ['x'])  # Evicts 'x + 1'
+    assert cache.get('x', ['x']) is a
+    assert cache.stats()['size'] == 2
+    cache.get('x + 1', ['x'])
+    assert cache.stats()['misses'] == 4
+
+
+def test_errors_are_not_cached():
+    cache = ExpressionCache()
+    with pytest.raises(ExpressionError):
+        cache.get('__import__("os")', ['x'])
+    assert cache.stats()['size'] == 0
+
+
+def test_concurrent_access():
+    cache = ExpressionCache(maxsize=8)
+    results = []
+
+    def worker():
+        for i in range(50):
+            results.append(cache.get(f'x * {i % 10}', ['x'])(2))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 200
+    assert sorted(set(results)) == [2 * i for i in range(10)]
+    assert cache.stats()['size'] <= 8
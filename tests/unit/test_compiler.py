@@ -0,0 +1,109 @@
+import pytest
+import math
+import numpy as np
+from expressions.compiler import compile_expression, parse_expression, ExpressionError
+from solvers.integral import Integrator
+from solvers.extremum import ExtremumFinder
+
+
+def test_compile_simple_expression():
+    func = compile_expression('x**2 + y', ['x', 'y'])
+    assert func(2, 3) == 7
+    assert func.source == 'x**2 + y'
+    assert func.variables == ('x', 'y')
+
+
+def test_math_functions_and_constants():
+    func = compile_expression('sin(x) * exp(y) + pi', ['x', 'y'])
+    assert func(0.5, 2.0) == pytest.approx(math.sin(0.5) * math.exp(2.0) + math.pi)
+
+
+def test_positional_parameters():
+    func = compile_expression('a - b', ['a', 'b'])
+    assert func.__code__.co_varnames[:2] == ('a', 'b')
+    assert func(b=1, a=3) == 2
+
+
+def test_conditional_expression():
+    func = compile_expression('x if x > 0 else -x', ['x'])
+    assert func(-2) == 2
+
+
+@pytest.mark.parametrize('source', [
+    '__import__("os")',
+    'x.__class__',
+    '[x for x in range(3)]',
+    'open("file")',
+    'lambda: 1',
+    '"text"',
+    'math.sin(x)',
+    'z + 1',
+    'sin(x=1)',
+])
+def test_disallowed_expressions(source):
+    with pytest.raises(ExpressionError):
+        compile_expression(source, ['x'])
+
+
+def test_syntax_error():
+    with pytest.raises(ExpressionError, match="Invalid syntax"):
+        compile_expression('x +', ['x'])
+
+
+@pytest.mark.parametrize('variables', [['x', 'x'], ['1x'], ['sin'], ['lambda'], ['__x']])
+def test_invalid_variables(variables):
+    with pytest.raises(ExpressionError):
+        parse_expression('1', variables)
+
+
+def test_expression_error_is_value_error():
+    with pytest.raises(ValueError):
+        compile_expression('y', ['x'])
+
+
+def test_numpy_backend_arrays():
+    func = compile_expression('sin(x) * y + log(8, 2)', ['x', 'y'], backend='numpy')
+    x = np.linspace(0, 1, 5)
+    assert func.vectorized is True
+    assert np.allclose(func(x, 2.0), np.sin(x) * 2 + 3)
+
+
+def test_numpy_backend_scalars():
+    func = compile_expression('sqrt(x) + gamma(x)', ['x'], backend='numpy')
+    assert func(4.0) == pytest.approx(2 + 6)
+    assert np.ndim(func(4.0)) == 0
+
+
+def test_numpy_backend_broadcasts_constants():
+    func = compile_expression('2 * pi', ['x'], backend='numpy')
+    assert func(np.zeros(3)).tolist() == [2 * math.pi] * 3
+
+
+def test_numpy_backend_conditionals():
+    func = compile_expression('x if 0 < x < 1 and not x == 0.5 else -1', ['x'], backend='numpy')
+    assert func(np.array([-1.0, 0.25, 0.5, 2.0])).tolist() == [-1, 0.25, -1, -1]
+    assert func(0.25) == 0.25
+
+
+def test_math_backend_is_not_vectorized():
+    assert compile_expression('x', ['x']).vectorized is False
+
+
+def test_unknown_backend():
+    with pytest.raises(ExpressionError, match="Unknown backend"):
+        compile_expression('x', ['x'], backend='torch')
+
+
+def test_vectorized_expression_in_solvers():
+    func = compile_expression('x**2', ['x'], backend='numpy')
+    np.random.seed(0)
+    monte_carlo = Integrator(func, 'monte_carlo')
+    monte_carlo.max_iterations = 16  # Sample count doubles every iteration
+    assert monte_carlo.solve(0, 1)['value'] == pytest.approx(1 / 3, abs=0.1)
+    assert Integrator(func, 'simpson').solve(0, 1)['value'] == pytest.approx(1 / 3)
+    assert Integrator(func, 'trapezoid').solve(0, 1)['value'] == pytest.approx(1 / 3, rel=1e-5)
+
+    objective = compile_expression('(x - 1)**2 + y**2', ['x', 'y'], backend='numpy')
+    finder = ExtremumFinder(objective, ['x', 'y'])
+    assert finder._batch_supported is True
+    assert finder.solve([0.0, 1.0])['point'] == pytest.approx([1.0, 0.0], abs=1e-4)
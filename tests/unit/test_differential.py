@@ -1,4 +1,6 @@
 import pytest
+import numpy as np
+from collections.abc import Mapping
 from math import isclose, exp
 from solvers.differential import DifferentialEquationSolver
 
@@ -70,12 +72,13 @@ class TestDifferentialEquationSolver:
         solver = DifferentialEquationSolver(self.exponential_equation)
         result = solver.solve(0, 1, 0.5)
 
-        assert isinstance(result, dict)
+        assert isinstance(result, Mapping)
         assert 'points' in result
         assert 'method' in result
         assert 'step_size' in result
-        assert isinstance(result['points'], list)
-        assert all(isinstance(p, tuple) and len(p) == 2 for p in result['points'])
+        assert isinstance(result['points'], np.ndarray)
+        assert result['points'].shape == (6, 2)
+        assert np.array_equal(result.x, result['points'][:, 0])
 
     def test_step_size_adjustment(self):
         """Test that step size is adjusted to not overshoot x_end"""
@@ -1,5 +1,8 @@
 import pytest
 import math
+import time
+import numpy as np
+from solvers.base import SolverStatistics
 from solvers.extremum import ExtremumFinder
 
 
@@ -48,4 +51,323 @@ def test_compute_hessian(quadratic_func):
     assert len(hessian[0]) == 2
     assert math.isclose(hessian[0][0], 2.0, abs_tol=1e-2)
     assert math.isclose(hessian[1][1], 2.0, abs_tol=1e-2)
-    assert math.isclose(hessian[0][1], 0.0, abs_tol=1e-2)
\ No newline at end of file
+    assert math.isclose(hessian[0][1], 0.0, abs_tol=1e-2)
+
+def test_compute_gradient_vectorized():
+    calls = []
+
+    def func(x, y):
+        calls.append(x)
+        return np.sin(x) + y ** 2
+
+    solver = ExtremumFinder(func, ['x', 'y'])
+    grad = solver._compute_gradient([0.0, 2.0])
+    assert len(calls) == 1
+    assert solver._batch_supported is True
+    assert math.isclose(grad[0], 1.0, abs_tol=1e-4)
+    assert math.isclose(grad[1], 4.0, abs_tol=1e-4)
+
+
+def test_compute_gradient_scalar_fallback():
+    solver = ExtremumFinder(lambda x, y: math.sin(x) + y ** 2, ['x', 'y'])
+    grad = solver._compute_gradient([0.0, 2.0])
+    assert solver._batch_supported is False
+    assert math.isclose(grad[0], 1.0, abs_tol=1e-4)
+    assert math.isclose(grad[1], 4.0, abs_tol=1e-4)
+
+
+def test_compute_gradient_forced_scalar(quadratic_func):
+    solver = ExtremumFinder(quadratic_func, ['x', 'y'], vectorized=False)
+    grad = solver._compute_gradient([1.0, 2.0])
+    assert solver._batch_supported is False
+    assert math.isclose(grad[1], 4.0, abs_tol=1e-4)
+
+
+def test_newton_method_rosenbrock():
+    rosenbrock = lambda x, y: (1 - x) ** 2 + 100 * (y - x ** 2) ** 2
+    solver = ExtremumFinder(rosenbrock, ['x', 'y'], method='newton')
+    result = solver.solve([-1.2, 1.0])
+    assert result['converged'] is True
+    assert result['iterations'] < 50
+    assert math.isclose(result['point'][0], 1, abs_tol=1e-4)
+    assert math.isclose(result['point'][1], 1, abs_tol=1e-4)
+
+
+def test_newton_direction_indefinite_hessian():
+    hessian = np.array([[1.0, 0.0], [0.0, -2.0]])
+    grad = np.array([1.0, 1.0])
+    direction = ExtremumFinder._newton_direction(hessian, grad)
+    assert np.dot(grad, direction) < 0
+
+
+def test_newton_stops_at_edge_of_nan_region():
+    # sqrt is NaN for negative x, and the minimum lies on that boundary
+    func = lambda x, y: float(np.sqrt(x)) + y ** 2
+    solver = ExtremumFinder(func, ['x', 'y'], method='newton')
+    with np.errstate(invalid='ignore'):
+        result = solver.solve([0.3, 1.0])
+    assert result['converged'] is False
+    assert result['message'] in ('Line search failed', 'Non-finite derivatives')
+    assert np.all(np.isfinite(result['point']))
+    assert math.isfinite(result['value'])
+    assert result['evaluations'] < 1000
+
+
+def test_newton_direction_matches_dense_solve():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(6, 6))
+    hessian = a @ a.T + 6 * np.eye(6)
+    grad = rng.normal(size=6)
+    direction = ExtremumFinder._newton_direction(hessian, grad)
+    assert np.allclose(direction, np.linalg.solve(hessian, -grad))
+
+
+def rosenbrock(x, y):
+    return (1 - x) ** 2 + 100 * (y - x ** 2) ** 2
+
+
+@pytest.mark.parametrize('method', ['bfgs', 'lbfgs'])
+def test_quasi_newton_rosenbrock(method):
+    solver = ExtremumFinder(rosenbrock, ['x', 'y'], method=method)
+    result = solver.solve([-1.2, 1.0])
+    assert result['converged'] is True
+    assert result['iterations'] < 40
+    assert math.isclose(result['point'][0], 1, abs_tol=1e-4)
+    assert math.isclose(result['point'][1], 1, abs_tol=1e-4)
+
+
+def test_lbfgs_high_dimensional():
+    n = 200
+    weights = np.arange(1, n + 1)
+
+    def func(*x):
+        return sum(w * (xi - 1) ** 2 for w, xi in zip(weights, x))
+
+    solver = ExtremumFinder(func, [f'x{i}' for i in range(n)], method='lbfgs')
+    solver.memory = 5
+    result = solver.solve([0.0] * n)
+    assert result['converged'] is True
+    assert np.allclose(result['point'], 1.0, atol=1e-4)
+
+
+def test_invalid_method(quadratic_func):
+    solver = ExtremumFinder(quadratic_func, ['x', 'y'], method='simplex')
+    with pytest.raises(ValueError, match="Method must be"):
+        solver.validate_input()
+
+
+def double_well(x, y):
+    return (x ** 2 - 1) ** 2 + y ** 2
+
+
+def test_multistart_distinct_optima():
+    solver = ExtremumFinder(double_well, ['x', 'y'], method='bfgs')
+    result = solver.solve_multistart(bounds=[(-2, 2.5), (-1, 1)], n_starts=8, workers=2)
+    assert result['starts'] == 8
+    assert math.isclose(result['value'], 0, abs_tol=1e-8)
+    minima = sorted(round(opt['point'][0]) for opt in result['optima'])
+    assert minima == [-1, 1]
+    assert sum(opt['count'] for opt in result['optima']) == 8
+
+
+def test_multistart_early_stop():
+    solver = ExtremumFinder(double_well, ['x', 'y'], method='bfgs')
+    result = solver.solve_multistart([[2.0, 1.0], [-2.0, 1.0], [1.5, 0.5]], workers=1, target=1e-6)
+    assert result['starts'] == 1
+    assert math.isclose(result['point'][0], 1, abs_tol=1e-4)
+
+
+def slow_left_valley(x, y):
+    if x < 0:
+        time.sleep(0.05)
+    return (x - 1) ** 2 + 10 * (y - x ** 2) ** 2
+
+
+def test_multistart_target_stops_running_searches():
+    solver = ExtremumFinder(slow_left_valley, ['x', 'y'], method='nelder_mead')
+    start = time.perf_counter()
+    result = solver.solve_multistart([[1.0, 1.0], [-3.0, 5.0]], workers=2, target=1e-6)
+    # The search from the left half needs seconds to finish on its own
+    assert time.perf_counter() - start < 1.5
+    assert result['starts'] == 1
+    assert result['value'] == 0
+
+
+def test_multistart_budget_exhausted_before_evaluation():
+    solver = ExtremumFinder(double_well, ['x', 'y'], method='gradient')
+    solver.max_evaluations = 3
+    with pytest.raises(ValueError, match="Evaluation budget exhausted"):
+        solver.solve_multistart([[2.0, 1.0], [-2.0, 1.0]], workers=1, target=1e-6)
+
+
+def test_multistart_requires_picklable_function():
+    solver = ExtremumFinder(lambda x: x ** 2, ['x'])
+    with pytest.raises(ValueError, match="picklable"):
+        solver.solve_multistart([[1.0], [2.0]], workers=2)
+    assert solver.solve_multistart([[1.0], [2.0]], workers=1)['starts'] == 2
+
+
+def test_evaluation_counter_and_cache():
+    calls = []
+
+    def func(x, y):
+        calls.append((x, y))
+        return math.sin(x) + (y - 1) ** 2
+
+    solver = ExtremumFinder(func, ['x', 'y'], method='newton')
+    solver._compute_hessian([0.5, 0.5])
+    # f(x) is evaluated once instead of once per diagonal entry
+    assert calls.count((0.5, 0.5)) == 1
+    assert solver.evaluations == len(calls) == len(set(calls))
+
+    result = solver.solve([0.0, 0.0])
+    assert result['evaluations'] == solver.evaluations
+    assert result['evaluations'] > 0
+
+
+def test_max_evaluations_budget(quadratic_func):
+    solver = ExtremumFinder(quadratic_func, ['x', 'y'], vectorized=False)
+    solver.max_evaluations = 50
+    result = solver.solve([1.0, 1.0])
+    assert result['converged'] is False
+    assert result['evaluations'] <= 50
+    assert result['message'] == 'Evaluation budget exhausted'
+    assert result['value'] == quadratic_func(*result['point'])
+    assert result['value'] < quadratic_func(1.0, 1.0)
+
+
+def chain_func(*x):
+    return sum((x[i] - x[i + 1]) ** 2 for i in range(len(x) - 1)) + sum(xi ** 4 for xi in x)
+
+
+def chain_hessian(x):
+    n = len(x)
+    expected = np.zeros((n, n))
+    for i in range(n - 1):
+        expected[i, i] += 2
+        expected[i + 1, i + 1] += 2
+        expected[i, i + 1] = expected[i + 1, i] = -2
+    expected[np.diag_indices(n)] += 12 * np.asarray(x) ** 2
+    return expected
+
+
+@pytest.mark.parametrize('sparsity', ['declared', 'detect'])
+def test_sparse_hessian(sparsity):
+    n = 20
+    point = list(np.linspace(-1, 1, n))
+    solver = ExtremumFinder(chain_func, [f'x{i}' for i in range(n)], method='newton')
+    if sparsity == 'declared':
+        solver.hessian_sparsity = [(i, i + 1) for i in range(n - 1)]
+    else:
+        solver.hessian_sparsity = 'detect'
+
+    solver._compute_sparse_hessian(point)
+    solver.evaluations = 0
+    hessian = solver._compute_sparse_hessian(point)
+    assert hessian.nnz == 3 * n - 2
+    assert np.allclose(hessian.toarray(), chain_hessian(point), atol=1e-5)
+    # Three colors, two gradients of 2n evaluations each
+    assert solver.evaluations == 3 * 2 * 2 * n
+
+
+def test_detected_sparsity_keeps_entries_zero_at_start():
+    # The cross term of x²y² vanishes at the origin but not elsewhere
+    func = lambda x, y, z: x ** 2 * y ** 2 + z ** 2
+    solver = ExtremumFinder(func, ['x', 'y', 'z'], method='newton')
+    solver.hessian_sparsity = 'detect'
+    pattern, _ = solver._hessian_structure([0.0, 0.0, 0.0])
+    assert 1 in pattern[0] and 0 in pattern[1]
+    assert pattern[2] == {2}
+
+    # A new function is detected again instead of reusing the cached pattern
+    solver.func = lambda x, y, z: x ** 2 + y ** 2 + z ** 2
+    pattern, _ = solver._hessian_structure([0.0, 0.0, 0.0])
+    assert [sorted(row) for row in pattern] == [[0], [1], [2]]
+
+
+def test_detected_sparsity_reused_by_instrumented_solves():
+    n = 10
+    solver = ExtremumFinder(chain_func, [f'x{i}' for i in range(n)], method='newton')
+    solver.hessian_sparsity = 'detect'
+    solver.instrumentation = SolverStatistics()
+    first = solver.solve([1.0] * n)['evaluations']
+    structure = solver._sparsity
+    assert structure[0][1] is chain_func
+    second = solver.solve([1.0] * n)['evaluations']
+    assert solver._sparsity is structure
+    assert second < first
+
+
+def test_newton_with_sparse_hessian():
+    n = 10
+    solver = ExtremumFinder(chain_func, [f'x{i}' for i in range(n)], method='newton')
+    solver.hessian_sparsity = [(i, i + 1) for i in range(n - 1)]
+    result = solver.solve([1.0] * n)
+    assert result['converged'] is True
+    assert np.allclose(result['point'], 0, atol=1e-2)
+
+
+def ill_conditioned(x, y):
+    return 0.5 * x ** 2 + 25 * y ** 2
+
+
+@pytest.mark.parametrize('step_rule, max_iterations', [
+    ('armijo', 350),
+    ('wolfe', 5),
+    ('barzilai_borwein', 10),
+    ('momentum', 300),
+    ('nesterov', 220),
+])
+def test_gradient_step_rules(step_rule, max_iterations):
+    solver = ExtremumFinder(ill_conditioned, ['x', 'y'])
+    solver.step_rule = step_rule
+    result = solver.solve([3.0, 1.0])
+    assert result['converged'] is True
+    assert result['iterations'] <= max_iterations
+    assert result['point'] == pytest.approx([0.0, 0.0], abs=1e-5)
+
+
+def test_gradient_step_rule_faster_than_fixed():
+    fixed = ExtremumFinder(ill_conditioned, ['x', 'y']).solve([3.0, 1.0])
+    solver = ExtremumFinder(ill_conditioned, ['x', 'y'])
+    solver.step_rule = 'barzilai_borwein'
+    adaptive = solver.solve([3.0, 1.0])
+    assert adaptive['iterations'] < fixed['iterations']
+
+
+def test_invalid_step_rule(quadratic_func):
+    solver = ExtremumFinder(quadratic_func, ['x', 'y'])
+    solver.step_rule = 'adam'
+    with pytest.raises(ValueError, match="Step rule must be"):
+        solver.solve([1.0, 1.0])
+
+
+def test_nelder_mead_rosenbrock():
+    solver = ExtremumFinder(rosenbrock, ['x', 'y'], method='nelder_mead')
+    solver.precision = 1e-10
+    result = solver.solve([-1.2, 1.0])
+    assert result['converged'] is True
+    assert result['point'] == pytest.approx([1.0, 1.0], abs=1e-4)
+    # Roughly one to two evaluations per iteration
+    assert result['evaluations'] < 2.5 * result['iterations']
+
+
+def test_nelder_mead_higher_dimension():
+    n = 8
+    func = lambda *x: sum((i + 1) * (xi - 1) ** 2 for i, xi in enumerate(x))
+    solver = ExtremumFinder(func, [f'x{i}' for i in range(n)], method='nelder_mead')
+    solver.max_iterations = 5000
+    solver.precision = 1e-10
+    result = solver.solve([0.0] * n)
+    assert result['converged'] is True
+    assert np.allclose(result['point'], 1.0, atol=1e-3)
+
+
+def test_nelder_mead_noisy_with_budget():
+    rng = np.random.default_rng(0)
+    noisy = lambda x, y: (x - 2) ** 2 + (y + 1) ** 2 + 1e-6 * rng.standard_normal()
+    solver = ExtremumFinder(noisy, ['x', 'y'], method='nelder_mead')
+    solver.max_evaluations = 200
+    result = solver.solve([0.0, 0.0])
+    assert result['evaluations'] <= 200
+    assert result['point'] == pytest.approx([2.0, -1.0], abs=1e-2)
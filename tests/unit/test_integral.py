@@ -1,5 +1,6 @@
 import pytest
 import numpy as np
+from collections.abc import Mapping
 from math import sin, pi, exp
 from solvers.integral import Integrator
 
@@ -73,7 +74,7 @@ class TestIntegrator:
         integrator = Integrator(self.linear_func)
         result = integrator.solve(0, 1)
 
-        assert isinstance(result, dict)
+        assert isinstance(result, Mapping)
         assert 'value' in result
         assert 'method' in result
         assert 'segments' in result
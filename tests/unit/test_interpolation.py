@@ -48,4 +48,17 @@ def test_spline_interpolation(sample_points):
     assert callable(result['function'])
     assert result['method'] == 'Cubic Spline'
     assert result['segments'] == 2
-    assert result['function'](1.5) == pytest.approx(2.3125)
\ No newline at end of file
+    assert result['function'](1.5) == pytest.approx(2.3125)
+
+@pytest.mark.parametrize('method', ['lagrange', 'newton', 'spline'])
+def test_array_evaluation(method):
+    import numpy as np
+    xs = np.linspace(0, 3, 8)
+    points = list(zip(xs.tolist(), np.cos(xs).tolist()))
+    function = Interpolator(points, method=method).solve()['function']
+    assert function.vectorized
+    x = np.concatenate((np.linspace(-0.5, 3.5, 41), xs))  # Includes extrapolation and the nodes
+    values = function(x)
+    assert values.shape == x.shape
+    assert values == pytest.approx([function(float(v)) for v in x], rel=1e-9, abs=1e-12)
+    assert values[-len(xs):] == pytest.approx(np.cos(xs))
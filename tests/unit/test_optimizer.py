@@ -0,0 +1,74 @@
+import pytest
+import ast
+import math
+import numpy as np
+from expressions.compiler import compile_expression, parse_expression
+from expressions.optimizer import fold_constants, expand_powers, eliminate_common_subexpressions
+
+
+def fold(source, variables=('x', 'y')):
+    return ast.unparse(fold_constants(parse_expression(source, list(variables)).body, variables))
+
+
+def test_fold_constants():
+    assert fold('exp(2*pi)') == repr(math.exp(2 * math.pi))
+    assert fold('x * (2 + 3) - -1') == 'x * 5 - -1'
+    assert fold('x if 1 < 2 else y') == 'x'
+
+
+def test_variables_shadow_constants():
+    assert fold('e * 2', ['e']) == 'e * 2'
+
+
+def test_unsafe_operations_are_not_folded():
+    assert fold('1 / 0 + x') == '1 / 0 + x'
+    assert fold('exp(1000)') == 'exp(1000)'
+    assert fold('sqrt(-1)') == 'sqrt(-1)'
+
+
+@pytest.mark.parametrize('source', ['9**9**9', '2**20000', '10**10**6'])
+def test_huge_integer_powers_are_not_folded(source):
+    # Compiles immediately; evaluation overflows in floating point
+    func = compile_expression(f'x + {source}', ['x'])
+    with pytest.raises(OverflowError):
+        func(1.0)
+
+
+def test_integer_folding_within_limit():
+    assert fold('2**100 + x') == f'{2 ** 100} + x'
+    assert fold('2**5000 + x') == '2.0 ** 5000.0 + x'
+
+
+@pytest.mark.parametrize('source', ['factorial(3000000)', 'comb(10**7, 5*10**6)',
+                                    'perm(10**6)', 'lcm(2**4000 + 1, 2**4000 - 1)'])
+def test_huge_integer_calls_are_not_folded(source):
+    assert fold(f'{source} + x').startswith(source.split('(')[0] + '(')
+
+
+def test_integer_calls_folded_within_limit():
+    assert fold('factorial(20) + x') == f'{math.factorial(20)} + x'
+    assert fold('comb(100, 50) + x') == f'{math.comb(100, 50)} + x'
+
+
+def test_expand_powers():
+    tree = parse_expression('x**3 + y**2.5', ['x', 'y']).body
+    assert ast.unparse(expand_powers(tree)) == 'x * x * x + y ** 2.5'
+
+
+def test_common_subexpressions():
+    tree = parse_expression('sin(x*y) + cos(x*y)', ['x', 'y']).body
+    statements, body = eliminate_common_subexpressions(tree)
+    assert statements == ['_t0 = x * y']
+    assert ast.unparse(body) == 'sin(_t0) + cos(_t0)'
+
+
+@pytest.mark.parametrize('backend', ['math', 'numpy'])
+def test_optimized_compilation(backend):
+    source = 'sin(x*y)**2 + cos(x*y)**2 * exp(2*pi)'
+    func = compile_expression(source, ['x', 'y'], backend=backend)
+    expected = lambda x, y: math.sin(x * y) ** 2 + math.cos(x * y) ** 2 * math.exp(2 * math.pi)
+    assert '_t0' in func.__code__.co_varnames
+    assert func(0.3, 1.7) == pytest.approx(expected(0.3, 1.7))
+    if backend == 'numpy':
+        xs = np.linspace(0, 1, 5)
+        assert np.allclose(func(xs, 2.0), [expected(x, 2.0) for x in xs])
@@ -0,0 +1,70 @@
+import pytest
+import pickle
+import numpy as np
+from solvers.differential import DifferentialEquationSolver
+from solvers.extremum import ExtremumFinder
+from solvers.linear_system import LinearSystemSolver
+from solvers.results import DifferentialResult, IntegralResult, LinearSystemResult
+
+
+def test_dictionary_access():
+    result = IntegralResult(value=1.5, method='Simpson')
+    assert result['value'] == 1.5 and result.value == 1.5
+    assert 'segments' not in result
+    assert result.get('segments') is None
+    with pytest.raises(KeyError):
+        result['segments']
+    result['segments'] = 8
+    result['note'] = 'extra keys are kept'
+    assert dict(result) == {'value': 1.5, 'method': 'Simpson', 'segments': 8,
+                            'note': 'extra keys are kept'}
+    assert len(result) == 4
+    del result['note']
+    assert result == {'value': 1.5, 'method': 'Simpson', 'segments': 8}
+    with pytest.raises(AttributeError):
+        result.unknown = 1  # Slots only
+
+
+def test_array_payloads():
+    result = LinearSystemSolver([[2, 1], [1, 3]], [4, 5]).solve()
+    assert isinstance(result, LinearSystemResult)
+    assert isinstance(result['solution'], np.ndarray)
+    assert result['solution'] == pytest.approx([1.4, 1.2])
+    assert result == result.copy()
+    changed = result.copy()
+    changed['solution'] = [0.0, 0.0]
+    assert result != changed
+    singular = LinearSystemSolver([[1, 2], [2, 4]], [1, 2]).solve()
+    assert singular['solution'] is None
+    assert singular != result
+
+
+def test_pickle_out_of_band():
+    solver = DifferentialEquationSolver(lambda x, y: y, 'rk4')
+    solver.step_size = 1e-3
+    result = solver.solve(0.0, 1.0, 1.0)
+    buffers = []
+    data = pickle.dumps(result, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1  # The points array travels outside the pickle stream
+    assert len(data) < 500
+    restored = pickle.loads(data, buffers=buffers)
+    assert isinstance(restored, DifferentialResult)
+    assert restored == result
+    assert restored.y[-1] == pytest.approx(np.e)
+    # Without a buffer callback everything is in band
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def double_well(x, y):
+    return (x ** 2 - 1) ** 2 + y ** 2
+
+
+def test_multistart_round_trip_equality():
+    solver = ExtremumFinder(double_well, ['x', 'y'], method='bfgs')
+    result = solver.solve_multistart([[2.0, 1.0], [-2.0, 1.0], [1.5, 0.5]], workers=1)
+    assert all(isinstance(optimum['point'], np.ndarray) for optimum in result['optima'])
+    restored = pickle.loads(pickle.dumps(result, protocol=5))
+    assert restored == result
+    assert result == result.copy()
+    restored['optima'][0]['point'] = restored['optima'][0]['point'] + 1
+    assert restored != result
@@ -0,0 +1,40 @@
+import pytest
+import numpy as np
+from solvers.sparsity import CSRMatrix, normalize_pattern, color_columns
+
+
+def test_normalize_pattern_pairs():
+    pattern = normalize_pattern([(0, 1), (2, 3)], 4)
+    assert pattern == [{0, 1}, {0, 1}, {2, 3}, {2, 3}]
+
+
+def test_normalize_pattern_matrix():
+    matrix = np.eye(3, dtype=bool)
+    matrix[0, 2] = True
+    assert normalize_pattern(matrix, 3) == [{0, 2}, {1}, {0, 2}]
+
+
+def test_normalize_pattern_out_of_range():
+    with pytest.raises(ValueError, match="out of range"):
+        normalize_pattern([(0, 5)], 3)
+
+
+def test_color_tridiagonal():
+    n = 30
+    pattern = normalize_pattern([(i, i + 1) for i in range(n - 1)], n)
+    groups = color_columns(pattern)
+    assert len(groups) == 3
+    assert sorted(j for group in groups for j in group) == list(range(n))
+    for group in groups:
+        for row in pattern:
+            assert len(row.intersection(group)) <= 1
+
+
+def test_csr_matrix():
+    pattern = [{0, 1}, {0, 1, 2}, {1, 2}]
+    matrix = CSRMatrix.from_pattern(pattern)
+    matrix.data = np.arange(1.0, 8.0)
+    dense = matrix.toarray()
+    assert matrix.nnz == 7
+    assert dense.tolist() == [[1, 2, 0], [3, 4, 5], [0, 6, 7]]
+    assert matrix.dot([1, 1, 1]).tolist() == [3, 12, 13]
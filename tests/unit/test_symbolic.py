@@ -0,0 +1,105 @@
+import pytest
+import ast
+import math
+from expressions.compiler import parse_expression, ExpressionError
+from expressions.symbolic import (derivative, simplify, compile_with_derivatives,
+                                  compile_jacobian, compile_outputs)
+from solvers.extremum import ExtremumFinder
+
+
+def d(source, var, variables=('x', 'y')):
+    return ast.unparse(derivative(parse_expression(source, list(variables)).body, var))
+
+
+def test_simple_derivatives():
+    assert d('x**2', 'x') == '2 * x'
+    assert d('3*x + y', 'x') == '3'
+    assert d('x*y', 'y') == 'x'
+    assert d('y', 'x') == '0'
+
+
+def test_simplify():
+    tree = parse_expression('0*x + 1*y + x**1 - (2 + 3) + -(-x)', ['x', 'y']).body
+    assert ast.unparse(simplify(tree)) == 'y + x - 5 + x'
+
+
+def test_negative_constants_keep_precedence():
+    tree = parse_expression('(1 - 3) ** x', ['x']).body
+    assert ast.unparse(simplify(tree)) == '(-2) ** x'
+
+
+@pytest.mark.parametrize('source, expected', [
+    ('sin(x) * exp(y)', lambda x, y: (math.cos(x) * math.exp(y), math.sin(x) * math.exp(y))),
+    ('log(x*y) + sqrt(x)', lambda x, y: (1 / x + 0.5 / math.sqrt(x), 1 / y)),
+    ('x**y', lambda x, y: (y * x ** (y - 1), x ** y * math.log(x))),
+    ('atan2(y, x)', lambda x, y: (-y / (x * x + y * y), x / (x * x + y * y))),
+    ('log(x, 2) + tanh(y)', lambda x, y: (1 / (x * math.log(2)), 1 - math.tanh(y) ** 2)),
+    ('x / y - pow(y, 3)', lambda x, y: (1 / y, -x / y ** 2 - 3 * y ** 2)),
+    ('x if x > y else y', lambda x, y: (1, 0)),
+])
+def test_gradient_values(source, expected):
+    func = compile_with_derivatives(source, ['x', 'y'])
+    x, y = 1.3, 0.7
+    assert func.gradient(x, y) == pytest.approx(list(expected(x, y)), rel=1e-12)
+    value, grad = func.value_and_gradient(x, y)
+    assert value == pytest.approx(func(x, y))
+    assert grad == pytest.approx(func.gradient(x, y))
+
+
+def test_pi_as_variable_does_not_shadow_constant():
+    func = compile_with_derivatives('2*erf(x) + erfc(x) + degrees(x) + radians(x) + pi*x', ['x', 'pi'])
+    x, pi = 0.5, 3.0
+    erf_slope = 2 / math.sqrt(math.pi) * math.exp(-x * x)
+    assert func.gradient(x, pi) == pytest.approx([erf_slope + 180 / math.pi + math.pi / 180 + pi, x])
+
+
+def test_hessian_values():
+    func = compile_with_derivatives('x**3 * y + cos(x*y)', ['x', 'y'])
+    x, y = 0.5, 2.0
+    hessian = func.hessian(x, y)
+    mixed = 3 * x ** 2 - math.sin(x * y) - x * y * math.cos(x * y)
+    assert hessian[0][0] == pytest.approx(6 * x * y - y * y * math.cos(x * y))
+    assert hessian[0][1] == pytest.approx(mixed)
+    assert hessian[1][0] == pytest.approx(mixed)
+    assert hessian[1][1] == pytest.approx(-x * x * math.cos(x * y))
+
+
+def test_shared_subexpressions():
+    tree = parse_expression('sin(x*y) ** 2', ['x', 'y']).body
+    func = compile_outputs((tree, tree), ['x', 'y'], 'test')
+    assert func(1.0, 2.0) == pytest.approx((math.sin(2.0) ** 2, math.sin(2.0) ** 2))
+    # sin(x*y) and its square are each computed once, the square returned twice
+    assert func.__code__.co_varnames[2:] == ('_t0', '_t1')
+
+
+def test_conditional_branches_not_hoisted():
+    func = compile_with_derivatives('sqrt(x) if x > 0 else 0', ['x'])
+    assert func.gradient(-1.0) == [0]
+    assert func.gradient(4.0) == pytest.approx([0.25])
+
+
+def test_jacobian():
+    jacobian = compile_jacobian(['x * y', 'sin(x) + y**2'], ['x', 'y'])
+    rows = jacobian(0.0, 3.0)
+    assert rows[0] == pytest.approx([3.0, 0.0])
+    assert rows[1] == pytest.approx([1.0, 6.0])
+
+
+def test_non_differentiable_function():
+    with pytest.raises(ExpressionError, match="Cannot differentiate function: factorial"):
+        compile_with_derivatives('factorial(x)', ['x'])
+
+
+@pytest.mark.parametrize('method', ['gradient', 'newton', 'bfgs', 'lbfgs'])
+def test_extremum_symbolic_differentiation(method):
+    func = compile_with_derivatives('(x - 1)**2 + 2 * (y + 0.5)**2 + exp(x - 1)', ['x', 'y'])
+    solver = ExtremumFinder(func, ['x', 'y'], method=method, differentiation='symbolic')
+    result = solver.solve([0.0, 0.0])
+    assert result['converged'] is True
+    assert result['point'][1] == pytest.approx(-0.5, abs=1e-5)
+
+
+def test_extremum_symbolic_requires_derivatives():
+    solver = ExtremumFinder(lambda x: x ** 2, ['x'], differentiation='symbolic')
+    with pytest.raises(ValueError, match="compiled with derivatives"):
+        solver.validate_input()